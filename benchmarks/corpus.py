@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import json
+import random
+from pathlib import Path
+from typing import List
+
+from clearframe.app.core.detector import MATCHER
+
+
+# Neutral filler, including words that contain keywords as substrings
+FILLER = [
+    "the", "team", "decided", "to", "review", "plan", "network", "sometimes",
+    "mvp", "quarterly", "roadmap", "with", "and", "a", "we", "it", "this",
+    "vendor", "release", "customer", "update", "report", "meeting", ".", ",",
+]
+
+KEYWORDS = [w for words in MATCHER.groups.values() for w in words]
+
+
+def make_texts(n: int, words: int, seed: int = 0, keyword_ratio: float = 0.15) -> List[str]:
+    """
+    Deterministic synthetic ticket bodies of roughly `words` tokens,
+    with about `keyword_ratio` of them drawn from the detector vocabulary.
+    """
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(n):
+        tokens = [
+            rng.choice(KEYWORDS) if rng.random() < keyword_ratio else rng.choice(FILLER)
+            for _ in range(words)
+        ]
+        texts.append(" ".join(tokens))
+    return texts
+
+
+def write_tickets(incoming: Path, n: int, words: int = 40, seed: int = 0) -> List[Path]:
+    incoming.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for i, body in enumerate(make_texts(n, words, seed=seed)):
+        path = incoming / f"BENCH-{i:06d}.json"
+        path.write_text(
+            json.dumps({"id": f"BENCH-{i:06d}", "title": "Synthetic", "body": body}),
+            encoding="utf-8",
+        )
+        paths.append(path)
+    return paths
@@ -0,0 +1,244 @@
+"""
+Clearframe benchmark runner.
+
+    python -m benchmarks.run --out bench.json
+    python -m benchmarks.run --quick --compare bench.json
+
+Each case reports best / median seconds over --repeat rounds plus
+items per second. Results are JSON so two versions can be diffed;
+--compare exits non-zero if any case got slower than --tolerance.
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from clearframe.app.builder.blobs import BlobStore
+from clearframe.app.builder.executor import execute_plan
+from clearframe.app.builder.loop import run_local_loop
+from clearframe.app.builder.planner import Step, load_ticket
+from clearframe.app.core.detector import MATCHER, heuristic_classification, sunk_cost_signal
+from clearframe.app.core.features import featurize
+from clearframe.app.core.llm import MockClient
+from clearframe.app.core.matcher import KeywordMatcher
+
+from .corpus import make_texts, write_tickets
+
+
+# ---------------------------------------------------------
+# Harness
+# ---------------------------------------------------------
+def _measure(fn: Callable[[], None], repeat: int, setup: Optional[Callable[[], None]] = None) -> List[float]:
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def _result(name: str, params: Dict, items: int, samples: List[float]) -> Dict:
+    best = min(samples)
+    return {
+        "name": name,
+        "params": params,
+        "items": items,
+        "best_s": round(best, 6),
+        "median_s": round(statistics.median(samples), 6),
+        "items_per_s": round(items / best, 1) if best else None,
+    }
+
+
+# ---------------------------------------------------------
+# Cases
+# ---------------------------------------------------------
+def bench_detector(sizes, lengths, repeat) -> List[Dict]:
+    out = []
+    for n in sizes:
+        for words in lengths:
+            texts = make_texts(n, words)
+            params = {"texts": n, "words": words}
+
+            samples = _measure(lambda: [sunk_cost_signal(t) for t in texts], repeat)
+            out.append(_result("detector.sunk_cost_signal", params, n, samples))
+
+            samples = _measure(lambda: [heuristic_classification(t) for t in texts], repeat)
+            out.append(_result("detector.heuristic_classification", params, n, samples))
+
+            try:
+                import numpy  # noqa: F401 (optional)
+                from clearframe.app.core.batch import score_batch
+            except ImportError:
+                continue
+            samples = _measure(lambda: score_batch(texts), repeat)
+            out.append(_result("batch.score_batch", params, n, samples))
+    return out
+
+
+def bench_matcher(sizes, lengths, scales, repeat) -> List[Dict]:
+    """Scan cost as the keyword set grows by `scale`x with words absent from the texts."""
+    out = []
+    for scale in scales:
+        groups = dict(MATCHER.groups)
+        for k in range(1, scale):
+            groups.update({f"{name}#{k}": [f"x{k}{w}" for w in words] for name, words in MATCHER.groups.items()})
+        matcher = KeywordMatcher(groups)
+        keywords = sum(len(words) for words in groups.values())
+
+        for n in sizes:
+            for words in lengths:
+                # tokenizing is part of every scan and does not depend on the keywords
+                texts = make_texts(n, words)
+                params = {"texts": n, "words": words, "keywords": keywords}
+                samples = _measure(lambda: [matcher.scan(featurize(t)) for t in texts], repeat)
+                out.append(_result("matcher.scan", params, n, samples))
+    return out
+
+
+def bench_planner(sizes, lengths, repeat, workdir: Path) -> List[Dict]:
+    out = []
+    for n in sizes:
+        for words in lengths:
+            folder = workdir / f"planner_{n}_{words}"
+            paths = write_tickets(folder, n, words=words)
+            samples = _measure(lambda: [load_ticket(p) for p in paths], repeat)
+            out.append(_result("planner.load_ticket", {"tickets": n, "words": words}, n, samples))
+            shutil.rmtree(folder)
+    return out
+
+
+def bench_executor(step_counts, repeat, workdir: Path) -> List[Dict]:
+    out = []
+    for n in step_counts:
+        steps = []
+        for i in range(1, n + 1):
+            if i % 3 == 0:
+                steps.append(Step(id=i, description=f"create notes/n{i}.md"))
+            elif i % 3 == 1:
+                steps.append(Step(id=i, description=f"write src/f{i}.txt: payload {i}"))
+            else:
+                steps.append(Step(id=i, description=f"review item {i}"))
+
+        for workers, materialize, shared in ((1, True, False), (4, True, False), (1, False, False), (1, True, True)):
+            run_dir = workdir / f"exec_{n}_{workers}_{int(materialize)}_{int(shared)}"
+            # blobs outlive the runs, as they do across nightly runs
+            blobs = BlobStore(workdir / f"blobs_{n}") if shared else None
+            samples = _measure(
+                lambda: execute_plan("BENCH", steps, run_dir, workers=workers, materialize=materialize, blobs=blobs),
+                repeat,
+                setup=lambda: shutil.rmtree(run_dir, ignore_errors=True),
+            )
+            params = {"steps": n, "workers": workers, "materialize": materialize, "blobs": shared}
+            out.append(_result("executor.execute_plan", params, n, samples))
+    return out
+
+
+def bench_loop(tickets, latency, workers_list, repeat, workdir: Path) -> List[Dict]:
+    out = []
+    for workers in workers_list:
+        root = workdir / f"loop_{workers}"
+
+        def setup():
+            shutil.rmtree(root, ignore_errors=True)
+            write_tickets(root / "clearframe" / "tickets" / "incoming", tickets)
+
+        def run():
+            with contextlib.redirect_stdout(io.StringIO()):
+                run_local_loop(root, workers=workers, use_cache=False, llm=MockClient(latency=latency))
+
+        samples = _measure(run, repeat, setup=setup)
+        params = {"tickets": tickets, "latency_s": latency, "workers": workers}
+        out.append(_result("loop.run_local_loop", params, tickets, samples))
+    return out
+
+
+# ---------------------------------------------------------
+# Comparison
+# ---------------------------------------------------------
+def _key(result: Dict) -> str:
+    return result["name"] + json.dumps(result["params"], sort_keys=True)
+
+
+def compare(old: Dict, new: Dict, tolerance: float) -> List[str]:
+    """Returns one line per case that is slower than old by more than `tolerance`."""
+    baseline = {_key(r): r for r in old.get("results", [])}
+    regressions = []
+    for r in new.get("results", []):
+        prev = baseline.get(_key(r))
+        if prev is None or not prev["best_s"]:
+            continue
+        ratio = r["best_s"] / prev["best_s"]
+        if ratio > 1 + tolerance:
+            regressions.append(f"{r['name']} {r['params']}: {prev['best_s']}s -> {r['best_s']}s (x{ratio:.2f})")
+    return regressions
+
+
+# ---------------------------------------------------------
+# Entry Point
+# ---------------------------------------------------------
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="clearframe-bench")
+    parser.add_argument("--out", default=None, help="Write results JSON here")
+    parser.add_argument("--compare", default=None, help="Baseline results JSON to diff against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown ratio (default: 0.25)")
+    parser.add_argument("--quick", action="store_true", help="Small corpora for a smoke run")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--loop-tickets", type=int, default=10_000)
+    parser.add_argument("--latency", type=float, default=0.0, help="MockClient latency per call in seconds")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 8])
+    args = parser.parse_args(argv)
+
+    if args.quick:
+        sizes, lengths, steps, tickets = [50], [20, 200], [50], min(args.loop_tickets, 200)
+    else:
+        sizes, lengths, steps, tickets = [100, 1000], [20, 200, 2000], [100, 1000], args.loop_tickets
+
+    results: List[Dict] = []
+    with tempfile.TemporaryDirectory(prefix="clearframe-bench-") as tmp:
+        workdir = Path(tmp)
+        results += bench_detector(sizes, lengths, args.repeat)
+        results += bench_matcher(sizes, lengths, [1, 10], args.repeat)
+        results += bench_planner(sizes, lengths, args.repeat, workdir)
+        results += bench_executor(steps, args.repeat, workdir)
+        results += bench_loop(tickets, args.latency, args.workers, args.repeat, workdir)
+
+    report = {
+        "meta": {
+            "python_version": platform.python_version(),
+            "platform": platform.platform(),
+            "quick": args.quick,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+
+    for r in results:
+        print(f"{r['name']:<36} {json.dumps(r['params']):<48} best={r['best_s']:.4f}s  {r['items_per_s']}/s")
+
+    if args.out:
+        Path(args.out).write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    if args.compare:
+        old = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        regressions = compare(old, report, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        return 1 if regressions else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
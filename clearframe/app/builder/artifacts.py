@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+# =========================================================
+# Versioned Execution Artifacts
+# =========================================================
+#
+# One artifact per ticket, versioned so readers can evolve:
+#
+#   {"schema": "clearframe.execution", "version": 1, "kind": ...,
+#    "ticket_id": ..., "status": ..., <kind-specific fields>, "meta": {...}}
+#
+# Run-constant metadata (interpreter, platform, provider) is written
+# once per run to run_meta.json instead of into every artifact.
+#
+# Imported by every CLI subcommand, so heavier stdlib modules are
+# imported inside the functions that need them.
+
+ARTIFACT_SCHEMA = "clearframe.execution"
+ARTIFACT_VERSION = 1
+
+RUN_META_NAME = "run_meta.json"
+
+FORMATS = ("json", "compact", "msgpack")
+
+_SUFFIX = {
+    "json": ".execution.json",
+    "compact": ".execution.json",
+    "msgpack": ".execution.msgpack",
+}
+
+
+def _msgpack():
+    # Lazy Import: optional dependency for the binary encoding
+    try:
+        import msgpack
+    except ImportError:
+        raise ImportError("msgpack not found. Run 'pip install msgpack'")
+    return msgpack
+
+
+def _fields(obj: Any) -> Dict[str, Any]:
+    from dataclasses import asdict, is_dataclass
+
+    return asdict(obj) if is_dataclass(obj) else dict(obj)
+
+
+# ---------------------------------------------------------
+# Builders
+# ---------------------------------------------------------
+def analysis_artifact(ticket, output, meta: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Artifact for one analyzed ticket (run_local_loop)."""
+    return {
+        "schema": ARTIFACT_SCHEMA,
+        "version": ARTIFACT_VERSION,
+        "kind": "analysis",
+        "ticket_id": ticket.ticket_id,
+        "status": "ANALYZED",
+        "ticket": _fields(ticket),
+        "analysis": _fields(output),
+        "meta": meta or {},
+    }
+
+
+def plan_artifact(
+    ticket_id: str,
+    status: str,
+    workspace_path: str,
+    steps: List[Dict[str, Any]],
+    meta: Optional[Dict[str, Any]] = None,
+    manifest: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
+    """
+    Artifact for one executed plan (execute_plan).
+    `manifest` maps each workspace file to its size and sha256.
+    """
+    return {
+        "schema": ARTIFACT_SCHEMA,
+        "version": ARTIFACT_VERSION,
+        "kind": "plan",
+        "ticket_id": ticket_id,
+        "status": status,
+        "workspace_path": workspace_path,
+        "steps": steps,
+        "manifest": manifest or {},
+        "meta": meta or {},
+    }
+
+
+def duplicate_artifact(
+    ticket_id: str,
+    title: str,
+    digest: str,
+    original: Dict[str, Any],
+    meta: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Artifact for a ticket whose content was already analyzed."""
+    return {
+        "schema": ARTIFACT_SCHEMA,
+        "version": ARTIFACT_VERSION,
+        "kind": "duplicate",
+        "ticket_id": ticket_id,
+        "status": "DUPLICATE",
+        "title": title,
+        "content_hash": digest,
+        "duplicate_of": {
+            "ticket_id": original["ticket_id"],
+            "artifact": original["artifact"],
+            "run_id": original["run_id"],
+        },
+        "meta": meta or {},
+    }
+
+
+def write_run_meta(run_dir: Path, **extra: Any) -> Path:
+    """Writes run_meta.json once; later calls for the same run are no-ops."""
+    path = run_dir / RUN_META_NAME
+    if path.exists():
+        return path
+
+    import platform
+    import sys
+    from datetime import datetime, timezone
+
+    meta = {
+        "schema": ARTIFACT_SCHEMA,
+        "version": ARTIFACT_VERSION,
+        "run_id": run_dir.name,
+        "created_utc": datetime.now(timezone.utc).isoformat(),
+        "python_version": sys.version,
+        "platform": platform.platform(),
+        **extra,
+    }
+
+    run_dir.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(meta, indent=2), encoding="utf-8")
+    os.replace(tmp, path)
+    return path
+
+
+def read_run_meta(run_dir: Path) -> Dict[str, Any]:
+    path = run_dir / RUN_META_NAME
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+# ---------------------------------------------------------
+# Encoding
+# ---------------------------------------------------------
+def encode(artifact: Dict[str, Any], fmt: str = "json") -> bytes:
+    if fmt == "json":
+        return json.dumps(artifact, indent=2).encode("utf-8")
+    if fmt == "compact":
+        return json.dumps(artifact, separators=(",", ":")).encode("utf-8")
+    if fmt == "msgpack":
+        return _msgpack().packb(artifact, use_bin_type=True)
+    raise ValueError(f"Unknown artifact format: {fmt}")
+
+
+def decode(raw: bytes, msgpack: bool = False) -> Dict[str, Any]:
+    if msgpack:
+        return upgrade(_msgpack().unpackb(raw, raw=False))
+    return upgrade(json.loads(raw.decode("utf-8")))
+
+
+def artifact_path(run_dir: Path, ticket_id: str, fmt: str = "json") -> Path:
+    return run_dir / f"{ticket_id}{_SUFFIX[fmt]}"
+
+
+def write_artifact(run_dir: Path, artifact: Dict[str, Any], fmt: str = "json") -> Path:
+    """
+    Atomically writes one artifact; a crash never leaves a torn file.
+    """
+    path = artifact_path(run_dir, artifact["ticket_id"], fmt)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(encode(artifact, fmt))
+    os.replace(tmp, path)
+    return path
+
+
+def read_artifact(path: Path) -> Dict[str, Any]:
+    path = Path(path)
+    return decode(path.read_bytes(), msgpack=path.name.endswith(".msgpack"))
+
+
+def artifact_files(run_dir: Path) -> List[Path]:
+    files = list(run_dir.glob("*.execution.json")) + list(run_dir.glob("*.execution.msgpack"))
+    return sorted(files, key=lambda p: p.name)
+
+
+# ---------------------------------------------------------
+# Legacy Artifacts
+# ---------------------------------------------------------
+def _parse_repr(text: str) -> Dict[str, Any]:
+    """
+    Turns "Ticket(ticket_id='T1', ...)" back into a dict without eval:
+    only literal keyword arguments are accepted.
+    """
+    import ast
+
+    node = ast.parse(text, mode="eval").body
+    if not isinstance(node, ast.Call):
+        raise ValueError(f"Not a dataclass repr: {text[:40]}")
+    return {kw.arg: ast.literal_eval(kw.value) for kw in node.keywords}
+
+
+def upgrade(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalizes pre-versioned artifacts to the current schema."""
+    if data.get("schema") == ARTIFACT_SCHEMA:
+        return data
+
+    if isinstance(data.get("ticket"), str):
+        # run_local_loop before v1: {"ticket": str(Ticket), "analysis": str(EngineOutput)}
+        ticket = _parse_repr(data["ticket"])
+        analysis = _parse_repr(data.get("analysis", "EngineOutput()"))
+        return {
+            "schema": ARTIFACT_SCHEMA,
+            "version": 0,
+            "kind": "analysis",
+            "ticket_id": ticket.get("ticket_id"),
+            "status": "ANALYZED",
+            "ticket": ticket,
+            "analysis": analysis,
+            "meta": data.get("meta", {}),
+        }
+
+    # execute_plan before v1 already had the plan fields
+    return {
+        "schema": ARTIFACT_SCHEMA,
+        "version": 0,
+        "kind": "plan",
+        **data,
+    }
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Dict, Iterator, Optional
+
+
+# =========================================================
+# Content-Addressed Blob Store
+# =========================================================
+#
+# Workspace files are mostly the same few contents (every `create`
+# writes the same header). Each distinct content is stored once under
+# tickets/blobs/<2 hex>/<sha256>, read-only, and a materialized
+# workspace hardlinks its files to the blobs instead of writing copies
+# (falling back to a copy where links are not possible). The digest is
+# the one in the plan artifact's manifest.
+#
+# A blob that no workspace links to any more (link count 1) is garbage
+# once it is older than the grace period: prune old runs, then collect.
+
+BLOBS_DIR = "blobs"
+
+
+class BlobStore:
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self._lock = threading.Lock()
+
+        self.written = 0
+        self.reused = 0
+        self.copied = 0
+
+    def path(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest
+
+    def put(self, data: bytes, digest: Optional[str] = None) -> str:
+        """Stores `data` unless an identical blob exists; returns its sha256."""
+        digest = digest or hashlib.sha256(data).hexdigest()
+        path = self.path(digest)
+        try:
+            # fresh mtime: a blob about to be linked is never collected
+            os.utime(path)
+            self._count(reused=1)
+            return digest
+        except FileNotFoundError:
+            pass
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{digest}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        # links share the inode: nobody edits a blob through a workspace
+        os.chmod(tmp, 0o444)
+        os.replace(tmp, path)
+        self._count(written=1)
+        return digest
+
+    def link(self, digest: str, target: Path) -> None:
+        """Places blob `digest` at `target`, as a hardlink where possible."""
+        target.unlink(missing_ok=True)
+        try:
+            os.link(self.path(digest), target)
+        except OSError:
+            # another filesystem, too many links, or no link support
+            shutil.copyfile(self.path(digest), target)
+            self._count(copied=1)
+
+    def blobs(self) -> Iterator[Path]:
+        if self.root.exists():
+            for shard in self.root.iterdir():
+                if shard.is_dir():
+                    yield from (p for p in shard.iterdir() if not p.name.endswith(".tmp"))
+
+    def stats(self) -> Dict[str, int]:
+        return {"written": self.written, "reused": self.reused, "copied": self.copied}
+
+    def collect_garbage(self, min_age: float = 3600.0) -> SimpleNamespace:
+        """
+        Deletes blobs no workspace links to that are older than
+        `min_age` seconds. Returns kept, removed and freed_bytes.
+        """
+        now = time.time()
+        result = SimpleNamespace(kept=0, removed=0, freed_bytes=0)
+        for path in self.blobs():
+            try:
+                st = path.stat()
+                if st.st_nlink > 1 or now - st.st_mtime < min_age:
+                    result.kept += 1
+                    continue
+                path.unlink()
+            except FileNotFoundError:
+                continue
+            result.removed += 1
+            result.freed_bytes += st.st_size
+        return result
+
+    def _count(self, **deltas: int) -> None:
+        with self._lock:
+            for name, delta in deltas.items():
+                setattr(self, name, getattr(self, name) + delta)
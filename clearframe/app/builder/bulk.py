@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from .ticket_io import BATCH_SUFFIXES, batch_stem, iter_jsonl
+
+
+# =========================================================
+# Bulk JSONL Inbox
+# =========================================================
+#
+# Upstream can drop thousands of tickets as one batch file in
+# incoming/:  export.jsonl  or  export.jsonl.gz,  one ticket per line.
+# The file is streamed a record at a time and never loaded whole; each
+# record goes through the loop like a ticket file. Progress is a byte
+# offset (into the decompressed stream) kept next to the file in
+# export.jsonl.offset, advanced as records finish, so a run that dies
+# half-way resumes at the first unfinished record. A fully processed
+# file is renamed export.done.jsonl(.gz).
+
+OFFSET_SUFFIX = ".offset"
+
+
+def is_batch_file(path: Path) -> bool:
+    name = path.name
+    return name.endswith(BATCH_SUFFIXES) and not is_done_batch(path)
+
+
+def is_done_batch(path: Path) -> bool:
+    return path.name.endswith((".done.jsonl", ".done.jsonl.gz"))
+
+
+def done_name(path: Path) -> Path:
+    base = batch_stem(path)
+    return path.with_name(f"{base}.done{path.name[len(base):]}")
+
+
+@dataclass(eq=False)
+class BatchRecord:
+    """
+    One ticket inside a batch file. Stands in for a ticket Path in the
+    loop: `name` keys the journal and tracer, `stem` is the ticket id
+    fallback (export-17 for the 17th record of export.jsonl).
+    """
+    source: Path
+    index: int
+    start: int
+    end: int
+    data: Dict[str, Any]
+    progress: Optional["BatchProgress"] = field(default=None, repr=False)
+
+    @property
+    def name(self) -> str:
+        return f"{self.source.name}#{self.index}"
+
+    @property
+    def stem(self) -> str:
+        return f"{batch_stem(self.source)}-{self.index}"
+
+    def done(self) -> None:
+        if self.progress is not None:
+            self.progress.done(self)
+
+
+class BatchProgress:
+    """
+    Byte-offset watermark of a batch file: everything before `offset`
+    is finished. Records may finish out of order (worker pool); the
+    watermark only moves over a contiguous run of finished records.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.sidecar = self.path.with_name(self.path.name + OFFSET_SUFFIX)
+        self._lock = threading.Lock()
+
+        self.offset = 0
+        self.records = 0
+        if self.sidecar.exists():
+            saved = json.loads(self.sidecar.read_text(encoding="utf-8"))
+            self.offset, self.records = saved["offset"], saved["records"]
+
+        # start offset -> record, for records read but not yet finished
+        self._open: Dict[int, BatchRecord] = {}
+        self._finished: Dict[int, BatchRecord] = {}
+
+    def stream(self) -> Iterator[BatchRecord]:
+        """The unfinished records, read and parsed one line at a time."""
+        index = self.records
+        for start, end, data in iter_jsonl(self.path, self.offset):
+            index += 1
+            record = BatchRecord(self.path, index, start, end, data, self)
+            with self._lock:
+                self._open[start] = record
+            yield record
+
+    def done(self, record: BatchRecord) -> None:
+        with self._lock:
+            if self._open.pop(record.start, None) is None:
+                return
+            self._finished[record.start] = record
+
+            offset, records = self.offset, self.records
+            while offset in self._finished:
+                finished = self._finished.pop(offset)
+                offset, records = finished.end, finished.index
+            if offset != self.offset:
+                self._save(offset, records)
+
+    def _save(self, offset: int, records: int) -> None:
+        self.offset, self.records = offset, records
+        tmp = self.sidecar.with_name(self.sidecar.name + ".tmp")
+        tmp.write_text(json.dumps({"offset": offset, "records": records}), encoding="utf-8")
+        os.replace(tmp, self.sidecar)
+        # progress renews a claimed file's lease (see lease.py)
+        os.utime(self.path)
+
+    def finish(self) -> Path:
+        """Renames the fully processed file to its .done name."""
+        target = done_name(self.path)
+        self.path.rename(target)
+        self.sidecar.unlink(missing_ok=True)
+        return target
+
+
+def chunks(records: Iterator[BatchRecord], size: int) -> Iterator[List[BatchRecord]]:
+    chunk: List[BatchRecord] = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
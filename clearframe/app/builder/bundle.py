@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .artifacts import decode, encode
+
+
+# =========================================================
+# Packed Run Bundle
+# =========================================================
+#
+# One append-only file per run instead of one file per ticket:
+#
+#   MAGIC
+#   record*   <key_len:u16><fmt:u8><size:u32> key payload
+#   index     {"T1": [offset, size, fmt], ...}        (json)
+#   trailer   <index_offset:u64> INDEX_MAGIC
+#
+# Payloads are artifacts encoded exactly as on disk (json / compact /
+# msgpack). The trailer makes any ticket one seek away; a bundle whose
+# writer died before `close` has no trailer and is recovered by walking
+# the record headers. Each record is fsync'd before `add` returns, so a
+# journaled artifact-written entry never gets ahead of its data.
+
+BUNDLE_NAME = "run.bundle"
+
+MAGIC = b"CFBNDL\x00\x01"
+INDEX_MAGIC = b"CFINDEX\x00"
+
+_RECORD = struct.Struct("<HBI")
+_TRAILER = struct.Struct("<Q8s")
+
+_FORMAT_CODES = {"json": 0, "compact": 1, "msgpack": 2}
+_FORMAT_NAMES = {v: k for k, v in _FORMAT_CODES.items()}
+
+# ticket_id -> (payload offset, payload size, format code)
+Index = Dict[str, Tuple[int, int, int]]
+
+
+class BundleError(ValueError):
+    pass
+
+
+def bundle_ref(path: Path, ticket_id: str) -> str:
+    """Artifact reference recorded in run logs: '<bundle>#<ticket_id>'."""
+    return f"{path}#{ticket_id}"
+
+
+def _read_trailer(f, size: int) -> Optional[Tuple[Index, int]]:
+    """Index and its offset from a closed bundle; None without a valid trailer."""
+    if size < len(MAGIC) + _TRAILER.size:
+        return None
+    f.seek(size - _TRAILER.size)
+    index_offset, magic = _TRAILER.unpack(f.read(_TRAILER.size))
+    if magic != INDEX_MAGIC or not len(MAGIC) <= index_offset <= size - _TRAILER.size:
+        return None
+
+    f.seek(index_offset)
+    raw = f.read(size - _TRAILER.size - index_offset)
+    try:
+        entries = json.loads(raw.decode("utf-8"))
+    except ValueError:
+        return None
+    return {k: (v[0], v[1], v[2]) for k, v in entries.items()}, index_offset
+
+
+def _scan_records(f, size: int) -> Tuple[Index, int]:
+    """Walks record headers; returns the index and the end of the last whole record."""
+    index: Index = {}
+    pos = len(MAGIC)
+    while pos + _RECORD.size <= size:
+        f.seek(pos)
+        key_len, fmt, length = _RECORD.unpack(f.read(_RECORD.size))
+        payload = pos + _RECORD.size + key_len
+        if fmt not in _FORMAT_NAMES or payload + length > size:
+            break
+        key = f.read(key_len).decode("utf-8")
+        index[key] = (payload, length, fmt)
+        pos = payload + length
+    return index, pos
+
+
+def _check_magic(f, path: Path) -> None:
+    f.seek(0)
+    if f.read(len(MAGIC)) != MAGIC:
+        raise BundleError(f"Not a run bundle: {path}")
+
+
+def _unstarted(path: Path) -> bool:
+    """Empty, or cut off inside MAGIC: a writer that died at once."""
+    with open(path, "rb") as f:
+        head = f.read(len(MAGIC))
+    return len(head) < len(MAGIC) and MAGIC.startswith(head)
+
+
+# ---------------------------------------------------------
+# Writer
+# ---------------------------------------------------------
+class BundleWriter:
+    """
+    Streams artifacts into a run bundle. Safe to share between worker
+    threads; reopening an existing bundle appends after its last record.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._index: Index = {}
+
+        if self.path.exists() and not _unstarted(self.path):
+            self._f = open(self.path, "r+b")
+            _check_magic(self._f, self.path)
+            size = self.path.stat().st_size
+            trailer = _read_trailer(self._f, size)
+            if trailer is not None:
+                self._index, end = trailer
+            else:
+                self._index, end = _scan_records(self._f, size)
+            # drops the old trailer (or a torn tail) before appending
+            self._f.truncate(end)
+            self._f.seek(end)
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # "wb" only over a writer that died before its MAGIC hit the disk
+            self._f = open(self.path, "wb" if self.path.exists() else "xb")
+            self._f.write(MAGIC)
+            self._sync()
+
+    def add(self, artifact: Dict[str, Any], fmt: str = "json") -> str:
+        key = artifact["ticket_id"].encode("utf-8")
+        payload = encode(artifact, fmt)
+
+        with self._lock:
+            offset = self._f.tell() + _RECORD.size + len(key)
+            self._f.write(_RECORD.pack(len(key), _FORMAT_CODES[fmt], len(payload)))
+            self._f.write(key)
+            self._f.write(payload)
+            self._sync()
+            self._index[artifact["ticket_id"]] = (offset, len(payload), _FORMAT_CODES[fmt])
+
+        return bundle_ref(self.path, artifact["ticket_id"])
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, ticket_id: str) -> bool:
+        return ticket_id in self._index
+
+    def close(self) -> None:
+        with self._lock:
+            if self._f.closed:
+                return
+            index_offset = self._f.tell()
+            self._f.write(json.dumps(self._index, separators=(",", ":")).encode("utf-8"))
+            self._f.write(_TRAILER.pack(index_offset, INDEX_MAGIC))
+            self._sync()
+            self._f.close()
+
+    def _sync(self) -> None:
+        self._f.flush()
+        os.fsync(self._f.fileno())
+
+    def __enter__(self) -> "BundleWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+# ---------------------------------------------------------
+# Reader
+# ---------------------------------------------------------
+class BundleReader:
+    """
+    Random access into a run bundle: the index is read once from the
+    trailer, then every `get` is a slice of a read-only memory map, so
+    walking a huge run pages artifacts in and out instead of holding them.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._f = open(self.path, "rb")
+        _check_magic(self._f, self.path)
+
+        size = self.path.stat().st_size
+        trailer = _read_trailer(self._f, size)
+        self.complete = trailer is not None
+        self._index = trailer[0] if trailer else _scan_records(self._f, size)[0]
+        self._map = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def keys(self) -> List[str]:
+        """Ticket ids in write order."""
+        return sorted(self._index, key=lambda k: self._index[k][0])
+
+    def __contains__(self, ticket_id: str) -> bool:
+        return ticket_id in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def raw(self, ticket_id: str) -> bytes:
+        offset, length, _ = self._index[ticket_id]
+        return self._map[offset : offset + length]
+
+    def format(self, ticket_id: str) -> str:
+        return _FORMAT_NAMES[self._index[ticket_id][2]]
+
+    def get(self, ticket_id: str) -> Dict[str, Any]:
+        return decode(self.raw(ticket_id), msgpack=self.format(ticket_id) == "msgpack")
+
+    def __iter__(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        for key in self.keys():
+            yield key, self.get(key)
+
+    def close(self) -> None:
+        self._map.close()
+        self._f.close()
+
+    def __enter__(self) -> "BundleReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
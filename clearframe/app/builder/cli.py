@@ -3,13 +3,36 @@ import argparse
 import sys
 from pathlib import Path
 
-# --- THE MISSING IMPORT ---
-from .loop import run_local_loop
-from .replay import show_last_run  # <--- Make sure this is here!
+from .artifacts import FORMATS
+
+# Subcommands import their modules on demand: cron runs `replay` and
+# `run --help` often, and neither should pay for the engine, LLM clients
+# or thread pools (see tests/test_startup.py).
 
 def _repo_root_from_here() -> Path:
     return Path(__file__).resolve().parents[3]
 
+def _repo_root(args) -> Path:
+    return Path(args.repo_root).resolve() if args.repo_root else _repo_root_from_here()
+
+def _shard(spec: str):
+    from .lease import parse_shard
+
+    try:
+        return parse_shard(spec)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+def _add_resilience_args(p: argparse.ArgumentParser) -> None:
+    p.add_argument("--llm-timeout", type=float, default=30.0, help="Seconds per LLM call before it is retried (default: 30)")
+    p.add_argument("--llm-retries", type=int, default=3, help="Retries per LLM call, with jittered backoff (default: 3)")
+    p.add_argument("--llm-rate", type=float, default=0.0, help="Max LLM calls per second (default: 0, unlimited)")
+
+def _resilience(args):
+    from ..core.llm_resilience import ResiliencePolicy
+
+    return ResiliencePolicy(timeout=args.llm_timeout, retries=args.llm_retries, rate=args.llm_rate or None)
+
 def main(argv: list[str] | None = None) -> int:
     parser = argparse.ArgumentParser(prog="clearframe-builder")
     sub = parser.add_subparsers(dest="cmd", required=True)
@@ -18,30 +41,237 @@ def main(argv: list[str] | None = None) -> int:
     run_p = sub.add_parser("run", help="Run ticket loop")
     run_p.add_argument("--repo-root", default=None)
     run_p.add_argument("--simulate-failure", action="store_true", help="Force a failure at step 2")
+    run_p.add_argument("--workers", type=int, default=1, help="Tickets analyzed concurrently (default: 1)")
+    run_p.add_argument("--no-cache", action="store_true", help="Always consult the LLM, bypassing the reframe cache")
+    run_p.add_argument("--trace", action="store_true", help="Record per-stage timings and write trace.json")
+    run_p.add_argument("--artifact-format", choices=FORMATS, default="json", help="Artifact encoding (default: json)")
+    run_p.add_argument("--bundle", action="store_true", help="Pack the run's artifacts into one run.bundle file")
+    run_p.add_argument("--no-dedupe", action="store_true", help="Analyze tickets even if identical content was seen before")
+    run_p.add_argument("--shard", type=_shard, default=None, help="Only process shard i of N, e.g. 2/4")
+    run_p.add_argument("--llm-batch", type=int, default=1, help="Send up to N concurrent reframe requests as one LLM call; pair with --workers (default: 1, off)")
+    run_p.add_argument("--llm-batch-ms", type=float, default=20.0, help="Longest wait for a batch to fill, in ms (default: 20)")
+    run_p.add_argument("--claim", action="store_true", help="Claim tickets via leases so several loops can share the inbox")
+    run_p.add_argument("--worker-id", default=None, help="Lease owner name (default: host-pid)")
+    run_p.add_argument("--lease-seconds", type=float, default=600.0, help="Claims older than this are reclaimed (default: 600)")
+    run_p.add_argument("--record-state", action="store_true", help="Also record each ticket's outcome in the audit index (see the state command)")
+    _add_resilience_args(run_p)
+    # watch command
+    watch_p = sub.add_parser("watch", aliases=["serve"], help="Process tickets continuously as they land")
+    watch_p.add_argument("--repo-root", default=None)
+    watch_p.add_argument("--workers", type=int, default=1, help="Tickets analyzed concurrently (default: 1)")
+    watch_p.add_argument("--no-cache", action="store_true", help="Always consult the LLM, bypassing the reframe cache")
+    watch_p.add_argument("--window", type=float, default=2.0, help="Seconds to collect a micro-batch (default: 2)")
+    watch_p.add_argument("--max-batch", type=int, default=100, help="Tickets per run directory at most (default: 100)")
+    watch_p.add_argument("--poll-interval", type=float, default=1.0, help="Polling period without inotify (default: 1)")
+    watch_p.add_argument("--trace", action="store_true", help="Record per-stage timings and write trace.json per run")
+    watch_p.add_argument("--artifact-format", choices=FORMATS, default="json", help="Artifact encoding (default: json)")
+    watch_p.add_argument("--bundle", action="store_true", help="Pack each run's artifacts into one run.bundle file")
+    watch_p.add_argument("--no-dedupe", action="store_true", help="Analyze tickets even if identical content was seen before")
+    watch_p.add_argument("--shard", type=_shard, default=None, help="Only process shard i of N, e.g. 2/4")
+    watch_p.add_argument("--llm-batch", type=int, default=1, help="Send up to N concurrent reframe requests as one LLM call; pair with --workers (default: 1, off)")
+    watch_p.add_argument("--llm-batch-ms", type=float, default=20.0, help="Longest wait for a batch to fill, in ms (default: 20)")
+    watch_p.add_argument("--record-state", action="store_true", help="Also record each ticket's outcome in the audit index (see the state command)")
+    _add_resilience_args(watch_p)
+    # resume command
+    resume_p = sub.add_parser("resume", help="Finish the incomplete work of a crashed run")
+    resume_p.add_argument("run_id")
+    resume_p.add_argument("--repo-root", default=None)
+    resume_p.add_argument("--workers", type=int, default=1, help="Tickets analyzed concurrently (default: 1)")
+    resume_p.add_argument("--no-cache", action="store_true", help="Always consult the LLM, bypassing the reframe cache")
+    _add_resilience_args(resume_p)
+    # plan command
+    plan_p = sub.add_parser("plan", help="Dry-run one ticket's steps into a workspace")
+    plan_p.add_argument("ticket", help="Ticket file; each line of its body is one step")
+    plan_p.add_argument("--repo-root", default=None)
+    plan_p.add_argument("--workers", type=int, default=1, help="Independent steps run concurrently (default: 1)")
+    plan_p.add_argument("--simulate-failure", action="store_true", help="Force a failure at step 2")
+    plan_p.add_argument("--no-materialize", action="store_true", help="Keep the workspace in memory; only its manifest is recorded")
+    plan_p.add_argument("--artifact-format", choices=FORMATS, default="json", help="Artifact encoding (default: json)")
+    plan_p.add_argument("--no-blobs", action="store_true", help="Write workspace files as copies instead of links into the shared blob store")
     # replay command
-    sub.add_parser("replay", help="Show last run summary")
+    replay_p = sub.add_parser("replay", help="Show last run summary")
+    replay_p.add_argument("--repo-root", default=None)
+    replay_p.add_argument("--ticket", default=None, help="Show this ticket's artifact instead of the first")
+    replay_p.add_argument("--status", default=None, help="Only artifacts with this status, e.g. failed or ANALYZED")
+    replay_p.add_argument("--bias", default=None, help="Only artifacts for this bias, e.g. RECENCY_BIAS")
+    replay_p.add_argument("--page", type=int, default=1, help="Page of matching artifacts to show (default: 1)")
+    replay_p.add_argument("--page-size", type=int, default=1, help="Artifacts per page (default: 1)")
+    # compact-index command
+    compact_p = sub.add_parser("compact-index", help="Rewrite the run index as one sorted entry per run")
+    compact_p.add_argument("--repo-root", default=None)
+    # gc command
+    gc_p = sub.add_parser("gc", help="Apply run retention, then delete workspace blobs no run links to")
+    gc_p.add_argument("--repo-root", default=None)
+    gc_p.add_argument("--keep-runs", type=int, default=None, help="Keep only the newest N run directories (default: keep all)")
+    gc_p.add_argument("--min-age", type=float, default=3600.0, help="Spare blobs younger than this many seconds (default: 3600)")
+    # state command
+    state_p = sub.add_parser("state", help="Show recorded ticket outcomes from the audit index")
+    state_p.add_argument("--repo-root", default=None)
+    state_p.add_argument("--ticket", default=None, help="Show this ticket's recorded outcome")
+    state_p.add_argument("--status", default=None, help="List ticket ids with this outcome: processed, silent or failed")
+    state_p.add_argument("--migrate", action="store_true", help="Import .done.json files and processed.json again")
 
     args = parser.parse_args(argv)
 
     if args.cmd == "run":
-        repo_root = Path(args.repo_root).resolve() if args.repo_root else _repo_root_from_here()
+        from .loop import run_local_loop
+
+        repo_root = _repo_root(args)
         
         # 1. Capture the flag from the user
         # We turn the True/False flag into "Step 2" or "Nothing"
         fail_id = 2 if args.simulate_failure else None
         
         # 2. Pass it into the loop
-        result = run_local_loop(repo_root, fail_step_id=fail_id)
+        result = run_local_loop(
+            repo_root,
+            fail_step_id=fail_id,
+            workers=args.workers,
+            use_cache=not args.no_cache,
+            trace=args.trace,
+            artifact_format=args.artifact_format,
+            bundle=args.bundle,
+            dedupe=not args.no_dedupe,
+            shard=args.shard,
+            claim=args.claim,
+            worker_id=args.worker_id,
+            lease_seconds=args.lease_seconds,
+            llm_batch=args.llm_batch,
+            llm_batch_delay=args.llm_batch_ms / 1000,
+            resilience=_resilience(args),
+            record_state=args.record_state,
+        )
         
         print(f"processed={result.processed}")
         print(f"run_dir={result.run_dir}")
         return 0
 
+    if args.cmd in ("watch", "serve"):
+        from .watch import watch_incoming
+
+        repo_root = _repo_root(args)
+        result = watch_incoming(
+            repo_root,
+            workers=args.workers,
+            use_cache=not args.no_cache,
+            window_seconds=args.window,
+            max_batch=args.max_batch,
+            poll_interval=args.poll_interval,
+            trace=args.trace,
+            artifact_format=args.artifact_format,
+            bundle=args.bundle,
+            dedupe=not args.no_dedupe,
+            shard=args.shard,
+            llm_batch=args.llm_batch,
+            llm_batch_delay=args.llm_batch_ms / 1000,
+            resilience=_resilience(args),
+            record_state=args.record_state,
+        )
+        print(f"processed={result.processed}")
+        print(f"runs={len(result.runs)}")
+        return 0
+
+    if args.cmd == "resume":
+        from .loop import resume_run
+
+        repo_root = _repo_root(args)
+        result = resume_run(
+            repo_root,
+            args.run_id,
+            workers=args.workers,
+            use_cache=not args.no_cache,
+            resilience=_resilience(args),
+        )
+        print(f"processed={result.processed}")
+        print(f"reanalyzed={result.reanalyzed}")
+        print(f"run_dir={result.run_dir}")
+        return 0
+
+    if args.cmd == "plan":
+        from .blobs import BLOBS_DIR, BlobStore
+        from .executor import execute_plan
+        from .loop import new_run_dir
+        from .planner import read_ticket_data, ticket_id_for
+        from .planner_rules import build_steps_from_text
+
+        repo_root = _repo_root(args)
+        ticket_file = Path(args.ticket)
+        data = read_ticket_data(ticket_file)
+        tickets_dir = repo_root / "clearframe" / "tickets"
+        blobs = None if args.no_blobs else BlobStore(tickets_dir / BLOBS_DIR)
+        run_dir = new_run_dir(tickets_dir / "runs")
+        result = execute_plan(
+            ticket_id_for(data, ticket_file),
+            build_steps_from_text(data.get("body", "")),
+            run_dir,
+            fail_step_id=2 if args.simulate_failure else None,
+            artifact_format=args.artifact_format,
+            workers=args.workers,
+            materialize=not args.no_materialize,
+            blobs=blobs,
+        )
+        print(f"steps={result.step_count}")
+        print(f"failed={result.failed}")
+        if blobs is not None:
+            print(f"blobs_written={blobs.written}")
+            print(f"blobs_reused={blobs.reused}")
+        print(f"artifact={result.artifact_path}")
+        return 0
+
     if args.cmd == "replay":
-        repo_root = _repo_root_from_here()
-        runs_dir = repo_root / "clearframe" / "tickets" / "runs"
-        # Now that it's imported, this won't crash!
-        show_last_run(runs_dir) 
+        from .replay import show_last_run
+
+        runs_dir = _repo_root(args) / "clearframe" / "tickets" / "runs"
+        show_last_run(
+            runs_dir,
+            ticket_id=args.ticket,
+            status=args.status,
+            bias=args.bias,
+            page=args.page,
+            page_size=args.page_size,
+        )
+        return 0
+
+    if args.cmd == "compact-index":
+        from .run_index import compact_index
+
+        runs_dir = _repo_root(args) / "clearframe" / "tickets" / "runs"
+        kept = compact_index(runs_dir)
+        print(f"index_entries={kept}")
+        return 0
+
+    if args.cmd == "gc":
+        from .blobs import BLOBS_DIR, BlobStore
+        from .run_index import prune_runs
+
+        tickets_dir = _repo_root(args) / "clearframe" / "tickets"
+        if args.keep_runs is not None:
+            removed = prune_runs(tickets_dir / "runs", args.keep_runs)
+            print(f"runs_removed={len(removed)}")
+        result = BlobStore(tickets_dir / BLOBS_DIR).collect_garbage(args.min_age)
+        print(f"blobs_kept={result.kept}")
+        print(f"blobs_removed={result.removed}")
+        print(f"bytes_freed={result.freed_bytes}")
+        return 0
+
+    if args.cmd == "state":
+        from .state import STATE_DB_NAME, TicketStore, migrate
+
+        tickets_dir = _repo_root(args) / "clearframe" / "tickets"
+        store = TicketStore(tickets_dir / STATE_DB_NAME)
+        try:
+            if args.migrate:
+                print(f"migrated={migrate(store, tickets_dir)}")
+            if args.ticket:
+                print(store.get(args.ticket.upper()) or f"{args.ticket}: not in the audit index")
+            elif args.status:
+                for ticket_id in store.ids(args.status):
+                    print(ticket_id)
+            else:
+                for status, count in sorted(store.counts().items()):
+                    print(f"{status}={count}")
+        finally:
+            store.close()
         return 0
 
     return 2
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+# =========================================================
+# Content-Hash Deduplication
+# =========================================================
+#
+# Upstream retries deliver byte-identical tickets. Each analyzed ticket
+# is recorded as  content hash -> artifact  in an append-only JSONL file
+# next to processed.json; a later ticket with the same normalized title
+# and body gets a "duplicate-of" artifact instead of another engine run.
+
+CONTENT_INDEX_NAME = "content_index.jsonl"
+
+
+def content_hash(data: Dict[str, Any]) -> str:
+    """
+    sha256 of title + body with whitespace runs collapsed,
+    so re-wrapped or re-indented retries still match.
+    """
+    title = " ".join(str(data.get("title", "")).split())
+    body = " ".join(str(data.get("body", "")).split())
+    return hashlib.sha256(f"{title}\x00{body}".encode("utf-8")).hexdigest()
+
+
+class ContentIndex:
+    """
+    content hash -> first artifact produced for that content.
+    Loaded once; every `add` is a single O_APPEND write.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+
+        if self.path.exists():
+            for line in self.path.read_bytes().splitlines():
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # torn trailing write from a crashed run
+                    continue
+                self._entries.setdefault(entry["hash"], entry)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, digest: str) -> Optional[Dict[str, Any]]:
+        return self._entries.get(digest)
+
+    def add(self, digest: str, ticket_id: str, artifact: str, run_id: str) -> Dict[str, Any]:
+        """Records the first artifact for `digest`; later ones are ignored."""
+        with self._lock:
+            if digest in self._entries:
+                return self._entries[digest]
+
+            entry = {"hash": digest, "ticket_id": ticket_id, "artifact": artifact, "run_id": run_id}
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, (json.dumps(entry, sort_keys=True) + "\n").encode("utf-8"))
+            finally:
+                os.close(fd)
+
+            self._entries[digest] = entry
+            return entry
@@ -1,125 +1,324 @@
 from __future__ import annotations
 
-import json
-import platform
-import sys
+import heapq
+import time
 from dataclasses import asdict, dataclass, is_dataclass
 from datetime import datetime, timezone
-from pathlib import Path
-from typing import List, Any, Optional
+from pathlib import Path, PurePosixPath
+from typing import Dict, List, Any, Optional, Set, Tuple
+
+from .artifacts import plan_artifact, write_artifact, write_run_meta
+from .blobs import BlobStore
+from .bundle import BundleWriter
+from .workspace import StagedWrites, VirtualWorkspace
 
 @dataclass(frozen=True)
 class ExecutionResult:
     artifact_path: str
     step_count: int
-    failed: bool 
+    failed: bool
+
+
+# =========================================================
+# Step Scheduling
+# =========================================================
+#
+# Steps form a DAG. A step waits for the ids in its `depends_on` and
+# for every earlier step that touches the same workspace path (or a
+# parent/child of it); with workers > 1 everything else runs
+# concurrently on a bounded pool. The outcome is the sequential one: a
+# step's writes are staged and committed to the workspace in step
+# order, and its dependents start once it is committed. Once a step
+# fails, no later step (in step order) starts, steps before it still
+# run, and the artifact and workspace hold the steps up to and
+# including the first failure. A later step already running finishes,
+# but its writes are dropped and it is left out of the artifact.
+#
+# Steps are short in-memory writes, so the pool costs more than it
+# overlaps (about 2x slower in benchmarks/run.py); one worker is the
+# default.
+
+def _step_data(step: Any) -> Dict[str, Any]:
+    if is_dataclass(step):
+        return asdict(step)
+    elif hasattr(step, "copy"):
+        return step.copy()
+    return dict(step)
+
+def _command(desc: str) -> Tuple[Optional[str], Optional[str]]:
+    """(command, workspace-relative target) of a step description."""
+    desc_lower = desc.lower().strip()
+    if "write " in desc_lower:
+        if ":" not in desc:
+            return "write", None
+        return "write", desc.split(":", 1)[0].strip().replace("write ", "", 1).strip()
+    if "create " in desc_lower:
+        return "create", desc_lower.replace("create ", "").strip()
+    return None, None
+
+def plan_dependencies(steps: List[Dict[str, Any]]) -> List[Set[int]]:
+    """
+    Indices each step waits for: its declared `depends_on` ids plus every
+    earlier step writing an overlapping path. Raises ValueError on an
+    unknown id, a cycle, or a step depending on a later one (steps take
+    effect in step order, so a dependency has to come first).
+    """
+    index = {s.get("id"): i for i, s in enumerate(steps)}
+    deps: List[Set[int]] = []
+    # path parts -> last step writing exactly there (it waits on the ones before)
+    last_writer: Dict[Tuple[str, ...], int] = {}
+    # path parts -> steps since then writing somewhere below it
+    writers_below: Dict[Tuple[str, ...], List[int]] = {}
+
+    for i, s in enumerate(steps):
+        waits = set()
+        for dep in s.get("depends_on") or ():
+            if dep not in index:
+                raise ValueError(f"Step {s.get('id')} depends on unknown step {dep}")
+            waits.add(index[dep])
+
+        _, target = _command(s.get("description", ""))
+        if target:
+            parts = PurePosixPath(target).parts
+            prefixes = [parts[:n] for n in range(1, len(parts))]
+            # the path itself, its parents and anything below it
+            waits.update(last_writer[p] for p in prefixes + [parts] if p in last_writer)
+            waits.update(writers_below.pop(parts, ()))
+            last_writer[parts] = i
+            for p in prefixes:
+                writers_below.setdefault(p, []).append(i)
+        deps.append(waits)
+
+    # Kahn's algorithm, only to reject cycles before anything runs
+    dependents = _dependents(deps)
+    blocking = [len(d) for d in deps]
+    ready = [i for i, n in enumerate(blocking) if n == 0]
+    for i in ready:
+        for j in dependents[i]:
+            blocking[j] -= 1
+            if blocking[j] == 0:
+                ready.append(j)
+    if len(ready) < len(deps):
+        ids = sorted(steps[i].get("id") for i, n in enumerate(blocking) if n)
+        raise ValueError(f"Step dependencies form a cycle: {ids}")
+    for i, waits in enumerate(deps):
+        later = sorted(steps[j].get("id") for j in waits if j > i)
+        if later:
+            raise ValueError(f"Step {steps[i].get('id')} depends on later step(s) {later}; list them first")
+    return deps
+
+def _dependents(deps: List[Set[int]]) -> List[List[int]]:
+    dependents: List[List[int]] = [[] for _ in deps]
+    for i, d in enumerate(deps):
+        for j in d:
+            # a dependency outside `deps` never runs, so `i` never starts
+            if j < len(deps):
+                dependents[j].append(i)
+    return dependents
+
+def _run_step(s_data: Dict[str, Any], workspace: StagedWrites, ticket_id: str) -> bool:
+    """Performs one step in the workspace; returns True if it failed."""
+    desc = s_data.get("description", "")
+    command, target_rel_path = _command(desc)
+    failed = False
+
+    # COMMAND: WRITE (filename: content)
+    if command == "write":
+        try:
+            if target_rel_path is not None:
+                content = desc.split(":", 1)[1].strip()
+                workspace.write_text(target_rel_path, content)
+                s_data["output"] = f"Successfully wrote {len(content)} chars to {target_rel_path}"
+                s_data["status"] = "completed"
+            else:
+                s_data["output"] = "Write command missing content (expected 'write file: content')"
+                s_data["status"] = "failed"
+                failed = True
+        except Exception as e:
+            s_data["status"] = "failed"
+            s_data["output"] = f"Write Error: {str(e)}"
+            failed = True
+
+    # COMMAND: CREATE (simple file touch)
+    elif command == "create":
+        try:
+            workspace.write_text(target_rel_path, f"# Created by Clearframe\n# Ticket: {ticket_id}")
+            s_data["output"] = f"Successfully created {target_rel_path}"
+            s_data["status"] = "completed"
+        except Exception as e:
+            s_data["status"] = "failed"
+            s_data["output"] = f"Create Error: {str(e)}"
+            failed = True
+
+    # DEFAULT: Mark as completed if no command matched
+    if (s_data.get("status") == "pending" or not s_data.get("status")) and not failed:
+        s_data["status"] = "completed"
+    return failed
+
+def _schedule(deps: List[Set[int]], run, workers: int, commit=None) -> Tuple[Set[int], Optional[int]]:
+    """
+    Runs `run(i)` for each step index, lowest index first, up to
+    `workers` at a time. `run` returns True on failure. Finished steps
+    are committed (`commit(i)`) in index order, never from the first
+    failure on, and a step starts once its dependencies are committed.
+    Returns (indices that ran, first failed index).
+    """
+    dependents = _dependents(deps)
+    blocking = [len(d) for d in deps]
+
+    ready = [i for i, n in enumerate(blocking) if n == 0]
+    heapq.heapify(ready)
+    ran: Set[int] = set()
+    first_failed: Optional[int] = None
+    # finished, not yet committed
+    finished: Set[int] = set()
+    next_commit = 0
+
+    def finish(i: int, failed: bool) -> None:
+        nonlocal first_failed, next_commit
+        ran.add(i)
+        finished.add(i)
+        if failed and (first_failed is None or i < first_failed):
+            first_failed = i
+        while next_commit in finished and (first_failed is None or next_commit < first_failed):
+            j = next_commit
+            finished.discard(j)
+            next_commit += 1
+            if commit is not None:
+                commit(j)
+            for k in dependents[j]:
+                blocking[k] -= 1
+                if blocking[k] == 0:
+                    heapq.heappush(ready, k)
+
+    def next_ready() -> Optional[int]:
+        while ready:
+            i = heapq.heappop(ready)
+            # nothing after the first failure starts
+            if first_failed is None or i < first_failed:
+                return i
+        return None
+
+    if workers <= 1:
+        while (i := next_ready()) is not None:
+            finish(i, run(i))
+        return ran, first_failed
+
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+    running = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while True:
+            while len(running) < workers and (i := next_ready()) is not None:
+                running[pool.submit(run, i)] = i
+            if not running:
+                return ran, first_failed
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in sorted(done, key=running.get):
+                finish(running.pop(future), future.result())
 
 def execute_plan(
-    ticket_id: str, 
-    steps: List[Any], 
-    run_dir: Path, 
-    fail_step_id: Optional[int] = None
+    ticket_id: str,
+    steps: List[Any],
+    run_dir: Path,
+    fail_step_id: Optional[int] = None,
+    artifact_format: str = "json",
+    bundle: Optional[BundleWriter] = None,
+    workers: int = 1,
+    materialize: bool = True,
+    blobs: Optional[BlobStore] = None,
 ) -> ExecutionResult:
     """
-    Executes a plan by performing file system operations within a 
+    Executes a plan by performing file system operations within a
     deterministic sandbox (workspace).
+    With a `bundle`, the artifact is appended to it instead of written alone.
+    Independent steps run up to `workers` at a time (see plan_dependencies);
+    each step's wall time lands in the artifact's meta.timings_ms.
+    Steps write into a VirtualWorkspace, committed step by step in step
+    order, that is flushed to disk once at the end, or not at all
+    without `materialize`; the artifact keeps its manifest either way. With `blobs`, workspace files are hardlinks
+    into that shared store.
     """
     run_dir.mkdir(parents=True, exist_ok=True)
-    
+    write_run_meta(run_dir)
+
     # Define the Workspace (The Sandbox)
-    workspace = run_dir / "workspace"
-    workspace.mkdir(parents=True, exist_ok=True)
-    
-    processed_steps = []
-    run_failed = False
-
-    for step in steps:
-        # 1. Setup Step Data
-        if is_dataclass(step):
-            s_data = asdict(step)
-        elif hasattr(step, "copy"):
-            s_data = step.copy()
-        else:
-            s_data = dict(step)
-
-        # 2. Constitutional Check: Failure Simulation
-        if fail_step_id is not None and s_data.get("id") == fail_step_id:
-            s_data["status"] = "failed"
-            s_data["output"] = f"Simulated failure at Step {fail_step_id}"
-            processed_steps.append(s_data)
-            run_failed = True
-            break 
-        
-        desc = s_data.get("description", "")
-        desc_lower = desc.lower().strip()
-
-        # 3. COMMAND: WRITE (filename: content)
-        if "write " in desc_lower:
-            try:
-                if ":" in desc:
-                    parts = desc.split(":", 1)
-                    cmd_and_path = parts[0].strip()
-                    content = parts[1].strip()
-                    
-                    target_rel_path = cmd_and_path.replace("write ", "", 1).strip()
-                    target_path = workspace / target_rel_path
-                    target_path.parent.mkdir(parents=True, exist_ok=True)
-                    
-                    target_path.write_text(content, encoding="utf-8")
-                    s_data["output"] = f"Successfully wrote {len(content)} chars to {target_rel_path}"
-                    s_data["status"] = "completed"
-                else:
-                    s_data["output"] = "Write command missing content (expected 'write file: content')"
-                    s_data["status"] = "failed"
-                    run_failed = True
-            except Exception as e:
-                s_data["status"] = "failed"
-                s_data["output"] = f"Write Error: {str(e)}"
-                run_failed = True
-
-        # 4. COMMAND: CREATE (simple file touch)
-        elif "create " in desc_lower:
-            try:
-                target_rel_path = desc_lower.replace("create ", "").strip()
-                target_path = workspace / target_rel_path
-                target_path.parent.mkdir(parents=True, exist_ok=True)
-                
-                target_path.write_text(f"# Created by Clearframe\n# Ticket: {ticket_id}", encoding="utf-8")
-                s_data["output"] = f"Successfully created {target_rel_path}"
-                s_data["status"] = "completed"
-            except Exception as e:
-                s_data["status"] = "failed"
-                s_data["output"] = f"Create Error: {str(e)}"
-                run_failed = True
+    workspace = VirtualWorkspace(run_dir / "workspace")
 
-        # 5. DEFAULT: Mark as completed if no command matched
-        if (s_data.get("status") == "pending" or not s_data.get("status")) and not run_failed:
-            s_data["status"] = "completed"
-            
-        processed_steps.append(s_data)
-        if run_failed:
-            break
+    # 1. Setup Step Data
+    step_data = [_step_data(step) for step in steps]
+    deps = plan_dependencies(step_data)
+
+    # 2. Constitutional Check: Failure Simulation
+    # Steps after the simulated failure are never scheduled
+    simulated = next((i for i, s in enumerate(step_data) if fail_step_id is not None and s.get("id") == fail_step_id), None)
+    if simulated is not None:
+        step_data = step_data[: simulated + 1]
+        s_data = step_data[simulated]
+        s_data["status"] = "failed"
+        s_data["output"] = f"Simulated failure at Step {fail_step_id}"
+        schedulable = step_data[:simulated]
+    else:
+        schedulable = step_data
+
+    # 3. Run the DAG
+    timings: Dict[int, float] = {}
+    staged: Dict[int, StagedWrites] = {}
+
+    def run(i):
+        start = time.perf_counter()
+        staged[i] = workspace.staged()
+        try:
+            return _run_step(schedulable[i], staged[i], ticket_id)
+        finally:
+            timings[i] = round((time.perf_counter() - start) * 1000, 3)
+
+    def commit(i):
+        staged.pop(i).commit()
+
+    ran, first_failed = _schedule(deps[: len(schedulable)], run, min(workers, len(schedulable)), commit)
+
+    if first_failed is not None:
+        processed_steps = step_data[: first_failed + 1]
+    else:
+        processed_steps = step_data
+    for i, s_data in enumerate(processed_steps):
+        if i < len(schedulable) and i not in ran:
+            # waited on a step that never completed
+            s_data["status"] = "skipped"
+            s_data["output"] = "Dependency did not complete"
+    skipped = any(s_data.get("status") == "skipped" for s_data in processed_steps)
+    run_failed = first_failed is not None or simulated is not None or skipped
+
+    # 4. Materialize: one pass over the finished tree
+    if materialize:
+        workspace.flush(store=blobs)
 
-    # 6. Construct Artifact
+    # 5. Construct Artifact
     status_label = "DRY_RUN_FAILED" if run_failed else "DRY_RUN"
-    artifact = {
-        "ticket_id": ticket_id,
-        "status": status_label,
-        "workspace_path": str(workspace),
-        "steps": processed_steps,
-        "meta": {
+    artifact = plan_artifact(
+        ticket_id=ticket_id,
+        status=status_label,
+        workspace_path=str(workspace.root),
+        steps=processed_steps,
+        manifest=workspace.manifest(),
+        meta={
             "timestamp_utc": datetime.now(timezone.utc).isoformat(),
-            "python_version": sys.version,
-            "platform": platform.platform(),
-            "simulated_failure": run_failed
+            "simulated_failure": run_failed,
+            "workers": workers,
+            "materialized": materialize,
+            "timings_ms": {str(s.get("id")): timings[i] for i, s in enumerate(processed_steps) if i in timings},
         },
-    }
+    )
 
-    out_path = run_dir / f"{ticket_id}.execution.json"
-    out_path.write_text(json.dumps(artifact, indent=2), encoding="utf-8")
+    if bundle is not None:
+        out_path = bundle.add(artifact, artifact_format)
+    else:
+        out_path = write_artifact(run_dir, artifact, artifact_format)
 
     return ExecutionResult(
         artifact_path=str(out_path),
         step_count=len(processed_steps),
         failed=run_failed
-    )
\ No newline at end of file
+    )
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# =========================================================
+# Write-Ahead Run Journal
+# =========================================================
+#
+# Every run appends its ticket state transitions to journal.jsonl
+#
+#   claimed -> analyzed -> artifact-written -> renamed
+#
+# (or skipped / error). Each transition is one O_APPEND write, so after
+# a process crash the last line per ticket says exactly what is left to
+# do. Only "artifact-written" and "renamed" (the records that keep
+# `resume` from writing an artifact twice) are fsync'd before the next
+# step starts; losing any other line to a machine crash just redoes
+# that step. Syncs are group commits: one fsync covers every line
+# appended before it, so workers queued behind it skip their own.
+# "analyzed" carries the engine output, which lets `resume` finish a
+# ticket without asking the LLM again.
+
+JOURNAL_NAME = "journal.jsonl"
+
+CLAIMED = "claimed"
+ANALYZED = "analyzed"
+WRITTEN = "artifact-written"
+RENAMED = "renamed"
+SKIPPED = "skipped"
+FAILED = "error"
+
+TERMINAL = frozenset({RENAMED, SKIPPED, FAILED})
+DURABLE = frozenset({WRITTEN, RENAMED})
+
+
+@dataclass
+class TicketState:
+    name: str
+    state: Optional[str] = None
+    output: Optional[Dict[str, Any]] = None
+    artifact: Optional[str] = None
+    kind: Optional[str] = None
+
+    @property
+    def done(self) -> bool:
+        return self.state in TERMINAL
+
+
+class Journal:
+    enabled = True
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._appended = 0
+        self._synced = 0
+
+        # Terminate a torn last line so it cannot swallow the next record
+        if self.path.exists() and self.path.stat().st_size:
+            with open(self.path, "rb+") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    f.write(b"\n")
+
+    def _append(self, entry: Dict[str, Any], durable: bool = False) -> None:
+        line = (json.dumps(entry, sort_keys=True) + "\n").encode("utf-8")
+        with self._lock:
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, line)
+            finally:
+                os.close(fd)
+            self._appended += 1
+            mark = self._appended
+        if durable:
+            self._sync(mark)
+
+    def _sync(self, mark: int) -> None:
+        """Returns once line `mark` is on disk, fsyncing only if no one has since."""
+        with self._sync_lock:
+            if self._synced >= mark:
+                return
+            with self._lock:
+                upto = self._appended
+            fd = os.open(self.path, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            self._synced = upto
+
+    def plan(self, ticket_names: List[str]) -> None:
+        """Records the batch up front, so unclaimed tickets are resumed too."""
+        self._append({"event": "batch", "tickets": list(ticket_names)})
+
+    def record(self, ticket_name: str, state: str, **fields: Any) -> None:
+        self._append({"ticket": ticket_name, "state": state, **fields}, durable=state in DURABLE)
+
+
+class NullJournal(Journal):
+    enabled = False
+
+    def __init__(self):
+        pass
+
+    def plan(self, ticket_names: List[str]) -> None:
+        pass
+
+    def record(self, ticket_name: str, state: str, **fields: Any) -> None:
+        pass
+
+
+NULL_JOURNAL = NullJournal()
+
+
+def read_journal(path: Path) -> Tuple[List[str], Dict[str, TicketState]]:
+    """
+    Folds a journal into (planned ticket names in order, state per ticket).
+    A torn last line from a crash is ignored.
+    """
+    planned: List[str] = []
+    tickets: Dict[str, TicketState] = {}
+    if not Path(path).exists():
+        return planned, tickets
+
+    for line in Path(path).read_bytes().splitlines():
+        try:
+            entry = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+
+        if entry.get("event") == "batch":
+            for name in entry["tickets"]:
+                if name not in tickets:
+                    planned.append(name)
+                    tickets[name] = TicketState(name)
+            continue
+
+        name = entry["ticket"]
+        if name not in tickets:
+            planned.append(name)
+            tickets[name] = TicketState(name)
+        state = tickets[name]
+        state.state = entry["state"]
+        if "output" in entry:
+            state.output = entry["output"]
+        if "artifact" in entry:
+            state.artifact = entry["artifact"]
+            state.kind = entry.get("kind")
+
+    return planned, tickets
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import socket
+import time
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+
+# =========================================================
+# Sharding and Ticket Leases
+# =========================================================
+#
+# Two ways for several loops (processes or hosts on a shared
+# filesystem) to drain one inbox without double work:
+#
+#   --shard i/N   static split by a stable hash of the ticket id
+#   --claim       dynamic: a ticket is owned by whoever renames it into
+#                 claimed/<worker>/ first; the rename is atomic, so
+#                 exactly one worker wins. A claim whose file is older
+#                 than the lease is presumed dead and returned to incoming.
+#
+# A claim stamps the file's mtime, and the stamp is renewed as each
+# ticket of the chunk starts. Silent and failed tickets go back to
+# incoming/ with that stamp, so a worker skips any file on its list
+# stamped after it listed it: someone else already handled it.
+
+CLAIMED_DIR = "claimed"
+
+# files travelling with a claimed ticket: batch-file progress (see bulk.py)
+COMPANION_SUFFIXES = (".offset",)
+
+Shard = Tuple[int, int]
+
+
+def parse_shard(spec: str) -> Shard:
+    """'2/4' -> (2, 4); shards are numbered 1..N."""
+    try:
+        index, count = (int(x) for x in spec.split("/"))
+    except ValueError:
+        raise ValueError(f"Shard must look like i/N, got {spec!r}")
+    if not 1 <= index <= count:
+        raise ValueError(f"Shard index must be in 1..{count}, got {index}")
+    return index, count
+
+
+def shard_of(ticket_id: str, count: int) -> int:
+    # sha1, not hash(): stable across processes, hosts and PYTHONHASHSEED
+    digest = hashlib.sha1(ticket_id.upper().encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % count + 1
+
+
+def in_shard(ticket_file: Path, shard: Optional[Shard]) -> bool:
+    """
+    Keyed on the file stem, the ticket id fallback, so a shard never
+    opens another shard's files to decide.
+    """
+    if shard is None:
+        return True
+    index, count = shard
+    return shard_of(ticket_file.stem, count) == index
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class LeaseManager:
+    def __init__(self, tickets_dir: Path, worker_id: Optional[str] = None, lease_seconds: float = 600.0):
+        self.worker_id = worker_id or default_worker_id()
+        self.lease_seconds = lease_seconds
+        self.claim_dir = Path(tickets_dir) / CLAIMED_DIR / self.worker_id
+
+    def claim(self, ticket_files: Iterable[Path], limit: int, listed_at: Optional[float] = None) -> List[Path]:
+        """
+        Claims up to `limit` tickets. Files another worker took first are
+        skipped, and so are files stamped since `listed_at` (when the
+        caller listed them): another worker claimed and handed them back
+        in the meantime. Returns the claimed paths (inside claim_dir).
+        """
+        self.claim_dir.mkdir(parents=True, exist_ok=True)
+        claimed = []
+        for p in ticket_files:
+            if len(claimed) >= limit:
+                break
+            target = self.claim_dir / p.name
+            try:
+                if listed_at is not None and p.stat().st_mtime >= listed_at:
+                    continue
+                os.rename(p, target)
+            except FileNotFoundError:
+                continue
+            # the lease runs from the claim, not from when the file landed;
+            # stamped from time.time(), the clock listed_at is read from
+            _stamp(target)
+            for suffix in COMPANION_SUFFIXES:
+                companion = p.with_name(p.name + suffix)
+                if companion.exists():
+                    os.rename(companion, self.claim_dir / companion.name)
+            claimed.append(target)
+        return claimed
+
+    def renew(self) -> None:
+        """Restarts the lease on everything this worker holds."""
+        if not self.claim_dir.exists():
+            return
+        for p in self.claim_dir.iterdir():
+            try:
+                _stamp(p)
+            except FileNotFoundError:
+                continue
+
+    def release(self, incoming: Path) -> int:
+        """Hands every claimed file (done or not) back to incoming/."""
+        return _move_all(self.claim_dir, incoming)
+
+
+def _stamp(path: Path) -> None:
+    # not a bare utime(): the kernel's coarse file clock can lag time.time()
+    now = time.time()
+    os.utime(path, (now, now))
+
+
+def _move_all(folder: Path, incoming: Path, older_than: Optional[float] = None) -> int:
+    if not folder.exists():
+        return 0
+    moved = 0
+    for p in folder.iterdir():
+        try:
+            if older_than is not None and p.stat().st_mtime >= older_than:
+                continue
+            os.rename(p, incoming / p.name)
+            moved += 1
+        except FileNotFoundError:
+            # released or reaped concurrently
+            continue
+    return moved
+
+
+def reap_expired(tickets_dir: Path, incoming: Path, lease_seconds: float, now: Optional[float] = None) -> int:
+    """Returns tickets whose lease expired (crashed workers) to incoming/."""
+    root = Path(tickets_dir) / CLAIMED_DIR
+    if not root.exists():
+        return 0
+    cutoff = (time.time() if now is None else now) - lease_seconds
+    return sum(_move_all(d, incoming, older_than=cutoff) for d in root.iterdir() if d.is_dir())
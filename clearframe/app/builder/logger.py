@@ -1,10 +1,10 @@
 from __future__ import annotations
 
 import json
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, List, Optional
 
 
 @dataclass(frozen=True)
@@ -13,9 +13,15 @@ class RunLog:
     timestamp_utc: str
     processed: int
     artifacts: List[str]
+    stats: Dict[str, Any] = field(default_factory=dict)
 
 
-def write_run_log(run_dir: Path, processed: int, artifacts: List[str]) -> str:
+def write_run_log(
+    run_dir: Path,
+    processed: int,
+    artifacts: List[str],
+    stats: Optional[Dict[str, Any]] = None,
+) -> str:
     """
     Writes deterministic log for a loop execution.
     Returns log file path.
@@ -28,6 +34,7 @@ def write_run_log(run_dir: Path, processed: int, artifacts: List[str]) -> str:
         timestamp_utc=datetime.now(timezone.utc).isoformat(),
         processed=processed,
         artifacts=artifacts,
+        stats=stats or {},
     )
 
     path = run_dir / "run_log.json"
@@ -1,70 +1,681 @@
 from pathlib import Path
+from contextlib import nullcontext
+from ..core.detector import REGISTRY
 from ..core.engine import ClearframeEngine
+from ..core.features import featurize
 from ..core.llm import MockClient, GeminiClient
-from .planner import load_ticket
+from ..core.schemas import EngineOutput
+from ..core.tracing import NULL_TRACER, Tracer, use_tracer
+from .artifacts import analysis_artifact, duplicate_artifact, read_run_meta, write_artifact, write_run_meta
+from .bulk import BatchProgress, BatchRecord, chunks, is_batch_file
+from .bundle import BUNDLE_NAME, BundleWriter
+from .logger import write_run_log
+from .dedupe import CONTENT_INDEX_NAME, ContentIndex, content_hash
+from .journal import (
+    ANALYZED, CLAIMED, FAILED, JOURNAL_NAME, NULL_JOURNAL, RENAMED, SKIPPED, WRITTEN,
+    Journal, read_journal,
+)
+from .lease import LeaseManager, in_shard, reap_expired
+from .planner import read_ticket_data, ticket_from_data, ticket_id_for
+from .run_index import append_run
+from .state import FAILED as STATE_FAILED, NULL_STORE, PROCESSED, SILENT, STATE_DB_NAME, TicketStore
 import os
-import json
 import time
+from dataclasses import asdict
 from types import SimpleNamespace
 
-def run_local_loop(repo_root=None, fail_step_id=None):
+def _process_ticket(
+    ticket_file,
+    engine,
+    run_path,
+    tracer=NULL_TRACER,
+    artifact_format="json",
+    bundle=None,
+    data=None,
+    journal=NULL_JOURNAL,
+):
+    """
+    Handles one incoming ticket end to end.
+    Returns (status, lines, artifact) so the caller can report in a stable order.
+    `data` skips re-reading a ticket the caller already parsed.
+    """
+    lines = []
+    with use_tracer(tracer), tracer.ticket(ticket_file.name):
+        try:
+            journal.record(ticket_file.name, CLAIMED)
+            if data is None:
+                data = _ticket_data(ticket_file)
+            # tokenized once per ticket; the scan is cached on the record
+            with tracer.span("tokenize"):
+                features = featurize(data.get("body", ""))
+            ticket = ticket_from_data(data, ticket_file, features)
+            lines.append(f"Processing {ticket.ticket_id}...")
+
+            output = engine.analyze(ticket.body, ticket.bias_type, ticket.signal_strength)
+
+            if output.intervention_type == "NO":
+                journal.record(ticket_file.name, SKIPPED)
+                lines.append(f"⚪ [SKIP] Silence maintained for {ticket.ticket_id}")
+                return "skipped", lines, None
+
+            journal.record(ticket_file.name, ANALYZED, output=asdict(output))
+
+            icon = "🟢" if output.intervention_type == "YES" else "🟡"
+            lines.append(f"{icon} [{output.intervention_type}] Bias Detected: {output.bias_context}")
+
+            meta = {}
+            if tracer.enabled:
+                # stages so far; writing and renaming land in the run log
+                meta["timings_ms"] = tracer.durations(ticket_file.name)
+
+            record = analysis_artifact(ticket, output, meta)
+            artifact = _finish_ticket(ticket_file, record, run_path, tracer, artifact_format, bundle, journal)
+            return "processed", lines, artifact
+
+        except Exception as e:
+            journal.record(ticket_file.name, FAILED, error=str(e))
+            lines.append(f"❌ Error: {e}")
+            return "error", lines, None
+
+def _finish_ticket(ticket_file, record, run_path, tracer, artifact_format, bundle, journal=NULL_JOURNAL):
+    # Atomic write: a crash never leaves a torn artifact
+    with tracer.span("write_artifact"):
+        if bundle is not None:
+            artifact = str(bundle.add(record, artifact_format))
+        else:
+            artifact = str(write_artifact(run_path, record, artifact_format))
+    journal.record(ticket_file.name, WRITTEN, artifact=artifact, kind=record["kind"])
+
+    with tracer.span("rename"):
+        _mark_done(ticket_file)
+    journal.record(ticket_file.name, RENAMED)
+    return artifact
+
+def _ticket_data(ticket_file):
+    # records of a batch file were parsed while streaming it
+    if isinstance(ticket_file, BatchRecord):
+        return ticket_file.data
+    return read_ticket_data(ticket_file)
+
+def _mark_done(ticket_file):
+    if isinstance(ticket_file, BatchRecord):
+        ticket_file.done()
+    else:
+        ticket_file.rename(ticket_file.with_name(f"{ticket_file.stem}.done.json"))
+
+def _duplicate_ticket(ticket_file, data, digest, original, run_path, tracer, artifact_format, bundle, journal=NULL_JOURNAL):
+    """Records a ticket whose content was already analyzed, without the engine."""
+    t_id = ticket_id_for(data, ticket_file)
+    lines = [f"Processing {t_id}...", f"🔁 [DUP] {t_id} duplicates {original['ticket_id']}"]
+    with use_tracer(tracer), tracer.ticket(ticket_file.name):
+        try:
+            journal.record(ticket_file.name, CLAIMED)
+            record = duplicate_artifact(t_id, data.get("title", "Untitled Ticket"), digest, original)
+            artifact = _finish_ticket(ticket_file, record, run_path, tracer, artifact_format, bundle, journal)
+            return "duplicate", lines, artifact
+        except Exception as e:
+            journal.record(ticket_file.name, FAILED, error=str(e))
+            lines.append(f"❌ Error: {e}")
+            return "error", lines, None
+
+def _hash_batch(ticket_files, dedupe, tracer):
+    """
+    Parses and hashes a batch in input order on the calling thread, so
+    which copy counts as the original never depends on pool timing.
+    Yields (data, digest, original) per file; `original` is a content
+    index entry, the position of an earlier copy in this batch, or None
+    (always None without a `dedupe` index).
+    """
+    first = {}
+    for i, p in enumerate(ticket_files):
+        try:
+            with use_tracer(tracer), tracer.ticket(p.name):
+                data = _ticket_data(p)
+        except Exception:
+            # unreadable: let _process_ticket report it
+            yield None, None, None
+            continue
+
+        digest = content_hash(data)
+        original = None
+        if dedupe is not None:
+            original = dedupe.get(digest)
+            if original is None:
+                original = first.get(digest)
+            first.setdefault(digest, i)
+        yield data, digest, original
+
+def build_llm(root, use_cache=True, llm=None, llm_batch=1, llm_batch_delay=0.02, resilience=None):
+    """
+    Resolves the configured provider, optionally behind the reframe cache.
+    A given `llm` client takes precedence over the environment.
+    With `llm_batch` > 1, concurrent reframe requests (one per worker)
+    are grouped into a single upstream call of up to that many, if the
+    provider takes raw prompts (`complete`).
+    A `resilience` policy adds timeouts, retries, a circuit breaker and
+    rate limiting to every upstream call.
+    Returns (provider, llm, cache).
+    """
     provider = os.getenv("CLEARFRAME_LLM_PROVIDER", "mock")
-    
-    if provider == "gemini":
+
+    if llm is not None:
+        provider = llm.model_id
+    elif provider == "gemini":
          try:
              from google import genai
-             llm = GeminiClient(os.getenv("GEMINI_API_KEY"))
+             llm = GeminiClient(os.getenv("GEMINI_API_KEY"), model=os.getenv("GEMINI_MODEL", "gemini-2.0-flash"))
          except ImportError:
              print("⚠️ Gemini library missing. Falling back to Mock.")
              llm = MockClient()
     else:
          llm = MockClient()
 
-    engine = ClearframeEngine(llm_client=llm)
-    
+    if resilience is not None:
+        from ..core.llm_resilience import ResilientClient
+
+        llm = ResilientClient(llm, resilience)
+
+    if llm_batch > 1:
+        from ..core.llm_batch import BatchingClient, can_batch
+
+        if can_batch(llm):
+            llm = BatchingClient(llm, max_batch=llm_batch, max_delay=llm_batch_delay)
+        else:
+            print(f"⚠️ {provider} does not take batched prompts; --llm-batch ignored.")
+
+    # Reframe requests repeat across tickets and nights; pay for each once
+    cache = None
+    if use_cache:
+        from ..core.llm_cache import CachedClient, ReframeCache
+
+        cache = ReframeCache(Path(root) / "clearframe/tickets/cache/reframe.sqlite")
+        llm = CachedClient(llm, cache)
+
+    return provider, llm, cache
+
+def new_run_dir(runs_dir):
+    """
+    Creates a fresh timestamped run directory.
+    Runs started within the same second get a -2, -3, ... suffix.
+    """
+    timestamp = time.strftime("%Y%m%dT%H%M%SZ")
+    runs_dir.mkdir(parents=True, exist_ok=True)
+
+    run_path = runs_dir / timestamp
+    n = 1
+    while True:
+        try:
+            run_path.mkdir()
+            return run_path
+        except FileExistsError:
+            n += 1
+            run_path = runs_dir / f"{timestamp}-{n}"
+
+def pending_tickets(incoming):
+    """Ticket files and unfinished batch files (*.jsonl, *.jsonl.gz)."""
+    # Sorted so sequential and pooled runs report identically
+    tickets = [p for p in incoming.glob("*.json") if not p.name.endswith(".done.json")]
+    batches = [p for p in incoming.glob("*.jsonl*") if is_batch_file(p)]
+    return sorted(tickets + batches)
+
+def open_state(root, enabled=True):
+    """The ticket audit index under `root` (see state.py), or NULL_STORE when not `enabled`."""
+    if not enabled:
+        return NULL_STORE
+    state = TicketStore(Path(root) / "clearframe/tickets" / STATE_DB_NAME)
+    if state.migrated:
+        print(f"🗃️  Imported {state.migrated} processed ticket(s) into {STATE_DB_NAME}")
+    return state
+
+def process_batch(
+    ticket_files,
+    engine,
+    run_path,
+    workers=1,
+    tracer=NULL_TRACER,
+    artifact_format="json",
+    bundle=False,
+    dedupe=None,
+    journal=NULL_JOURNAL,
+    state=NULL_STORE,
+    lease=None,
+):
+    """
+    Runs a batch of ticket files into one run directory.
+    Output and counts are reported in input order whatever the pool size.
+    With `bundle`, artifacts are streamed into run.bundle instead of one file each:
+    pass the run's open BundleWriter (the caller closes it, see finish_run),
+    or True to open and close one for just this batch.
+    With a `dedupe` ContentIndex, tickets whose content was already
+    analyzed get a duplicate-of artifact instead of an engine run.
+    Every ticket's outcome is written to the `state` store in one
+    transaction per batch.
+    Batch files are streamed in chunks after the ticket files.
+    With a `lease` (LeaseManager), its claims are renewed as each ticket
+    starts.
+    """
+    if bundle is True:
+        writer = BundleWriter(run_path / BUNDLE_NAME)
+        try:
+            return process_batch(ticket_files, engine, run_path, workers, tracer, artifact_format, writer, dedupe, journal, state, lease)
+        finally:
+            writer.close()
+
+    ticket_files = list(ticket_files)
+    streams = [p for p in ticket_files if is_batch_file(p)]
+    if streams:
+        def run(files):
+            return process_batch(files, engine, run_path, workers, tracer, artifact_format, bundle, dedupe, journal, state, lease)
+
+        batch = run([p for p in ticket_files if not is_batch_file(p)])
+        for p in streams:
+            _add_batch(batch, _process_batch_file(p, max(16, workers * 4), run))
+        return batch
+
+    journal.plan([p.name for p in ticket_files])
+    # an empty writer is falsy (len 0): test the type, not the truth
+    writer = bundle if isinstance(bundle, BundleWriter) else None
+
+    if dedupe is not None or state.enabled:
+        hashed = list(_hash_batch(ticket_files, dedupe, tracer))
+    else:
+        hashed = [(None, None, None)] * len(ticket_files)
+
+    def process(i):
+        if lease is not None:
+            lease.renew()
+        return _process_ticket(ticket_files[i], engine, run_path, tracer, artifact_format, writer, hashed[i][0], journal)
+
+    batch = SimpleNamespace(processed=0, failed=0, duplicates=0, artifacts=[], detectors={})
+    # per-detector hit counts and timings ride along with --trace
+    with REGISTRY.profile() if tracer.enabled else nullcontext():
+        fresh = [i for i, (_, _, original) in enumerate(hashed) if original is None]
+        if workers > 1:
+            from concurrent.futures import ThreadPoolExecutor
+
+            # Threads overlap the blocking LLM round-trips; map() keeps input order
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                outcomes = dict(zip(fresh, pool.map(process, fresh)))
+        else:
+            outcomes = {i: process(i) for i in fresh}
+
+        recorded = {}
+        rows = []
+        for i, p in enumerate(ticket_files):
+            data, digest, original = hashed[i]
+            if isinstance(original, int):
+                # copy of an earlier ticket in this batch, if that one got an artifact
+                original = recorded.get(original)
+                if original is None:
+                    outcomes[i] = process(i)
+
+            if i in outcomes:
+                status, lines, artifact = outcomes[i]
+            else:
+                status, lines, artifact = _duplicate_ticket(p, data, digest, original, run_path, tracer, artifact_format, writer, journal)
+
+            for line in lines:
+                print(line)
+            if status == "processed":
+                batch.processed += 1
+                batch.artifacts.append(artifact)
+                if dedupe is not None and digest is not None:
+                    recorded[i] = dedupe.add(digest, ticket_id_for(data, p), artifact, run_path.name)
+            elif status == "duplicate":
+                batch.duplicates += 1
+                batch.artifacts.append(artifact)
+            elif status == "error":
+                batch.failed += 1
+
+            if state.enabled:
+                rows.append((ticket_id_for(data or {}, p), _STATE_OF[status], digest, run_path.name, p.name))
+        state.mark_many(rows)
+        if tracer.enabled:
+            batch.detectors = REGISTRY.stats()
+
+    batch.lookups = sum(1 for _, digest, _ in hashed if digest is not None) if dedupe is not None else 0
+    return batch
+
+# silent tickets stay in incoming/ and are looked at again next run
+_STATE_OF = {"processed": PROCESSED, "duplicate": PROCESSED, "skipped": SILENT, "error": STATE_FAILED}
+
+def _process_batch_file(path, chunk, run_batch):
+    """
+    Streams a batch file through `run_batch` `chunk` records at a time,
+    starting after its last finished record. Records that ended silent
+    or failed count as finished too, like ticket files left in incoming/.
+    """
+    progress = BatchProgress(path)
+    if progress.offset:
+        print(f"↪️  Resuming {path.name} after record {progress.records}")
+
+    total = SimpleNamespace(processed=0, failed=0, duplicates=0, artifacts=[], lookups=0)
+    for records in chunks(progress.stream(), chunk):
+        _add_batch(total, run_batch(records))
+        for record in records:
+            record.done()
+
+    progress.finish()
+    return total
+
+def _add_batch(total, batch):
+    total.processed += batch.processed
+    total.failed += batch.failed
+    total.duplicates += batch.duplicates
+    total.lookups += batch.lookups
+    total.artifacts.extend(batch.artifacts)
+
+# gauges and settings: reported as they are, never as a per-run difference
+_NOT_COUNTERS = frozenset({"hit_rate", "prompt_version", "state", "policy"})
+
+def llm_counters(cache=None, llm=None):
+    """The reframe cache's and the LLM wrappers' counters, as the run log reports them."""
+    stats = {}
+    if cache is not None:
+        stats["llm_cache"] = cache.stats()
+    if llm is not None:
+        stats.update(llm.run_stats())
+    return stats
+
+def _counters_since(now, before):
+    out = {}
+    for key, value in now.items():
+        prev = before.get(key)
+        if key in _NOT_COUNTERS or prev is None or isinstance(value, bool):
+            out[key] = value
+        elif isinstance(value, dict):
+            out[key] = _counters_since(value, prev)
+        elif isinstance(value, (int, float)):
+            out[key] = round(value - prev, 3) if isinstance(value, float) else value - prev
+        else:
+            out[key] = value
+    if "hit_rate" in out:
+        lookups = out.get("hits", 0) + out.get("misses", 0)
+        out["hit_rate"] = round(out.get("hits", 0) / lookups, 4) if lookups else 0.0
+    return out
+
+def finish_run(runs_dir, run_path, batch, cache=None, tracer=NULL_TRACER, worker=None, llm=None, since=None, bundle=None):
+    """
+    Closes the run's `bundle` writer (its index is written once, here),
+    then writes the run log and records the run in the index.
+    `worker` (shard / worker id) tags a partial run of a sharded drain.
+    `llm` contributes its wrappers' counters (batching, retries, breaker)
+    and is closed last, so a call hung past its timeout cannot hold up exit.
+    With `since` (llm_counters() taken when the run started), a session
+    running several runs on one client logs this run's share only.
+    """
+    if bundle is not None:
+        bundle.close()
+    stats = {}
+    if worker:
+        stats["worker"] = worker
+    counters = llm_counters(cache, llm)
+    stats.update(_counters_since(counters, since) if since is not None else counters)
+    if batch.lookups:
+        stats["dedupe"] = {
+            "lookups": batch.lookups,
+            "hits": batch.duplicates,
+            "hit_rate": round(batch.duplicates / batch.lookups, 4),
+        }
+    if tracer.enabled:
+        stats["timings"] = tracer.summary()
+        stats["detectors"] = getattr(batch, "detectors", {})
+        stats["trace"] = tracer.export_chrome_trace(run_path / "trace.json")
+    write_run_log(run_path, batch.processed, batch.artifacts, stats=stats)
+    append_run(runs_dir, run_path, batch.processed, failed=batch.failed, extra=worker)
+    if llm is not None:
+        llm.close()
+
+def _drain_with_leases(ticket_files, leases, incoming, chunk, run_batch, listed_at=None):
+    """
+    Claims and processes tickets `chunk` at a time, so concurrent
+    workers interleave over one inbox instead of one grabbing it all.
+    Tickets another worker claimed first, or handled since `listed_at`,
+    are skipped.
+    """
+    total = SimpleNamespace(processed=0, failed=0, duplicates=0, artifacts=[], lookups=0)
+    remaining = iter(ticket_files)
+    while True:
+        claimed = leases.claim(remaining, chunk, listed_at)
+        if not claimed:
+            return total
+        try:
+            batch = run_batch(claimed)
+        finally:
+            # done files and silent/failed tickets go back where a plain run leaves them
+            leases.release(incoming)
+
+        _add_batch(total, batch)
+
+def run_local_loop(
+    repo_root=None,
+    fail_step_id=None,
+    workers=1,
+    use_cache=True,
+    llm=None,
+    trace=False,
+    artifact_format="json",
+    bundle=False,
+    dedupe=True,
+    shard=None,
+    claim=False,
+    worker_id=None,
+    lease_seconds=600.0,
+    llm_batch=1,
+    llm_batch_delay=0.02,
+    resilience=None,
+    record_state=False,
+):
+    """
+    One pass over incoming/ into a fresh run directory.
+
+    `shard` (i, N) keeps only this worker's share of tickets; `claim`
+    takes tickets through the lease protocol, so several loops can
+    drain the same inbox. Each writes its own partial run.
+    `record_state` also writes every outcome to the ticket audit index.
+    """
     root = Path(repo_root) if repo_root else Path(".")
+    tracer = Tracer() if trace else NULL_TRACER
+    provider, llm, cache = build_llm(root, use_cache, llm, llm_batch, llm_batch_delay, resilience)
+    engine = ClearframeEngine(llm_client=llm)
+
     incoming = root / "clearframe/tickets/incoming"
     runs_dir = root / "clearframe/tickets/runs"
-    
-    timestamp = time.strftime("%Y%m%dT%H%M%SZ")
-    run_path = runs_dir / timestamp
-    run_path.mkdir(parents=True, exist_ok=True)
-    
+    run_path = new_run_dir(runs_dir)
+    leases = LeaseManager(root / "clearframe/tickets", worker_id, lease_seconds) if claim else None
+    # a claiming run names its claimed/ folder, which resume empties
+    owner = {"worker_id": leases.worker_id} if leases else {}
+    if record_state:
+        # so resume keeps the store in step
+        owner["record_state"] = True
+    write_run_meta(run_path, provider=provider, artifact_format=artifact_format, bundle=bundle, **owner)
+
     print(f"🚀 Starting Loop [Provider: {provider.upper()}]")
-    
-    processed_count = 0
+
     if not incoming.exists():
         print(f"⚠️  No incoming folder found at {incoming}")
+        if cache is not None:
+            cache.close()
         return SimpleNamespace(processed=0, run_dir=run_path)
 
-    for ticket_file in incoming.glob("*.json"):
-        if ticket_file.name.endswith(".done.json"): continue
+    content_index = ContentIndex(root / "clearframe/tickets" / CONTENT_INDEX_NAME) if dedupe else None
+    journal = Journal(run_path / JOURNAL_NAME)
+    state = open_state(root, record_state)
+    # one writer for the run: chunks and batch files append to it
+    writer = BundleWriter(run_path / BUNDLE_NAME) if bundle else None
 
-        try:
-            ticket = load_ticket(ticket_file)
-            print(f"Processing {ticket.ticket_id}...")
-            
-            output = engine.analyze(ticket.body, ticket.bias_type, ticket.signal_strength)
-            
-            if output.intervention_type == "NO":
-                print(f"⚪ [SKIP] Silence maintained for {ticket.ticket_id}")
-                continue
+    def run_batch(files):
+        return process_batch(files, engine, run_path, workers, tracer, artifact_format, writer, content_index, journal, state, leases)
 
-            icon = "🟢" if output.intervention_type == "YES" else "🟡"
-            print(f"{icon} [{output.intervention_type}] Bias Detected: {output.bias_context}")
-            
-            with open(run_path / f"{ticket.ticket_id}.execution.json", "w") as f:
-                json.dump({"ticket": str(ticket), "analysis": str(output)}, f, indent=2)
-
-            new_name = ticket_file.with_name(f"{ticket_file.stem}.done.json")
-            ticket_file.rename(new_name)
-            processed_count += 1
-            
-        except Exception as e:
-            print(f"❌ Error: {e}")
-            
-    if processed_count == 0:
+    listed_at = time.time()
+    ticket_files = [p for p in pending_tickets(incoming) if in_shard(p, shard)]
+    worker = {}
+    if shard is not None:
+        worker["shard"] = f"{shard[0]}/{shard[1]}"
+    try:
+        if leases is not None:
+            tickets_dir = root / "clearframe/tickets"
+            worker["worker_id"] = leases.worker_id
+            reclaimed = reap_expired(tickets_dir, incoming, lease_seconds)
+            if reclaimed:
+                print(f"⏳ Reclaimed {reclaimed} ticket(s) from expired leases")
+                listed_at = time.time()
+                ticket_files = [p for p in pending_tickets(incoming) if in_shard(p, shard)]
+            batch = _drain_with_leases(ticket_files, leases, incoming, max(16, workers * 4), run_batch, listed_at)
+        else:
+            batch = run_batch(ticket_files)
+    except BaseException:
+        if writer is not None:
+            writer.close()
+        raise
+
+    if batch.processed == 0:
         print("✨ No new tickets to process.")
 
+    finish_run(runs_dir, run_path, batch, cache, tracer, worker, llm, bundle=writer)
+    state.close()
+    if cache is not None:
+        cache.close()
+
     # --- FINAL FIX: Return processed AND run_dir ---
-    return SimpleNamespace(processed=processed_count, run_dir=run_path)
+    return SimpleNamespace(processed=batch.processed, run_dir=run_path)
+
+def _journal_batch(planned, states):
+    """Run totals rebuilt from a journal, in batch order."""
+    batch = SimpleNamespace(processed=0, failed=0, duplicates=0, artifacts=[], lookups=0)
+    for name in planned:
+        state = states[name]
+        if state.state == FAILED:
+            batch.failed += 1
+        elif state.artifact is not None:
+            batch.artifacts.append(state.artifact)
+            if state.kind == "duplicate":
+                batch.duplicates += 1
+            else:
+                batch.processed += 1
+    return batch
+
+def _lost_from(writer, state):
+    """Whether a journaled artifact never reached the bundle (see bundle_ref)."""
+    return state.artifact is not None and state.artifact.rsplit("#", 1)[-1] not in writer
+
+def _rewrite_lost(ticket_file, state, artifact_format, writer, rest):
+    """
+    Writes a lost bundle record again from the journaled engine output.
+    A duplicate has none to rebuild from: its ticket goes back to
+    incoming/ and into `rest`. Returns whether resume should go on with
+    the ticket.
+    """
+    source = ticket_file if ticket_file.exists() else ticket_file.with_name(f"{ticket_file.stem}.done.json")
+    if not source.exists():
+        return False
+    if state.output is None:
+        if source != ticket_file:
+            source.rename(ticket_file)
+        rest.append(ticket_file)
+        return False
+
+    ticket = ticket_from_data(read_ticket_data(source), ticket_file)
+    writer.add(analysis_artifact(ticket, EngineOutput(**state.output)), artifact_format)
+    print(f"↪️  [REWRITE] {ticket.ticket_id} from journal")
+    return True
+
+def resume_run(repo_root=None, run_id=None, workers=1, use_cache=True, llm=None, dedupe=True, resilience=None, record_state=None):
+    """
+    Finishes a run that died part-way, driven by its journal.
+    Renamed, skipped and failed tickets are left alone (unless their
+    bundle record was lost); analyzed ones are
+    written from the journaled engine output without consulting the LLM;
+    only tickets that never got that far are analyzed again. Batch files
+    continue after their last finished record. A claiming run's
+    claimed/<worker>/ folder is handed back to incoming/ first.
+    `record_state` defaults to whether the run itself recorded state.
+    """
+    root = Path(repo_root) if repo_root else Path(".")
+    incoming = root / "clearframe/tickets/incoming"
+    runs_dir = root / "clearframe/tickets/runs"
+    run_path = runs_dir / run_id
+
+    journal_path = run_path / JOURNAL_NAME
+    if not journal_path.exists():
+        raise FileNotFoundError(f"No journal for run {run_id} at {journal_path}")
+
+    meta = read_run_meta(run_path)
+    artifact_format = meta.get("artifact_format", "json")
+    bundle = meta.get("bundle", False)
+
+    planned, states = read_journal(journal_path)
+    journal = Journal(journal_path)
+    print(f"♻️  Resuming {run_id}")
+
+    if meta.get("worker_id"):
+        # a crashed claiming worker left its tickets in claimed/<worker>/
+        leases = LeaseManager(root / "clearframe/tickets", meta["worker_id"])
+        reclaimed = leases.release(incoming)
+        if reclaimed:
+            print(f"⏳ Reclaimed {reclaimed} ticket(s) from {leases.claim_dir.name}'s claims")
+
+    rest = []
+    # state rows of the tickets finished from the journal
+    finished = []
+    # one writer for the whole resume, closed by finish_run
+    writer = BundleWriter(run_path / BUNDLE_NAME) if bundle else None
+    try:
+        for name in planned:
+            if "#" in name:
+                # a batch file record: the file resumes from its own offset
+                source = incoming / name.split("#", 1)[0]
+                if is_batch_file(source) and source.exists() and source not in rest:
+                    rest.append(source)
+                continue
+
+            state, ticket_file = states[name], incoming / name
+            if writer is not None and state.state in (WRITTEN, RENAMED) and _lost_from(writer, state):
+                if not _rewrite_lost(ticket_file, state, artifact_format, writer, rest):
+                    continue
+
+            if state.done or not ticket_file.exists():
+                continue
+
+            if state.state == WRITTEN:
+                data = read_ticket_data(ticket_file)
+                ticket_file.rename(ticket_file.with_name(f"{ticket_file.stem}.done.json"))
+                journal.record(name, RENAMED)
+                finished.append((ticket_id_for(data, ticket_file), PROCESSED, content_hash(data), run_id, name))
+                print(f"↪️  [RENAME] {name}")
+            elif state.state == ANALYZED:
+                data = read_ticket_data(ticket_file)
+                ticket = ticket_from_data(data, ticket_file)
+                record = analysis_artifact(ticket, EngineOutput(**state.output))
+                _finish_ticket(ticket_file, record, run_path, NULL_TRACER, artifact_format, writer, journal)
+                finished.append((ticket.ticket_id, PROCESSED, content_hash(data), run_id, name))
+                print(f"↪️  [WRITE] {ticket.ticket_id} from journal")
+            else:
+                rest.append(ticket_file)
+    except BaseException:
+        if writer is not None:
+            writer.close()
+        raise
+
+    provider, llm, cache = build_llm(root, use_cache, llm, resilience=resilience)
+    if record_state is None:
+        record_state = meta.get("record_state", False)
+    store = open_state(root, record_state)
+    if rest:
+        engine = ClearframeEngine(llm_client=llm)
+        content_index = ContentIndex(root / "clearframe/tickets" / CONTENT_INDEX_NAME) if dedupe else None
+        try:
+            process_batch(rest, engine, run_path, workers, NULL_TRACER, artifact_format, writer, content_index, journal, store)
+        except BaseException:
+            if writer is not None:
+                writer.close()
+            raise
+
+    batch = _journal_batch(*read_journal(journal_path))
+    store.mark_many(finished)
+    store.close()
+    finish_run(runs_dir, run_path, batch, cache, llm=llm, bundle=writer)
+    if cache is not None:
+        cache.close()
+
+    return SimpleNamespace(processed=batch.processed, reanalyzed=len(rest), run_dir=run_path)
@@ -1,8 +1,11 @@
-import json
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from dataclasses import dataclass
+from ..core.detector import elect_bias, scan
+from ..core.features import TicketFeatures
 from ..core.schemas import Ticket
+from ..core.tracing import current_tracer
+from .ticket_io import parse_ticket_text
 
 @dataclass(frozen=True)
 class Step:
@@ -10,45 +13,36 @@ class Step:
     description: str
     status: str = "pending"
     output: Optional[str] = None
+    # ids of steps that must complete first (see executor.plan_dependencies)
+    depends_on: Tuple[int, ...] = ()
 
 @dataclass(frozen=True)
 class Plan:
     steps: List[Step]
 
-def load_ticket(path: Path) -> Ticket:
-    raw_text = path.read_text(encoding="utf-8").strip()
-    try:
-        data = json.loads(raw_text)
-        if not isinstance(data, dict): data = {"body": str(data)}
-    except json.JSONDecodeError:
-        data = {"body": raw_text}
-
-    body_text = data.get("body", "").lower()
-    t_id = str(data.get("id", path.stem)).upper()
-    
-    signatures = {
-        "SUNK_COST": ["spent", "invested", "wasted", "already", "months"],
-        "CONFIRMATION_BIAS": ["proves", "reddit", "everyone says", "already know", "tweets"],
-        "RECENCY_BIAS": ["latest", "just announced", "breaking news", "today", "saw a post"],
-        "AUTHORITY_BIAS": ["boss", "ceo", "vp", "director", "manager", "says so", "directive"]
-    }
-    
-    results = []
-    for bias_name, keywords in signatures.items():
-        matches = sum(1 for word in keywords if word in body_text)
-        strength = matches / len(keywords)
-        results.append((bias_name, strength))
-    
-    bias, strength = max(results, key=lambda x: x[1])
-    if strength == 0: bias = "UNKNOWN"
+def read_ticket_data(path: Path) -> dict:
+    """Raw ticket fields; non-JSON files become the body."""
+    with current_tracer().span("parse"):
+        return parse_ticket_text(path.read_text(encoding="utf-8"))
+
+def ticket_id_for(data: dict, path: Path) -> str:
+    return str(data.get("id", path.stem)).upper()
+
+def ticket_from_data(data: dict, path: Path, features: Optional[TicketFeatures] = None) -> Ticket:
+    """`features`, when given, are the body's (see core.features.featurize)."""
+    with current_tracer().span("election"):
+        bias, strength = elect_bias(scan(features if features is not None else data.get("body", "")))
 
     return Ticket(
-        ticket_id=t_id,
+        ticket_id=ticket_id_for(data, path),
         title=data.get("title", "Untitled Ticket"),
         body=data.get("body", ""),
         bias_type=bias,
-        signal_strength=round(strength, 2)
+        signal_strength=strength
     )
 
+def load_ticket(path: Path) -> Ticket:
+    return ticket_from_data(read_ticket_data(path), path)
+
 def build_plan(ticket: Ticket) -> Plan:
     return Plan(steps=[Step(id=1, description="Standard execution pathway")])
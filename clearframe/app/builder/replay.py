@@ -1,25 +1,133 @@
-import json
+from itertools import islice
 from pathlib import Path
+from .artifacts import FORMATS, artifact_files, artifact_path, decode, read_artifact
+from .bundle import BUNDLE_NAME, BundleReader
+from .run_index import latest_run as _latest_indexed_run
 
-def show_last_run(runs_dir: Path):
-    folders = sorted([d for d in runs_dir.iterdir() if d.is_dir()])
-    if not folders:
+def _latest_run_dir(runs_dir: Path):
+    entry = _latest_indexed_run(runs_dir)
+    if entry is not None:
+        path = Path(entry["path"])
+        if not path.exists():
+            path = runs_dir / entry["run_id"]
+        if path.exists():
+            return path
+
+    # Runs recorded before the index existed
+    folders = sorted([d for d in runs_dir.iterdir() if d.is_dir()]) if runs_dir.exists() else []
+    return folders[-1] if folders else None
+
+def load_run_artifact(run_dir: Path, ticket_id=None):
+    """
+    One artifact of a run: `ticket_id`'s, or the first one.
+    Bundled runs are read with a single seek; returns None if absent.
+    """
+    bundle_path = run_dir / BUNDLE_NAME
+    if bundle_path.exists():
+        with BundleReader(bundle_path) as bundle:
+            if ticket_id is None:
+                keys = bundle.keys()
+                ticket_id = keys[0] if keys else None
+            if ticket_id is None or ticket_id not in bundle:
+                return None
+            return bundle.get(ticket_id)
+
+    if ticket_id is not None:
+        for fmt in FORMATS:
+            path = artifact_path(run_dir, ticket_id, fmt)
+            if path.exists():
+                return read_artifact(path)
+        return None
+
+    exec_files = artifact_files(run_dir)
+    return read_artifact(exec_files[0]) if exec_files else None
+
+def _raw_artifacts(run_dir: Path):
+    """(raw bytes, is_msgpack) per artifact in run order, one at a time."""
+    bundle_path = run_dir / BUNDLE_NAME
+    if bundle_path.exists():
+        with BundleReader(bundle_path) as bundle:
+            for key in bundle.keys():
+                yield bundle.raw(key), bundle.format(key) == "msgpack"
+        return
+
+    for path in artifact_files(run_dir):
+        yield path.read_bytes(), path.name.endswith(".msgpack")
+
+def _status_matches(want: str, status) -> bool:
+    # "failed" matches DRY_RUN_FAILED; full names match exactly
+    want, status = want.upper(), (status or "").upper()
+    return status == want or want in status.split("_")
+
+def _bias_of(data) -> str:
+    analysis = data.get("analysis") or {}
+    ticket = data.get("ticket") or {}
+    return analysis.get("bias_context") or ticket.get("bias_type") or ""
+
+def iter_run(run_dir: Path, ticket_id=None, status=None, bias=None):
+    """
+    Lazily yields the run's artifacts that pass every given filter.
+    Only one artifact is decoded at a time, whatever the run size.
+    """
+    if ticket_id is not None:
+        # stored ids are upper case (see planner.ticket_id_for)
+        data = load_run_artifact(run_dir, str(ticket_id).upper())
+        candidates = [data] if data is not None else []
+    else:
+        candidates = _candidates(run_dir, bias)
+
+    for data in candidates:
+        if status is not None and not _status_matches(status, data.get("status")):
+            continue
+        if bias is not None and _bias_of(data).upper() != bias.upper():
+            continue
+        yield data
+
+def _candidates(run_dir: Path, bias=None):
+    # A bias name that is not in the raw bytes cannot match: skip decoding
+    needle = bias.upper().encode("utf-8") if bias else None
+    for raw, is_msgpack in _raw_artifacts(run_dir):
+        if needle is not None and needle not in raw:
+            continue
+        yield decode(raw, msgpack=is_msgpack)
+
+def show_last_run(runs_dir: Path, ticket_id=None, status=None, bias=None, page=1, page_size=1):
+    """
+    Replays the latest run: `page_size` matching artifacts from `page`
+    (1-based). The defaults show the run's first artifact.
+    """
+    latest_run = _latest_run_dir(runs_dir)
+    if latest_run is None:
         print("No runs found.")
         return
 
-    latest_run = folders[-1]
-    exec_files = list(latest_run.glob("*.execution.json"))
-    if not exec_files:
+    start = (max(page, 1) - 1) * page_size
+    matches = iter_run(latest_run, ticket_id, status, bias)
+    shown = list(islice(matches, start, start + page_size))
+    if not shown:
         print(f"No execution artifact in {latest_run.name}")
         return
 
-    data = json.loads(exec_files[0].read_text(encoding="utf-8"))
+    for data in shown:
+        _show(data)
+
+    if next(matches, None) is not None:
+        print(f"More artifacts in {latest_run.name}: --page {max(page, 1) + 1}")
+    matches.close()
 
+def _show(data):
     print("\n" + "═"*40)
     print(f" 📺 REPLAYING RUN: {data.get('ticket_id')}")
     print(f" Status: {data.get('status')}")
     print("─"*40)
 
+    analysis = data.get("analysis")
+    if analysis:
+        print(f" 🧭 {analysis.get('intervention_type')} · {analysis.get('bias_context')}")
+        if analysis.get("counterfactual"):
+            print(f"\n   🧠 BRAIN OUTPUT:\n   {analysis['counterfactual']}\n")
+        print("─"*40)
+
     for step in data.get("steps", []):
         status_icon = "✅" if step.get("status") == "completed" else "❌"
         print(f" {status_icon} {step.get('description')}")
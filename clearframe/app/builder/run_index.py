@@ -1,48 +1,200 @@
 from __future__ import annotations
 
 import json
+import os
+from contextlib import contextmanager
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional
 
+try:
+    import fcntl
+except ImportError:  # Windows: O_APPEND single writes only
+    fcntl = None
 
-INDEX_NAME = "index.json"
+
+INDEX_NAME = "index.jsonl"
+LEGACY_INDEX_NAME = "index.json"
 
 
 def _index_path(runs_dir: Path) -> Path:
     return runs_dir / INDEX_NAME
 
 
+@contextmanager
+def _locked(runs_dir: Path):
+    """
+    Serializes appenders against compaction via a sidecar lock file,
+    so nobody appends to an index that is about to be replaced.
+    """
+    fd = os.open(runs_dir / (INDEX_NAME + ".lock"), os.O_WRONLY | os.O_CREAT, 0o644)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd)
+
+
+def _parse_lines(raw: bytes) -> List[Dict]:
+    entries = []
+    for line in raw.splitlines():
+        if not line.strip():
+            continue
+        try:
+            entries.append(json.loads(line))
+        except json.JSONDecodeError:
+            # torn trailing write from a crashed appender
+            continue
+    return entries
+
+
 def load_index(runs_dir: Path) -> List[Dict]:
     """
     Loads run index.
     Returns empty list if none exists.
     """
-    path = _index_path(runs_dir)
+    entries: List[Dict] = []
 
-    if not path.exists():
-        return []
+    legacy = runs_dir / LEGACY_INDEX_NAME
+    if legacy.exists():
+        entries.extend(json.loads(legacy.read_text(encoding="utf-8")))
+
+    path = _index_path(runs_dir)
+    if path.exists():
+        entries.extend(_parse_lines(path.read_bytes()))
 
-    return json.loads(path.read_text(encoding="utf-8"))
+    return entries
 
 
-def append_run(runs_dir: Path, run_dir: Path, processed: int) -> None:
+def append_run(
+    runs_dir: Path,
+    run_dir: Path,
+    processed: int,
+    failed: int = 0,
+    extra: Optional[Dict] = None,
+) -> None:
     """
-    Adds a run entry to index.json
+    Appends one run entry to index.jsonl.
+    O(1): a single fsync'd O_APPEND write, safe for concurrent writers,
+    so sharded workers each record their partial run here.
     """
 
     runs_dir.mkdir(parents=True, exist_ok=True)
 
-    index = load_index(runs_dir)
-
     entry = {
         "run_id": run_dir.name,
         "path": str(run_dir),
         "processed": processed,
+        "failed": failed,
+        "timestamp_utc": datetime.now(timezone.utc).isoformat(),
+        **(extra or {}),
     }
+    line = (json.dumps(entry, sort_keys=True) + "\n").encode("utf-8")
+
+    with _locked(runs_dir):
+        fd = os.open(_index_path(runs_dir), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+def _rewrite(runs_dir: Path, entries: List[Dict]) -> None:
+    """Atomically replaces the index with `entries` (caller holds the lock)."""
+    path = _index_path(runs_dir)
+    body = "".join(json.dumps(e, sort_keys=True) + "\n" for e in entries)
+
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(body)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+    legacy = runs_dir / LEGACY_INDEX_NAME
+    if legacy.exists():
+        legacy.unlink()
+
+
+def compact_index(runs_dir: Path) -> int:
+    """
+    Rewrites the index as one sorted entry per run_id (last write wins),
+    folding in a legacy index.json. Returns the number of entries kept.
+    """
+    runs_dir.mkdir(parents=True, exist_ok=True)
+
+    with _locked(runs_dir):
+        by_id: Dict[str, Dict] = {}
+        for entry in load_index(runs_dir):
+            by_id[entry["run_id"]] = entry
+
+        entries = [by_id[k] for k in sorted(by_id, key=_run_order)]
+        _rewrite(runs_dir, entries)
+
+    return len(entries)
+
+
+def prune_runs(runs_dir: Path, keep: int) -> List[str]:
+    """
+    Run retention: deletes all but the newest `keep` run directories
+    and their index entries. Returns the removed run ids, oldest first.
+    Their workspaces go too, which is what frees their blobs for
+    BlobStore.collect_garbage.
+    """
+    import shutil
+
+    if not runs_dir.exists():
+        return []
+    run_ids = sorted((p.name for p in runs_dir.iterdir() if p.is_dir()), key=_run_order)
+    doomed = run_ids[: max(0, len(run_ids) - keep)]
+    if not doomed:
+        return []
+
+    with _locked(runs_dir):
+        for run_id in doomed:
+            shutil.rmtree(runs_dir / run_id, ignore_errors=True)
+
+        gone = set(doomed)
+        _rewrite(runs_dir, [e for e in load_index(runs_dir) if e.get("run_id") not in gone])
+
+    return doomed
+
+
+# ---------------------------------------------------------
+# Queries
+# ---------------------------------------------------------
+def _run_order(run_id: str):
+    # run ids are creation timestamps; runs started in the same second
+    # carry a -2, -3, ... suffix (see loop.new_run_dir)
+    base, _, n = run_id.partition("-")
+    return base, int(n) if n.isdigit() else 1
+
+
+def latest_run(runs_dir: Path) -> Optional[Dict]:
+    """
+    Newest run by run id, not the last line appended: resuming an old
+    run records it again. A run recorded more than once counts with its
+    last record.
+    """
+    by_id: Dict[str, Dict] = {}
+    for entry in load_index(runs_dir):
+        by_id[entry["run_id"]] = entry
+    return by_id[max(by_id, key=_run_order)] if by_id else None
+
+
+def runs_between(runs_dir: Path, start: str, end: str) -> List[Dict]:
+    """
+    Runs whose run_id (YYYYMMDDTHHMMSSZ) falls in [start, end].
+    Bounds may be prefixes, e.g. "20260217" to "20260218".
+    """
+    upper = end + "\uffff"
+    return [
+        e for e in load_index(runs_dir)
+        if start <= e.get("run_id", "") <= upper
+    ]
 
-    index.append(entry)
 
-    _index_path(runs_dir).write_text(
-        json.dumps(index, indent=2),
-        encoding="utf-8",
-    )
+def runs_with_failures(runs_dir: Path) -> List[Dict]:
+    return [e for e in load_index(runs_dir) if e.get("failed", 0) > 0]
@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .artifacts import artifact_files
+from .dedupe import content_hash
+from .ticket_io import iter_jsonl
+
+
+# =========================================================
+# Ticket Outcome Audit Index
+# =========================================================
+#
+# One SQLite table records what the loop did with each ticket: id,
+# content hash, outcome, the run that last touched it and when. It is
+# an audit index, not ticket state: the filesystem stays the source of
+# truth (incoming/ is what is pending, the .done.json rename is what
+# takes a ticket out, and leases and resume are built on it), so the
+# index has no "pending" status. Runs write it only on request
+# (--record-state), since recording needs every ticket's content hash;
+# in exchange "what happened to T7?" and "which tickets were left
+# silent or failed?" are indexed lookups rather than a crawl through
+# run directories.
+#
+# A new index imports what the filesystem already says: every
+# incoming/*.done.json(l) is processed, and so is anything listed in
+# the legacy processed.json.
+
+STATE_DB_NAME = "state.sqlite"
+
+PROCESSED = "processed"
+# analyzed, nothing to say: the ticket stays in incoming/
+SILENT = "silent"
+FAILED = "failed"
+
+STATUSES = frozenset({PROCESSED, SILENT, FAILED})
+
+# (ticket_id, status, digest, run_id, source)
+Row = Tuple[str, str, Optional[str], Optional[str], Optional[str]]
+
+
+class TicketStore:
+    enabled = True
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+        fresh = not self.path.exists()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # several claiming workers may share one store
+        self._db = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS tickets ("
+            " ticket_id TEXT PRIMARY KEY,"
+            " hash TEXT,"
+            " status TEXT NOT NULL,"
+            " run_id TEXT,"
+            " source TEXT,"
+            " created REAL NOT NULL,"
+            " updated REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS tickets_status ON tickets(status, ticket_id)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS tickets_hash ON tickets(hash)")
+        # indexes written before silent tickets had a status of their own
+        self._db.execute("UPDATE tickets SET status = ? WHERE status = 'pending'", (SILENT,))
+        self._db.commit()
+
+        self.migrated = migrate(self, self.path.parent) if fresh else 0
+
+    def get(self, ticket_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            cur = self._db.execute("SELECT * FROM tickets WHERE ticket_id = ?", (ticket_id,))
+            row = cur.fetchone()
+            if row is None:
+                return None
+            return dict(zip([c[0] for c in cur.description], row))
+
+    def status(self, ticket_id: str) -> Optional[str]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT status FROM tickets WHERE ticket_id = ?", (ticket_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def is_processed(self, ticket_id: str) -> bool:
+        return self.status(ticket_id) == PROCESSED
+
+    def ids(self, status: str, limit: Optional[int] = None) -> List[str]:
+        """Ticket ids with `status`, in id order."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT ticket_id FROM tickets WHERE status = ? ORDER BY ticket_id LIMIT ?",
+                (status, -1 if limit is None else limit),
+            ).fetchall()
+        return [r[0] for r in rows]
+
+    def mark(
+        self,
+        ticket_id: str,
+        status: str,
+        digest: Optional[str] = None,
+        run_id: Optional[str] = None,
+        source: Optional[str] = None,
+    ) -> None:
+        self.mark_many([(ticket_id, status, digest, run_id, source)])
+
+    def mark_processed(self, ticket_id: str, digest: Optional[str] = None, run_id: Optional[str] = None) -> None:
+        self.mark(ticket_id, PROCESSED, digest, run_id)
+
+    def mark_many(self, rows: Iterable[Row]) -> int:
+        """
+        Upserts (ticket_id, status, digest, run_id, source) rows in one
+        transaction. None keeps a field's stored value.
+        """
+        rows = list(rows)
+        for row in rows:
+            if row[1] not in STATUSES:
+                raise ValueError(f"Invalid status: {row[1]}")
+
+        now = time.time()
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT INTO tickets (ticket_id, status, hash, run_id, source, created, updated)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT(ticket_id) DO UPDATE SET"
+                "  status = excluded.status,"
+                "  hash = COALESCE(excluded.hash, hash),"
+                "  run_id = COALESCE(excluded.run_id, run_id),"
+                "  source = COALESCE(excluded.source, source),"
+                "  updated = excluded.updated",
+                [(*row, now, now) for row in rows],
+            )
+        return len(rows)
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._db.execute("SELECT status, COUNT(*) FROM tickets GROUP BY status").fetchall()
+        return dict(rows)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+class NullStore(TicketStore):
+    enabled = False
+
+    def __init__(self):
+        self.migrated = 0
+
+    def get(self, ticket_id: str) -> Optional[Dict[str, Any]]:
+        return None
+
+    def status(self, ticket_id: str) -> Optional[str]:
+        return None
+
+    def ids(self, status: str, limit: Optional[int] = None) -> List[str]:
+        return []
+
+    def mark_many(self, rows: Iterable[Row]) -> int:
+        return 0
+
+    def counts(self) -> Dict[str, int]:
+        return {}
+
+    def close(self) -> None:
+        pass
+
+
+NULL_STORE = NullStore()
+
+
+# ---------------------------------------------------------
+# Migration
+# ---------------------------------------------------------
+def _artifact_runs(runs_dir: Path) -> Dict[str, str]:
+    """ticket id -> latest run with an artifact for it"""
+    runs: Dict[str, str] = {}
+    if runs_dir.exists():
+        for run_dir in sorted(p for p in runs_dir.iterdir() if p.is_dir()):
+            for artifact in artifact_files(run_dir):
+                runs[artifact.name.split(".execution.", 1)[0]] = run_dir.name
+    return runs
+
+
+def migrate(store: TicketStore, tickets_dir: Path) -> int:
+    """
+    Imports processed tickets from the filesystem into `store`:
+    incoming/*.done.json, records of incoming/*.done.jsonl(.gz) and the
+    ids in processed.json. Rows the store already has are kept.
+    Returns the number of tickets seen.
+    """
+    # planner pulls in the detector registry; only a migration needs it
+    from .planner import read_ticket_data, ticket_id_for
+
+    tickets_dir = Path(tickets_dir)
+    incoming = tickets_dir / "incoming"
+    runs = _artifact_runs(tickets_dir / "runs")
+    rows: List[Row] = []
+
+    def add(data: Dict[str, Any], ticket_id: str, source: Path) -> None:
+        rows.append((ticket_id, PROCESSED, content_hash(data), runs.get(ticket_id), source.name))
+
+    if incoming.exists():
+        for p in sorted(incoming.glob("*.done.json")):
+            try:
+                data = read_ticket_data(p)
+            except (OSError, UnicodeDecodeError):
+                continue
+            # ids as the loop assigns them, from the name before .done.json
+            add(data, ticket_id_for(data, p.with_name(p.name[: -len(".done.json")])), p)
+
+        for p in sorted(incoming.glob("*.done.jsonl*")):
+            base = p.name.split(".done.jsonl", 1)[0]
+            for n, (_, _, data) in enumerate(iter_jsonl(p), start=1):
+                add(data, str(data.get("id", f"{base}-{n}")).upper(), p)
+
+    legacy = tickets_dir / "processed.json"
+    if legacy.exists():
+        try:
+            entries = json.loads(legacy.read_text(encoding="utf-8"))
+        except json.JSONDecodeError:
+            entries = []
+        for entry in entries if isinstance(entries, list) else []:
+            ticket_id = entry.get("id") if isinstance(entry, dict) else entry
+            if ticket_id:
+                rows.append((str(ticket_id).upper(), PROCESSED, None, runs.get(str(ticket_id).upper()), legacy.name))
+
+    now = time.time()
+    with store._lock, store._db:
+        store._db.executemany(
+            "INSERT OR IGNORE INTO tickets (ticket_id, status, hash, run_id, source, created, updated)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(*row, now, now) for row in rows],
+        )
+    return len(rows)
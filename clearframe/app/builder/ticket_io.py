@@ -1,13 +1,17 @@
 from __future__ import annotations
 
+import gzip
 import json
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, Tuple
 
 
 VALID_STATUSES = {"pending", "processed", "failed"}
 
+# one ticket per line, optionally gzip'd
+BATCH_SUFFIXES = (".jsonl", ".jsonl.gz")
+
 
 @dataclass(frozen=True)
 class Ticket:
@@ -27,18 +31,75 @@ def list_ticket_files(inbox_dir: Path) -> List[Path]:
 
     files = [
         p for p in inbox_dir.iterdir()
-        if p.is_file() and p.suffix.lower() == ".json"
+        if p.is_file() and (p.suffix.lower() == ".json" or p.name.lower().endswith(BATCH_SUFFIXES))
     ]
 
     return sorted(files, key=lambda p: p.name.lower())
 
 
+# ---------------------------------------------------------
+# Parse
+# ---------------------------------------------------------
+def parse_ticket_text(raw_text: str) -> Dict[str, Any]:
+    """Ticket fields from one JSON document; anything else becomes the body."""
+    raw_text = raw_text.strip()
+    try:
+        data = json.loads(raw_text)
+        if not isinstance(data, dict):
+            data = {"body": str(data)}
+    except json.JSONDecodeError:
+        data = {"body": raw_text}
+    return data
+
+
+def batch_stem(path: Path) -> str:
+    """'export.jsonl.gz' -> 'export'"""
+    name = path.name
+    for suffix in sorted(BATCH_SUFFIXES, key=len, reverse=True):
+        if name.lower().endswith(suffix):
+            return name[: -len(suffix)]
+    return path.stem
+
+
+def iter_jsonl(path: Path, offset: int = 0) -> Iterator[Tuple[int, int, Dict[str, Any]]]:
+    """
+    Streams a batch file one record at a time as (start, end, fields).
+    Offsets index the decompressed bytes; a record's span starts where
+    the previous one ended, so blank lines in between belong to it.
+    Each line is parsed on its own, so one bad line never hides the rest.
+    """
+    opener = gzip.open if path.name.endswith(".gz") else open
+    with opener(path, "rb") as f:
+        if offset:
+            f.seek(offset)
+        start = pos = offset
+        for line in f:
+            pos += len(line)
+            if not line.strip():
+                continue
+            yield start, pos, parse_ticket_text(line.decode("utf-8", errors="replace"))
+            start = pos
+
+
 # ---------------------------------------------------------
 # Load Ticket
 # ---------------------------------------------------------
 def load_ticket(path: Path) -> Ticket:
     data: Dict[str, Any] = json.loads(path.read_text(encoding="utf-8"))
+    return _validated(data, path)
+
+
+def load_tickets(path: Path) -> Iterator[Ticket]:
+    """Tickets of a .json file, or streamed from a .jsonl(.gz) batch file."""
+    if not path.name.lower().endswith(BATCH_SUFFIXES):
+        yield load_ticket(path)
+        return
+    for n, (_, _, data) in enumerate(iter_jsonl(path), start=1):
+        data.setdefault("id", f"{batch_stem(path)}-{n}")
+        yield _validated(data, path)
+
 
+def _validated(data: Dict[str, Any], path: Path) -> Ticket:
     ticket_id = str(data.get("id", path.stem)).strip()
     title = str(data.get("title", "")).strip()
     body = str(data.get("body", "")).strip()
@@ -63,19 +124,3 @@ def load_ticket(path: Path) -> Ticket:
         status=status,
         source_path=str(path)
     )
-
-
-# ---------------------------------------------------------
-# Update Ticket Status
-# ---------------------------------------------------------
-def update_ticket_status(path: Path, new_status: str) -> None:
-    if new_status not in VALID_STATUSES:
-        raise ValueError(f"Invalid status: {new_status}")
-
-    data = json.loads(path.read_text(encoding="utf-8"))
-    data["status"] = new_status
-
-    path.write_text(
-        json.dumps(data, indent=2, sort_keys=True),
-        encoding="utf-8"
-    )
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from ..core.engine import ClearframeEngine
+from ..core.tracing import NULL_TRACER, Tracer
+from .artifacts import write_run_meta
+from .dedupe import CONTENT_INDEX_NAME, ContentIndex
+from .journal import JOURNAL_NAME, Journal
+from .lease import in_shard
+from .loop import build_llm, finish_run, llm_counters, new_run_dir, open_state, pending_tickets, process_batch
+
+if TYPE_CHECKING:
+    from ..core.llm_resilience import ResiliencePolicy
+
+
+# ---------------------------------------------------------
+# Change Notification
+# ---------------------------------------------------------
+class _PollingWatcher:
+    """Fallback: wake up every `interval` seconds and re-list the folder."""
+
+    kind = "polling"
+
+    def __init__(self, interval: float):
+        self.interval = interval
+
+    def wait(self, timeout: float) -> None:
+        time.sleep(max(0.0, min(timeout, self.interval)))
+
+    def close(self) -> None:
+        pass
+
+
+class _InotifyWatcher:
+    """Blocks in the kernel until a file is written or moved into the folder."""
+
+    kind = "inotify"
+
+    def __init__(self, folder: Path):
+        # Lazy Import: optional dependency, polling is used without it
+        from inotify_simple import INotify, flags
+
+        self._inotify = INotify()
+        self._inotify.add_watch(str(folder), flags.CLOSE_WRITE | flags.MOVED_TO)
+
+    def wait(self, timeout: float) -> None:
+        self._inotify.read(timeout=int(max(0.0, timeout) * 1000))
+
+    def close(self) -> None:
+        self._inotify.close()
+
+
+def _make_watcher(folder: Path, poll_interval: float, use_inotify: bool = True):
+    if use_inotify:
+        try:
+            return _InotifyWatcher(folder)
+        except (ImportError, OSError):
+            pass
+    return _PollingWatcher(poll_interval)
+
+
+# ---------------------------------------------------------
+# Micro-Batching Watch Loop
+# ---------------------------------------------------------
+def watch_incoming(
+    repo_root=None,
+    workers: int = 1,
+    use_cache: bool = True,
+    window_seconds: float = 2.0,
+    max_batch: int = 100,
+    poll_interval: float = 1.0,
+    use_inotify: bool = True,
+    max_batches: Optional[int] = None,
+    idle_exit: Optional[float] = None,
+    trace: bool = False,
+    artifact_format: str = "json",
+    bundle: bool = False,
+    dedupe: bool = True,
+    shard: Optional[Tuple[int, int]] = None,
+    llm_batch: int = 1,
+    llm_batch_delay: float = 0.02,
+    resilience: Optional["ResiliencePolicy"] = None,
+    record_state: bool = False,
+):
+    """
+    Long-running ingestion: picks up tickets as they land in incoming/.
+
+    Tickets are grouped into one run directory per micro-batch, closed
+    after `window_seconds` from the first arrival or at `max_batch`
+    tickets. Batches run synchronously, so while the LLM is slow new
+    files simply wait on disk and at most `max_batch` are taken per run
+    (back-pressure). Files left in incoming/ (silent or failed tickets)
+    are not picked up again unless they change.
+
+    With `shard` (i, N) only this watcher's share of tickets is taken.
+    `llm_batch` > 1 groups the workers' reframe requests into shared calls;
+    a `resilience` policy guards every upstream call (see build_llm).
+    `record_state` writes every outcome to the ticket audit index.
+
+    Stops after `max_batches` runs, after `idle_exit` seconds with no
+    new tickets, or on Ctrl+C.
+    """
+    root = Path(repo_root) if repo_root else Path(".")
+    provider, llm, cache = build_llm(root, use_cache, llm_batch=llm_batch, llm_batch_delay=llm_batch_delay, resilience=resilience)
+    engine = ClearframeEngine(llm_client=llm)
+
+    incoming = root / "clearframe/tickets/incoming"
+    runs_dir = root / "clearframe/tickets/runs"
+    # loaded once; shared by every micro-batch of this session
+    content_index = ContentIndex(root / "clearframe/tickets" / CONTENT_INDEX_NAME) if dedupe else None
+    state = open_state(root, record_state)
+    incoming.mkdir(parents=True, exist_ok=True)
+
+    watcher = _make_watcher(incoming, poll_interval, use_inotify)
+    print(f"👀 Watching {incoming} [Provider: {provider.upper()}, {watcher.kind}]")
+
+    # files already handled this session -> mtime when handled
+    seen: Dict[Path, int] = {}
+    runs: List[Path] = []
+    processed = 0
+
+    def fresh() -> List[Tuple[Path, int]]:
+        out = []
+        listed = set()
+        for p in pending_tickets(incoming):
+            if not in_shard(p, shard):
+                continue
+            try:
+                mtime = p.stat().st_mtime_ns
+            except FileNotFoundError:
+                continue
+            listed.add(p)
+            if seen.get(p) != mtime:
+                out.append((p, mtime))
+        # forget files that were renamed away
+        for p in list(seen):
+            if p not in listed:
+                del seen[p]
+        return out
+
+    idle_since = time.monotonic()
+    try:
+        while max_batches is None or len(runs) < max_batches:
+            batch_files = fresh()
+
+            if not batch_files:
+                if idle_exit is not None and time.monotonic() - idle_since >= idle_exit:
+                    break
+                watcher.wait(poll_interval)
+                continue
+
+            # Window opens at first arrival; close early when the batch is full
+            deadline = time.monotonic() + window_seconds
+            while len(batch_files) < max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                watcher.wait(remaining)
+                batch_files = fresh()
+
+            batch_files = batch_files[:max_batch]
+            for p, mtime in batch_files:
+                seen[p] = mtime
+            batch_files = [p for p, _ in batch_files]
+
+            run_path = new_run_dir(runs_dir)
+            write_run_meta(
+                run_path, provider=provider, artifact_format=artifact_format, bundle=bundle,
+                **({"record_state": True} if record_state else {}),
+            )
+            tracer = Tracer() if trace else NULL_TRACER
+            # the cache and LLM wrappers count for the whole session
+            before = llm_counters(cache, llm)
+            batch = process_batch(
+                batch_files, engine, run_path, workers, tracer, artifact_format, bundle,
+                content_index, Journal(run_path / JOURNAL_NAME), state,
+            )
+            finish_run(
+                runs_dir, run_path, batch, cache, tracer,
+                {"shard": f"{shard[0]}/{shard[1]}"} if shard else None, llm, since=before,
+            )
+
+            print(f"📦 run={run_path.name} tickets={len(batch_files)} processed={batch.processed}")
+            runs.append(run_path)
+            processed += batch.processed
+            idle_since = time.monotonic()
+
+    except KeyboardInterrupt:
+        print("\nStopping watch.")
+    finally:
+        watcher.close()
+        state.close()
+        if cache is not None:
+            cache.close()
+
+    return SimpleNamespace(processed=processed, runs=runs)
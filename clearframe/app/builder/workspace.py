@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from pathlib import Path, PurePosixPath
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .blobs import BlobStore
+
+
+# =========================================================
+# Virtual Workspace
+# =========================================================
+#
+# Plan steps write into an in-memory tree instead of the run's
+# workspace/ folder. Paths are checked the way the filesystem would
+# check them (plus: nothing may escape the workspace), so a step fails
+# exactly where it would have failed on disk. The tree is written out
+# in one pass at the end of the plan, or never in --no-materialize
+# mode; either way the artifact carries its manifest (size and sha256
+# per file). Given a BlobStore, the written files are hardlinks to
+# shared content-addressed blobs (see blobs.py).
+#
+# A step may write through a StagedWrites instead: its writes are
+# checked against the tree at once but land only on `commit`, so the
+# executor can keep or drop each step's output whole.
+
+
+class WorkspaceError(OSError):
+    pass
+
+
+class VirtualWorkspace:
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        # path -> (content, sha256)
+        self._files: Dict[PurePosixPath, Tuple[bytes, str]] = {}
+        self._dirs = {PurePosixPath(".")}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def _validate(self, rel_path: str) -> PurePosixPath:
+        path = PurePosixPath(rel_path)
+        if not rel_path or path.is_absolute() or ".." in path.parts or path == PurePosixPath("."):
+            raise WorkspaceError(f"Path escapes the workspace: {rel_path!r}")
+        return path
+
+    def _check(self, path: PurePosixPath) -> None:
+        # caller holds the lock
+        for parent in path.parents:
+            if parent in self._files:
+                raise WorkspaceError(f"Not a directory: {parent}")
+        if path in self._dirs:
+            raise WorkspaceError(f"Is a directory: {path}")
+
+    def _put(self, path: PurePosixPath, data: bytes, digest: str) -> None:
+        with self._lock:
+            self._check(path)
+            self._dirs.update(path.parents)
+            self._files[path] = (data, digest)
+
+    def write_text(self, rel_path: str, content: str) -> int:
+        """Stores `content` at `rel_path`, creating parent folders like mkdir -p."""
+        path = self._validate(rel_path)
+        data = content.encode("utf-8")
+        self._put(path, data, hashlib.sha256(data).hexdigest())
+        return len(data)
+
+    def staged(self) -> StagedWrites:
+        return StagedWrites(self)
+
+    def read_text(self, rel_path: str) -> str:
+        with self._lock:
+            return self._files[self._validate(rel_path)][0].decode("utf-8")
+
+    def exists(self, rel_path: str) -> bool:
+        path = self._validate(rel_path)
+        with self._lock:
+            return path in self._files or path in self._dirs
+
+    def manifest(self) -> Dict[str, Dict[str, object]]:
+        """{relative path: {"size": bytes, "sha256": hex}} in path order"""
+        with self._lock:
+            files = sorted(self._files.items())
+        return {str(path): {"size": len(data), "sha256": digest} for path, (data, digest) in files}
+
+    def flush(self, root: Optional[Path] = None, store: Optional[BlobStore] = None) -> int:
+        """
+        Writes the tree under `root` (default: the workspace root):
+        each folder is created once, then every file, as a hardlink into
+        `store` when given. Returns the number of files.
+        """
+        root = Path(root) if root is not None else self.root
+        with self._lock:
+            dirs = sorted(self._dirs)
+            files = sorted(self._files.items())
+
+        root.mkdir(parents=True, exist_ok=True)
+        # parents sort before their children
+        for path in dirs[1:]:
+            (root / path).mkdir(exist_ok=True)
+        for path, (data, digest) in files:
+            target = root / path
+            if store is not None:
+                store.link(store.put(data, digest), target)
+            else:
+                # never write through an existing link into a shared blob
+                target.unlink(missing_ok=True)
+                target.write_bytes(data)
+        return len(files)
+
+
+class StagedWrites:
+    """
+    One step's writes to a workspace, held back until `commit`. Each
+    write is checked against the workspace as committed so far.
+    """
+
+    def __init__(self, workspace: VirtualWorkspace):
+        self.workspace = workspace
+        self._writes: Dict[PurePosixPath, Tuple[bytes, str]] = {}
+
+    def write_text(self, rel_path: str, content: str) -> int:
+        path = self.workspace._validate(rel_path)
+        with self.workspace._lock:
+            self.workspace._check(path)
+        data = content.encode("utf-8")
+        self._writes[path] = (data, hashlib.sha256(data).hexdigest())
+        return len(data)
+
+    def commit(self) -> int:
+        """Applies the writes in the order they were made; returns their count."""
+        for path, (data, digest) in self._writes.items():
+            self.workspace._put(path, data, digest)
+        return len(self._writes)
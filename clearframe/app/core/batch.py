@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Sequence, Tuple
+
+from .detector import AWARENESS, POSSIBLY_THRESHOLD, REGISTRY, YES_THRESHOLD
+from .schemas import Classification
+
+
+# =========================================================
+# Vectorized Batch Scoring
+# =========================================================
+#
+# Same results as the scalar detector/planner path, bit for bit:
+# weights are accumulated column by column in factor order (the
+# order Python's sum() uses), and rounded election strengths come
+# from a table built with Python's round(). Detectors are read from
+# the registry at call time, so registered biases are scored too.
+
+
+def _numpy():
+    # Lazy Import: NumPy is only needed for batch scoring
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("NumPy not found. Run 'pip install numpy'")
+    return numpy
+
+
+@dataclass(frozen=True)
+class BatchScores:
+    hits: Any               # (n, factors) bool, sunk-cost factors in declaration order
+    signal: Any             # (n,) float64, == sunk_cost_signal
+    classification: Any     # (n,) str, Classification values
+    signature_counts: Any   # (n, detectors) int, distinct keywords per bias, registry order
+    bias: Any               # (n,) str, elected bias or "UNKNOWN"
+    strength: Any           # (n,) float64, rounded election strength
+
+    def classifications(self) -> List[Classification]:
+        return [Classification(c) for c in self.classification]
+
+
+def _membership(np, matcher, groups: List[str]) -> Tuple[Dict[str, int], Any]:
+    """keyword -> row, and the (keywords, groups) matrix of how often each group declares it."""
+    column = {k: j for j, k in enumerate(matcher.keywords)}
+    membership = np.zeros((len(column), len(groups)), dtype=np.int64)
+    for g, name in enumerate(groups):
+        for keyword in matcher.groups[name]:
+            if keyword in column:
+                membership[column[keyword], g] += 1
+    return column, membership
+
+
+def score_batch(texts: Sequence[str]) -> BatchScores:
+    """
+    Scores a whole corpus in one call.
+    Each text is tokenized once to find which keywords fire; the
+    per-group counts are one sparse product of those (text, keyword)
+    hits with the keyword/group membership matrix, and everything after
+    is array math.
+    """
+    np = _numpy()
+    n = len(texts)
+
+    sunk_cost = REGISTRY.get("SUNK_COST")
+    categories = list(sunk_cost.factors)
+    detectors = REGISTRY.detectors
+    biases = [d.name for d in detectors]
+
+    matcher = REGISTRY.matcher
+    groups = categories + biases + [g for g in matcher.groups if g not in categories and g not in biases]
+    column = {g: i for i, g in enumerate(groups)}
+    keyword_column, membership = _membership(np, matcher, groups)
+
+    rows: List[int] = []
+    cols: List[int] = []
+    for row, text in enumerate(texts):
+        found = matcher.find(text)
+        rows.extend([row] * len(found))
+        cols.extend(keyword_column[k] for k in found)
+
+    counts = np.zeros((n, len(groups)), dtype=np.int64)
+    np.add.at(counts, np.array(rows, dtype=np.intp), membership[np.array(cols, dtype=np.intp)])
+
+    # ---------- sunk-cost signal ----------
+    hits = counts[:, : len(categories)] > 0
+
+    signal = np.zeros(n, dtype=np.float64)
+    for j, category in enumerate(categories):
+        signal = signal + np.where(hits[:, j], sunk_cost.weights.get(category, 0.0), 0.0)
+
+    for boost in sunk_cost.boosts:
+        boosted = np.all(hits[:, [categories.index(k) for k in boost.requires]], axis=1)
+        signal = np.where(boosted, np.maximum(signal, boost.floor), signal)
+    signal = np.minimum(signal, 1.0)
+
+    # ---------- classification ----------
+    def has(group):
+        return counts[:, column[group]] > 0
+
+    neutral = has(sunk_cost.neutralizer_group)
+    aware = np.ones(n, dtype=bool)
+    for group in AWARENESS:
+        aware &= has(group)
+
+    classification = np.select(
+        [neutral, aware, signal >= YES_THRESHOLD, signal >= POSSIBLY_THRESHOLD],
+        [Classification.NO.value, Classification.POSSIBLY.value,
+         Classification.YES.value, Classification.POSSIBLY.value],
+        default=Classification.NO.value,
+    )
+
+    # ---------- bias election ----------
+    lo = len(categories)
+    signature_counts = counts[:, lo : lo + len(biases)]
+    lengths = np.array([len(d.signature) for d in detectors], dtype=np.float64)
+
+    density = signature_counts / lengths
+    winner = np.argmax(density, axis=1)  # first max, like max(results, key=...)
+
+    longest = int(lengths.max())
+    rounded = np.array([
+        [round(k / len(d.signature), 2) for k in range(longest + 1)]
+        for d in detectors
+    ])
+    won = signature_counts[np.arange(n), winner]
+    strength = rounded[winner, won]
+
+    bias = np.where(won == 0, "UNKNOWN", np.array(biases)[winner])
+
+    return BatchScores(
+        hits=hits,
+        signal=signal,
+        classification=classification,
+        signature_counts=signature_counts,
+        bias=bias,
+        strength=strength,
+    )
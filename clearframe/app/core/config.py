@@ -1,7 +1,15 @@
-from pydantic import BaseModel
+# pydantic is optional: with it, EngineConfig validates its fields;
+# without it, the same fields live on a plain dataclass.
+from dataclasses import dataclass
 
+try:
+    from pydantic.dataclasses import dataclass as validated
+except ImportError:
+    validated = dataclass
 
-class EngineConfig(BaseModel):
+
+@validated
+class EngineConfig:
     confidence_threshold: float = 0.75
     ambiguity_threshold: float = 0.4
 
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
-from typing import List, Dict
+from typing import List, Dict, Tuple
+from .features import Text
+from .matcher import KeywordMatcher, ScanResult
+from .registry import Boost, Detector, DetectorRegistry
 from .schemas import Classification
 
 
@@ -31,93 +34,151 @@ HEURISTICS: Dict[str, List[str]] = {
     ]
 }
 
+NEUTRALIZERS: List[str] = [
+    "if i ignore",
+    "zero prior",
+    "without the time",
+    "regardless of"
+]
+
+# self-awareness layer: "am i ... because ... already"
+AWARENESS: Dict[str, List[str]] = {
+    "self_check": ["am i", "is my desire"],
+    "justification": ["because"],
+    "prior": ["already", "invested"]
+}
+
+# bias election signatures used by the builder planner
+BIAS_SIGNATURES: Dict[str, List[str]] = {
+    "SUNK_COST": ["spent", "invested", "wasted", "already", "months"],
+    "CONFIRMATION_BIAS": ["proves", "reddit", "everyone says", "already know", "tweets"],
+    "RECENCY_BIAS": ["latest", "just announced", "breaking news", "today", "saw a post"],
+    "AUTHORITY_BIAS": ["boss", "ceo", "vp", "director", "manager", "says so", "directive"]
+}
+
+# decision extraction: "user references past investment"
+PAST_INVESTMENT: List[str] = ["already", "spent", "invested", "put in", "years", "months"]
+
+
+SIGNAL_WEIGHTS: Dict[str, float] = {
+    "past": 0.30,
+    "time_effort": 0.20,
+    "obligation": 0.35,
+    "waste": 0.40
+}
+
+# waste + obligation together floor the signal here
+INTERACTION_FLOOR = 0.85
+
+YES_THRESHOLD = 0.85
+POSSIBLY_THRESHOLD = 0.50
+
+
+# =========================================================
+# Detector Registry (compiled once, on first scan)
+# =========================================================
+
+REGISTRY = DetectorRegistry()
+
+REGISTRY.register(Detector(
+    name="SUNK_COST",
+    signature=tuple(BIAS_SIGNATURES["SUNK_COST"]),
+    factors={k: tuple(v) for k, v in HEURISTICS.items()},
+    weights=SIGNAL_WEIGHTS,
+    boosts=(Boost(requires=("waste", "obligation"), floor=INTERACTION_FLOOR),),
+    neutralizers=tuple(NEUTRALIZERS),
+))
+for _name in ("CONFIRMATION_BIAS", "RECENCY_BIAS", "AUTHORITY_BIAS"):
+    REGISTRY.register(Detector(name=_name, signature=tuple(BIAS_SIGNATURES[_name])))
+
+REGISTRY.register_groups({**AWARENESS, "past_investment": PAST_INVESTMENT})
+
+# the built-in plan; detectors registered later recompile REGISTRY.matcher
+MATCHER: KeywordMatcher = REGISTRY.matcher
+
+
+def scan(text: Text) -> ScanResult:
+    """
+    Single pass over the text returning every category hit with offsets.
+    Pass a `TicketFeatures` to reuse a ticket's tokens (and its scan).
+    """
+    return REGISTRY.scan(text)
+
+
+# =========================================================
+# Bias Election
+# =========================================================
+
+def elect_bias(hits: ScanResult) -> Tuple[str, float]:
+    """
+    Strongest signature by keyword density; ties go to the first declared.
+    Returns ("UNKNOWN", 0.0) when nothing matched.
+    """
+    return REGISTRY.elect(hits)
+
 
 # =========================================================
 # Evidence Extraction
 # =========================================================
 
-def detect_evidence(text: str) -> List[str]:
+def detect_evidence(text: Text) -> List[str]:
     """
     Returns human-readable evidence explaining why a signal fired.
     Used for explain mode only.
     """
-    t = text.lower()
-    evidence: List[str] = []
+    return _evidence(scan(text))
 
-    for category, keywords in HEURISTICS.items():
-        for word in keywords:
-            if word in t:
-                evidence.append(f"{category}:{word}")
 
-    return evidence
+def _evidence(hits: ScanResult) -> List[str]:
+    return [
+        f"{category}:{word}"
+        for category in HEURISTICS
+        for word in hits.matched(category)
+    ]
 
 
 # =========================================================
 # Signal Strength (0.0 → 1.0)
 # =========================================================
 
-def sunk_cost_signal(text: str) -> float:
+def sunk_cost_signal(text: Text) -> float:
     """
     Conservative normalized signal in [0,1].
     Weighted factors with interaction boost.
     """
 
-    t = text.lower()
-
-    factors = {
-        key: any(k in t for k in words)
-        for key, words in HEURISTICS.items()
-    }
-
-    weights = {
-        "past": 0.30,
-        "time_effort": 0.20,
-        "obligation": 0.35,
-        "waste": 0.40
-    }
+    return _signal(scan(text))
 
-    score = sum(weights[k] for k, v in factors.items() if v)
 
-    # decisive interaction
-    if factors["waste"] and factors["obligation"]:
-        score = max(score, 0.85)
-
-    return min(score, 1.0)
+def _signal(hits: ScanResult) -> float:
+    # weighted factors; waste + obligation is the decisive interaction
+    return REGISTRY.signal("SUNK_COST", hits)
 
 
 # =========================================================
 # Deterministic Classification
 # =========================================================
 
-def heuristic_classification(text: str) -> Classification:
-    t = text.lower()
+def heuristic_classification(text: Text) -> Classification:
+    return _classify(scan(text))
 
-    # ---------- Layer 0: explicit neutralization ----------
-    neutralizers = [
-        "if i ignore",
-        "zero prior",
-        "without the time",
-        "regardless of"
-    ]
 
-    if any(n in t for n in neutralizers):
+def _classify(hits: ScanResult) -> Classification:
+    # ---------- Layer 0: explicit neutralization ----------
+    if REGISTRY.neutralized("SUNK_COST", hits):
         return Classification.NO
 
     # ---------- Layer 1: self-awareness ----------
-    if (
-        ("am i" in t or "is my desire" in t)
-        and "because" in t
-        and ("already" in t or "invested" in t)
-    ):
+    if all(hits.has(group) for group in AWARENESS):
         return Classification.POSSIBLY
 
     # ---------- Layer 2: signal thresholds ----------
-    s = sunk_cost_signal(text)
+    s = _signal(hits)
 
-    if s >= 0.85:
+    if s >= YES_THRESHOLD:
         return Classification.YES
 
-    if s >= 0.50:
+    if s >= POSSIBLY_THRESHOLD:
         return Classification.POSSIBLY
 
     return Classification.NO
@@ -127,7 +188,7 @@ def heuristic_classification(text: str) -> Classification:
 # Reasoning Generator (Explain Mode Only)
 # =========================================================
 
-def reasoning_string(text: str) -> str:
+def reasoning_string(text: Text) -> str:
     """
     Produces structured explanation text
     showing exactly what triggered detection.
@@ -1,5 +1,7 @@
 from typing import Optional
+from .llm import FALLBACK_COUNTERFACTUAL
 from .schemas import EngineOutput
+from .tracing import current_tracer
 
 class ClearframeEngine:
     SILENCE_THRESHOLD = 0.3
@@ -9,23 +11,44 @@ class ClearframeEngine:
         self.llm = llm_client
 
     def analyze(self, text: str, bias_type: str, strength: float) -> EngineOutput:
-        # 1. Deterministic Gate: Absolute Silence
-        if strength < self.SILENCE_THRESHOLD or bias_type == "UNKNOWN":
+        tracer = current_tracer()
+        with tracer.span("analyze"):
+            # 1. Deterministic Gate: Absolute Silence
+            i_type = self._intervention_type(bias_type, strength)
+            if i_type is None:
+                return EngineOutput(intervention_type="NO", bias_context=bias_type)
+
+            # 3. LLM Consult (The Reframe)
+            with tracer.span("llm"):
+                reframe_data = self.llm.generate_reframe({"bias_context": bias_type})
+
+            return self._disciplined(i_type, bias_type, reframe_data)
+
+    async def aanalyze(self, text: str, bias_type: str, strength: float) -> EngineOutput:
+        """Same contract as `analyze`, consulting the LLM through its async API."""
+        i_type = self._intervention_type(bias_type, strength)
+        if i_type is None:
             return EngineOutput(intervention_type="NO", bias_context=bias_type)
 
+        with current_tracer().span("llm"):
+            reframe_data = await self.llm.agenerate_reframe({"bias_context": bias_type})
+
+        return self._disciplined(i_type, bias_type, reframe_data)
+
+    def _intervention_type(self, bias_type: str, strength: float) -> Optional[str]:
+        if strength < self.SILENCE_THRESHOLD or bias_type == "UNKNOWN":
+            return None
+
         # 2. Strategic Intervention Logic
         if strength >= self.DETERMINISTIC_MAX:
-            i_type = "YES"
-        else:
-            i_type = "SOFT"
-
-        # 3. LLM Consult (The Reframe)
-        reframe_data = self.llm.generate_reframe({"bias_context": bias_type})
+            return "YES"
+        return "SOFT"
 
+    def _disciplined(self, i_type: str, bias_type: str, reframe_data: dict) -> EngineOutput:
         # 4. Discipline Enforcement
         question = reframe_data.get("counterfactual", "")
         if "should" in question.lower() or "recommend" in question.lower():
-            question = f"How would you view this {bias_type} if you started from scratch?"
+            question = FALLBACK_COUNTERFACTUAL.format(bias=bias_type)
 
         return EngineOutput(
             intervention_type=i_type,
@@ -1,24 +1,24 @@
+from .detector import scan
+from .features import Text, featurize
 from .schemas import DecisionExtract
-import re
 
-def extract_decision(text: str) -> DecisionExtract:
+def extract_decision(text: Text) -> DecisionExtract:
     """
     Minimal but real extraction:
     - Pull first decision-like sentence
     - Do not infer intent
     """
 
-    clean = " ".join(text.strip().split())
+    features = featurize(text)
+    clean = " ".join(features.text.strip().split())
 
-    # Sentence split (very conservative)
-    sentences = re.split(r"[.!?]", clean)
-    candidate = sentences[0].strip() if sentences else clean
+    # Sentence split (very conservative): the tokenizer's sentence ranges
+    candidate = features.sentence_text(0) if features.sentences else clean
 
     core = candidate if len(candidate) <= 140 else candidate[:137] + "..."
 
     past = []
-    lowered = clean.lower()
-    if any(k in lowered for k in ["already", "spent", "invested", "put in", "years", "months"]):
+    if scan(features).has("past_investment"):
         past.append("User references past investment.")
 
     return DecisionExtract(
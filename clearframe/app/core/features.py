@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from functools import cached_property, lru_cache
+from typing import Any, Dict, FrozenSet, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+
+# =========================================================
+# Tokenizer and Per-Ticket Features
+# =========================================================
+#
+# A ticket is tokenized once into a feature record: lowercased word
+# tokens (character spans on demand), an index from every distinct
+# token to its positions, negated positions and sentence ranges.
+# Keyword matching, bias election and decision extraction all read this
+# record, so a keyword only fires on whole words: "time" no longer
+# matches "sometimes", nor "vp" "mvp".
+
+# words (with inner apostrophes: "can't", "i've") or single punctuation marks
+_TOKEN = re.compile(r"\w+(?:'\w+)*|[^\w\s]")
+
+SENTENCE_END = frozenset({".", "!", "?"})
+
+# "months" / "wasted" / "working" / "today's" still match month / waste / work / today
+INFLECTIONS: Tuple[str, ...] = ("'s", "ing", "ed", "es", "s", "d")
+_MIN_BASE = 2
+
+NEGATIONS = frozenset({"not", "no", "never", "nor", "cannot", "without"})
+
+# a negation governs the next NEGATION_SCOPE tokens ("haven't spent",
+# "no time"), never past punctuation; kept tight so "can't stop wasting"
+# still counts as waste
+NEGATION_SCOPE = 1
+
+Span = Tuple[int, int]
+
+# over space-joined, space-padded tokens: a negation and the
+# NEGATION_SCOPE tokens after it (punctuation included, so a superset
+# of `negated`)
+_NEGATED = re.compile(
+    " (?:" + "|".join(map(re.escape, sorted(NEGATIONS))) + r"|\S*n't)"
+    r"(?=((?: \S+){1,%d}))" % NEGATION_SCOPE
+)
+
+
+def tokenize(text: str) -> List[Tuple[str, int, int]]:
+    """(token, start, end) triples; tokens are lowercased, spans index `text`."""
+    return [
+        (m.group().lower(), m.start(), m.end())
+        for m in _TOKEN.finditer(_normalize(text))
+    ]
+
+
+def _normalize(text: str) -> str:
+    # length-preserving, so token offsets stay valid for the original text
+    return text.replace("’", "'")
+
+
+@lru_cache(maxsize=4096)
+def inflections(word: str) -> Tuple[str, ...]:
+    """`word` and every inflected token that counts as an occurrence of it."""
+    if len(word) < _MIN_BASE:
+        return (word,)
+    return (word,) + tuple(word + suffix for suffix in INFLECTIONS)
+
+
+def is_negation(token: str) -> bool:
+    return token in NEGATIONS or token.endswith("n't")
+
+
+def negated_tokens(joined: str) -> FrozenSet[str]:
+    """Tokens that may sit in a negation's scope, from `f" {' '.join(tokens)} "`."""
+    return frozenset(t for m in _NEGATED.finditer(joined) for t in m.group(1).split())
+
+
+@dataclass(frozen=True)
+class TicketFeatures:
+    """
+    Everything the detectors need from one text, computed once.
+    Positions are token indices; spans index the original text.
+    """
+    text: str
+    tokens: Tuple[str, ...]
+    index: Mapping[str, Tuple[int, ...]]    # token -> positions
+    negated: FrozenSet[int]                 # positions inside a negation's scope
+    sentences: Tuple[Span, ...]             # [start, end) token ranges, terminators excluded
+
+    # matcher -> ScanResult, so every stage shares one keyword scan
+    _scans: Dict[Any, Any] = field(default_factory=dict, compare=False, repr=False)
+
+    @property
+    def token_set(self) -> FrozenSet[str]:
+        return frozenset(self.tokens)
+
+    @cached_property
+    def spans(self) -> Tuple[Span, ...]:
+        """Character span of every token; only hit offsets and sentences need them."""
+        return tuple(m.span() for m in _TOKEN.finditer(_normalize(self.text)))
+
+    def where(self, word: str) -> List[int]:
+        """Positions of `word` or any of its inflections."""
+        index = self.index
+        return [p for form in inflections(word) if form in index for p in index[form]]
+
+    def positions(self, words: Sequence[str]) -> Iterator[int]:
+        """Start positions where `words` occur as consecutive (possibly inflected) tokens."""
+        first = self.where(words[0])
+        if len(words) == 1:
+            yield from first
+            return
+
+        rest = [set(self.where(w)) for w in words[1:]]
+        for start in first:
+            if all(start + 1 + j in later for j, later in enumerate(rest)):
+                yield start
+
+    def span(self, start: int, length: int) -> Span:
+        """Character span of `length` tokens from position `start`."""
+        return self.spans[start][0], self.spans[start + length - 1][1]
+
+    def sentence_text(self, i: int) -> str:
+        """Sentence `i` of the original text, whitespace collapsed."""
+        start, end = self.sentences[i]
+        if start == end:
+            return ""
+        lo, hi = self.span(start, end - start)
+        return " ".join(self.text[lo:hi].split())
+
+
+# anything the detectors accept: raw text or its precomputed features
+Text = Union[str, TicketFeatures]
+
+
+def lower_tokens(text: str) -> Tuple[str, ...]:
+    """The lowercased tokens of `text`, without spans or index (see `featurize`)."""
+    lowered = _normalize(text).lower()
+    if len(lowered) != len(text):
+        # a few characters change length when lowercased; lower per token
+        return tuple(t for t, _, _ in tokenize(text))
+    return tuple(_TOKEN.findall(lowered))
+
+
+def featurize(text: Text, tokens: Optional[Tuple[str, ...]] = None) -> TicketFeatures:
+    """`text`'s features; pass `tokens` when its `lower_tokens` are at hand."""
+    if isinstance(text, TicketFeatures):
+        return text
+
+    if tokens is None:
+        tokens = lower_tokens(text)
+
+    index: Dict[str, List[int]] = {}
+    for pos, token in enumerate(tokens):
+        index.setdefault(token, []).append(pos)
+
+    # per distinct token, not per occurrence
+    negated = set()
+    for token, positions in index.items():
+        if is_negation(token):
+            for pos in positions:
+                for k in range(pos + 1, min(pos + 1 + NEGATION_SCOPE, len(tokens))):
+                    if not tokens[k][0].isalnum():
+                        break
+                    negated.add(k)
+
+    ends = sorted(p for mark in SENTENCE_END for p in index.get(mark, ()))
+    sentences: List[Span] = []
+    start = 0
+    for end in ends + [len(tokens)]:
+        if end > start:
+            sentences.append((start, end))
+        start = end + 1
+
+    return TicketFeatures(
+        text=text,
+        tokens=tokens,
+        index={k: tuple(v) for k, v in index.items()},
+        negated=frozenset(negated),
+        sentences=tuple(sentences),
+    )
@@ -1,36 +1,175 @@
 ﻿import os
 import json
+import threading
 import time
 
+# the deterministic counterfactual: asked instead of any reframe that gives
+# advice, and whenever a reframe cannot be had (see llm_resilience)
+FALLBACK_COUNTERFACTUAL = "How would you view this {bias} if you started from scratch?"
+
 class LLMClient:
+    # Upper bound on concurrent upstream calls made through the async API
+    max_concurrency: int = 8
+    # Provider/model identity, part of the reframe cache key
+    model_id: str = "unknown"
+
     def analyze_bias(self, text: str, bias_type: str) -> str:
         raise NotImplementedError
-        
+
     def generate_reframe(self, analysis: dict) -> dict:
         raise NotImplementedError
 
+    def complete(self, prompt: str) -> str:
+        """
+        Raw completion for a full prompt; lets `llm_batch.BatchingClient`
+        send several reframe requests in one call. Clients without it are
+        consulted one request at a time.
+        """
+        raise NotImplementedError
+
+    def run_stats(self) -> dict:
+        """Counters for the run log; wrapping clients add their own section."""
+        inner = getattr(self, "inner", None)
+        return inner.run_stats() if inner is not None else {}
+
+    def close(self) -> None:
+        """Releases worker threads at the end of a run; wrapping clients pass it on."""
+        inner = getattr(self, "inner", None)
+        if inner is not None:
+            inner.close()
+
+    # ---------- async API ----------
+    #
+    # Identical in-flight requests are coalesced onto one upstream call and
+    # distinct ones are bounded by `max_concurrency`. Subclasses override the
+    # underscored hooks; by default they run the sync call in a worker thread.
+    # asyncio is imported on first use so the sync CLI path never loads it.
+
+    async def aanalyze_bias(self, text: str, bias_type: str) -> str:
+        return await self._coalesce(
+            ("analyze_bias", text, bias_type),
+            lambda: self._aanalyze_bias(text, bias_type),
+        )
+
+    async def agenerate_reframe(self, analysis: dict) -> dict:
+        key = ("generate_reframe", json.dumps(analysis, sort_keys=True, default=str))
+        result = await self._coalesce(key, lambda: self._agenerate_reframe(analysis))
+        return dict(result)
+
+    async def _aanalyze_bias(self, text: str, bias_type: str) -> str:
+        import asyncio
+        return await asyncio.to_thread(self.analyze_bias, text, bias_type)
+
+    async def _agenerate_reframe(self, analysis: dict) -> dict:
+        import asyncio
+        return await asyncio.to_thread(self.generate_reframe, analysis)
+
+    def _async_state(self):
+        import asyncio
+        # Semaphores and futures belong to one event loop; rebuild per loop
+        loop = asyncio.get_running_loop()
+        state = getattr(self, "_astate", None)
+        if state is None or state[0] is not loop:
+            state = (loop, asyncio.Semaphore(self.max_concurrency), {})
+            self._astate = state
+        return state[1], state[2]
+
+    async def _coalesce(self, key, factory):
+        import asyncio
+        semaphore, inflight = self._async_state()
+
+        task = inflight.get(key)
+        if task is None:
+            async def call():
+                try:
+                    async with semaphore:
+                        return await factory()
+                finally:
+                    inflight.pop(key, None)
+
+            task = asyncio.ensure_future(call())
+            inflight[key] = task
+
+        # shield: one cancelled waiter must not cancel the shared call
+        return await asyncio.shield(task)
+
 class MockClient(LLMClient):
+    model_id = "mock"
+
+    def __init__(self, latency: float = 0.0, max_concurrency: int = LLMClient.max_concurrency):
+        # Simulated provider round-trip in seconds, for offline throughput tests
+        self.latency = latency
+        self.max_concurrency = max_concurrency
+        self.upstream_calls = 0
+        self._calls_lock = threading.Lock()
+
     def analyze_bias(self, text: str, bias_type: str) -> str:
-        return f"MOCK ANALYSIS: Strong signal for {bias_type} detected in text."
+        self._count()
+        if self.latency:
+            time.sleep(self.latency)
+        return self._analysis(bias_type)
 
     def generate_reframe(self, analysis: dict) -> dict:
+        self._count()
+        if self.latency:
+            time.sleep(self.latency)
+        return self._reframe()
+
+    def complete(self, prompt: str) -> str:
+        # Answers a batch prompt (see llm_batch.batch_prompt) item by item
+        self._count()
+        if self.latency:
+            time.sleep(self.latency)
+        items = json.loads(prompt.rsplit("Inputs:\n", 1)[1])
+        return json.dumps([{"id": item["id"], **self._reframe()} for item in items])
+
+    async def _aanalyze_bias(self, text: str, bias_type: str) -> str:
+        import asyncio
+        self._count()
+        await asyncio.sleep(self.latency)
+        return self._analysis(bias_type)
+
+    async def _agenerate_reframe(self, analysis: dict) -> dict:
+        import asyncio
+        self._count()
+        await asyncio.sleep(self.latency)
+        return self._reframe()
+
+    def _count(self) -> int:
+        # Pool workers and batch callers hit one client at once
+        with self._calls_lock:
+            self.upstream_calls += 1
+            return self.upstream_calls
+
+    def _analysis(self, bias_type: str) -> str:
+        return f"MOCK ANALYSIS: Strong signal for {bias_type} detected in text."
+
+    def _reframe(self) -> dict:
         return {
             "rationale": "MOCK: Logic appears circular.",
             "counterfactual": "How would you view this decision if you had zero prior investment?"
         }
 
 class GeminiClient(LLMClient):
-    def __init__(self, api_key: str):
+    model_id = "gemini"
+
+    def __init__(self, api_key: str, max_concurrency: int = LLMClient.max_concurrency, model: str = "gemini-2.0-flash"):
+        self.max_concurrency = max_concurrency
+        self.model = model
         # Lazy Import: Only fails if you actually try to use Gemini
         try:
             from google import genai
             self.client = genai.Client(api_key=api_key)
         except ImportError:
             raise ImportError("Gemini library not found. Run 'pip install google-genai'")
-            
+
     def analyze_bias(self, text: str, bias_type: str) -> str:
         # (This remains the same as before, simplified for the fix)
         return "GEMINI ANALYSIS PLACEHOLDER"
 
     def generate_reframe(self, analysis: dict) -> dict:
         return {"rationale": "Gemini Placeholder", "counterfactual": "Gemini Question?"}
+
+    def complete(self, prompt: str) -> str:
+        response = self.client.models.generate_content(model=self.model, contents=prompt)
+        return response.text or ""
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from .llm import LLMClient
+from .prompt import BATCH_PROMPT, FEWSHOT_PROMPT
+
+
+# =========================================================
+# Batched Reframe Consult
+# =========================================================
+#
+# Reframe payloads are tiny, so for a real provider the per-request
+# overhead dominates. Concurrent `generate_reframe` calls (one per pool
+# worker) are queued; the first caller waits until `max_batch` requests
+# are pending or `max_delay` seconds pass, then sends them all as one
+# multi-item prompt and hands each caller its own result. Anything the
+# batch call does not answer cleanly is retried as single calls, side by
+# side. Only clients that implement `complete` are worth wrapping.
+
+# FEWSHOT_PROMPT up to its single-input tail, shared by every batch
+_PREAMBLE = FEWSHOT_PROMPT.split("Now analyze the following input.")[0]
+
+
+def _key(analysis: Dict[str, Any]) -> str:
+    return json.dumps(analysis, sort_keys=True, default=str)
+
+
+def can_batch(client: LLMClient) -> bool:
+    """
+    Whether `client` answers `complete`: implemented by its own class or,
+    through wrappers that forward it (ResilientClient), by the client inside.
+    """
+    while type(client).complete is not LLMClient.complete:
+        inner = getattr(client, "inner", None)
+        if inner is None:
+            return True
+        client = inner
+    return False
+
+
+def batch_prompt(analyses: List[Dict[str, Any]]) -> str:
+    """One prompt for several reframe requests; input i has id i."""
+    items = json.dumps(
+        [{"id": i, **analysis} for i, analysis in enumerate(analyses)],
+        sort_keys=True,
+        default=str,
+    )
+    return _PREAMBLE + BATCH_PROMPT.format(count=len(analyses), items=items)
+
+
+def parse_batch_response(raw: str, count: int) -> List[Dict[str, Any]]:
+    """
+    Reframes in input order from a batch response.
+    Raises ValueError unless every id 0..count-1 is answered exactly once.
+    """
+    text = raw.strip()
+    if text.startswith("```"):
+        # fenced ```json ... ``` block
+        text = text.split("\n", 1)[-1].rsplit("```", 1)[0]
+
+    entries = json.loads(text)
+    if not isinstance(entries, list):
+        raise ValueError("Batch response is not a JSON array")
+
+    out: Dict[int, Dict[str, Any]] = {}
+    for entry in entries:
+        if not isinstance(entry, dict) or not isinstance(entry.get("counterfactual"), str):
+            raise ValueError(f"Malformed batch entry: {entry!r}")
+        i = entry.get("id")
+        if not isinstance(i, int) or not 0 <= i < count or i in out:
+            raise ValueError(f"Unexpected batch id: {i!r}")
+        out[i] = {"rationale": entry.get("rationale"), "counterfactual": entry["counterfactual"]}
+
+    if len(out) != count:
+        raise ValueError(f"Batch response answered {len(out)} of {count} inputs")
+    return [out[i] for i in range(count)]
+
+
+class _Pending:
+    __slots__ = ("analysis", "done", "result", "error")
+
+    def __init__(self, analysis: Dict[str, Any]):
+        self.analysis = analysis
+        self.done = threading.Event()
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[BaseException] = None
+
+
+class BatchingClient(LLMClient):
+    """
+    Wraps any LLMClient; concurrent reframe requests share one upstream
+    call. Identical requests in a batch are sent once. Sit it behind
+    CachedClient so cache hits never wait for a batch.
+    """
+
+    def __init__(self, inner: LLMClient, max_batch: int = 16, max_delay: float = 0.02):
+        self.inner = inner
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.max_concurrency = inner.max_concurrency
+        self.model_id = inner.model_id
+
+        self.batches = 0
+        self.batched = 0
+        self.fallbacks = 0
+
+        self._cond = threading.Condition()
+        self._queue: List[_Pending] = []
+
+    def analyze_bias(self, text: str, bias_type: str) -> str:
+        return self.inner.analyze_bias(text, bias_type)
+
+    def generate_reframe(self, analysis: dict) -> dict:
+        item = _Pending(analysis)
+
+        with self._cond:
+            self._queue.append(item)
+            # the first request into an empty queue collects and sends the batch
+            leader = len(self._queue) == 1
+            if not leader:
+                if len(self._queue) >= self.max_batch:
+                    self._cond.notify_all()
+            else:
+                deadline = time.monotonic() + self.max_delay
+                while len(self._queue) < self.max_batch:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                pending, self._queue = self._queue, []
+
+        if leader:
+            for start in range(0, len(pending), self.max_batch):
+                self._send(pending[start : start + self.max_batch])
+
+        item.done.wait()
+        if item.error is not None:
+            raise item.error
+        return dict(item.result)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"batches": self.batches, "batched": self.batched, "fallbacks": self.fallbacks}
+
+    def run_stats(self) -> Dict[str, Any]:
+        return {**super().run_stats(), "llm_batch": self.stats()}
+
+    # ---------- internals ----------
+
+    def _send(self, items: List[_Pending]) -> None:
+        groups: Dict[str, List[_Pending]] = {}
+        for item in items:
+            groups.setdefault(_key(item.analysis), []).append(item)
+        unique = [g[0].analysis for g in groups.values()]
+
+        try:
+            results: List[Any] = []
+            if len(unique) > 1:
+                try:
+                    results = parse_batch_response(self.inner.complete(batch_prompt(unique)), len(unique))
+                    self._count(batches=1, batched=len(unique))
+                except Exception:
+                    # no batch support, a failed call, or an answer we cannot
+                    # trust item by item: single calls report their own errors
+                    self._count(fallbacks=1)
+                    results = []
+
+            if not results:
+                results = self._singles(unique)
+
+            for group, result in zip(groups.values(), results):
+                for item in group:
+                    if isinstance(result, Exception):
+                        item.error = result
+                    else:
+                        item.result = result
+        except Exception as e:
+            # e.g. the provider is down: every caller in the batch sees it
+            for item in items:
+                item.error = e
+        finally:
+            for item in items:
+                item.done.set()
+
+    def _count(self, **deltas: int) -> None:
+        with self._cond:
+            for name, delta in deltas.items():
+                setattr(self, name, getattr(self, name) + delta)
+
+    def _singles(self, analyses: List[Dict[str, Any]]) -> List[Any]:
+        if len(analyses) == 1:
+            return [self._single(analyses[0])]
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        # one call per waiting caller, concurrently, as if never batched
+        with ThreadPoolExecutor(max_workers=len(analyses)) as pool:
+            return list(pool.map(self._single, analyses))
+
+    def _single(self, analysis: Dict[str, Any]) -> Any:
+        try:
+            return self.inner.generate_reframe(analysis)
+        except Exception as e:
+            # fails only the callers of this request
+            return e
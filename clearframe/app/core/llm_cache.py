@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .llm import LLMClient
+from .prompt import FEWSHOT_PROMPT
+
+
+# =========================================================
+# Persistent Reframe Cache
+# =========================================================
+
+PROMPT_VERSION = hashlib.sha256(FEWSHOT_PROMPT.encode("utf-8")).hexdigest()[:12]
+
+
+def cache_key(payload: Dict[str, Any], model_id: str, prompt: str = FEWSHOT_PROMPT) -> str:
+    """
+    Content address for one reframe request:
+    request payload + prompt template + provider/model id.
+    """
+    material = json.dumps(
+        {
+            "payload": payload,
+            "prompt": hashlib.sha256(prompt.encode("utf-8")).hexdigest(),
+            "model": model_id,
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class ReframeCache:
+    """
+    SQLite-backed key/value store with an in-memory LRU in front.
+
+    Entries expire `ttl_seconds` after they were written; once the table
+    holds more than `max_entries` rows, the least recently read entries
+    are evicted. Reads only note their time in memory; the times reach
+    the table with the next put (or close). The row count is kept
+    running, so a put does not count the table: expired rows are swept
+    (and the count re-read, other processes may share the file) every
+    `sweep_every` puts, or as soon as the count passes the cap.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        ttl_seconds: float = 7 * 24 * 3600,
+        max_entries: int = 10_000,
+        memory_entries: int = 256,
+        sweep_every: int = 256,
+    ):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+        self.sweep_every = sweep_every
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lru: "OrderedDict[str, tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # key -> last read, not yet written to the table
+        self._touched: Dict[str, float] = {}
+        self._puts = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS reframe_cache ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " created REAL NOT NULL,"
+            " accessed REAL NOT NULL)"
+        )
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(reframe_cache)")}
+        if "accessed" not in columns:
+            # caches written before reads were tracked
+            self._db.execute("ALTER TABLE reframe_cache ADD COLUMN accessed REAL NOT NULL DEFAULT 0")
+            self._db.execute("UPDATE reframe_cache SET accessed = created")
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS reframe_cache_created ON reframe_cache(created)"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS reframe_cache_accessed ON reframe_cache(accessed)"
+        )
+        self._db.commit()
+        (self._count,) = self._db.execute("SELECT COUNT(*) FROM reframe_cache").fetchone()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+
+        with self._lock:
+            entry = self._lru.get(key)
+            if entry is None:
+                row = self._db.execute(
+                    "SELECT created, value FROM reframe_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    entry = (row[0], json.loads(row[1]))
+
+            if entry is None or now - entry[0] > self.ttl_seconds:
+                if entry is not None:
+                    self._drop(key)
+                self.misses += 1
+                return None
+
+            self._remember(key, entry)
+            self._touched[key] = now
+            self.hits += 1
+            return dict(entry[1])
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        entry = (time.time(), dict(value))
+
+        with self._lock:
+            self._touched.pop(key, None)
+            self._write_touched()
+            replaced = self._db.execute(
+                "UPDATE reframe_cache SET value = ?, created = ?, accessed = ? WHERE key = ?",
+                (json.dumps(entry[1]), entry[0], entry[0], key),
+            ).rowcount
+            if not replaced:
+                self._db.execute(
+                    "INSERT INTO reframe_cache (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(entry[1]), entry[0], entry[0]),
+                )
+                self._count += 1
+
+            self._puts += 1
+            if self._count > self.max_entries or self._puts % self.sweep_every == 0:
+                self._evict()
+            self._db.commit()
+            self._remember(key, entry)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "prompt_version": PROMPT_VERSION,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._write_touched()
+            self._db.commit()
+            self._db.close()
+
+    # ---------- internals (caller holds the lock) ----------
+
+    def _remember(self, key: str, entry) -> None:
+        self._lru[key] = entry
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.memory_entries:
+            self._lru.popitem(last=False)
+
+    def _drop(self, key: str) -> None:
+        self._lru.pop(key, None)
+        self._touched.pop(key, None)
+        self._count -= self._db.execute("DELETE FROM reframe_cache WHERE key = ?", (key,)).rowcount
+        self._db.commit()
+        self.evictions += 1
+
+    def _write_touched(self) -> None:
+        if self._touched:
+            self._db.executemany(
+                "UPDATE reframe_cache SET accessed = ? WHERE key = ?",
+                [(t, k) for k, t in self._touched.items()],
+            )
+            self._touched.clear()
+
+    def _evict(self) -> None:
+        cutoff = time.time() - self.ttl_seconds
+        expired = self._db.execute(
+            "DELETE FROM reframe_cache WHERE created < ?", (cutoff,)
+        ).rowcount
+
+        # the only count of the table, once per sweep
+        (self._count,) = self._db.execute("SELECT COUNT(*) FROM reframe_cache").fetchone()
+        overflow = self._count - self.max_entries
+        if overflow > 0:
+            self._db.execute(
+                "DELETE FROM reframe_cache WHERE key IN ("
+                " SELECT key FROM reframe_cache ORDER BY accessed ASC LIMIT ?)",
+                (overflow,),
+            )
+            self._count -= overflow
+
+        dropped = expired + max(overflow, 0)
+        if dropped:
+            self._lru.clear()
+            self.evictions += dropped
+
+
+class CachedClient(LLMClient):
+    """
+    Wraps any LLMClient; reframe requests are answered from the cache
+    when an identical request was already paid for.
+    """
+
+    def __init__(self, inner: LLMClient, cache: ReframeCache):
+        self.inner = inner
+        self.cache = cache
+        self.max_concurrency = inner.max_concurrency
+        self.model_id = inner.model_id
+
+    def analyze_bias(self, text: str, bias_type: str) -> str:
+        return self.inner.analyze_bias(text, bias_type)
+
+    def generate_reframe(self, analysis: dict) -> dict:
+        key = cache_key(analysis, self.model_id)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        result = self.inner.generate_reframe(analysis)
+        self._remember(key, result)
+        return result
+
+    async def _aanalyze_bias(self, text: str, bias_type: str) -> str:
+        return await self.inner.aanalyze_bias(text, bias_type)
+
+    async def _agenerate_reframe(self, analysis: dict) -> dict:
+        key = cache_key(analysis, self.model_id)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        result = await self.inner.agenerate_reframe(analysis)
+        self._remember(key, result)
+        return result
+
+    def _remember(self, key: str, result: dict) -> None:
+        # degraded answers (see llm_resilience) must not outlive the outage
+        if not result.get("fallback"):
+            self.cache.put(key, result)
@@ -0,0 +1,323 @@
+from __future__ import annotations
+
+import queue
+import random
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Optional
+
+from .llm import FALLBACK_COUNTERFACTUAL, LLMClient
+
+
+# =========================================================
+# Resilient LLM Calls
+# =========================================================
+#
+# Every upstream call gets a timeout and jittered exponential retries.
+# Consecutive failures trip a circuit breaker; while it is open (and
+# whenever retries run out) reframes degrade to the deterministic
+# FALLBACK_COUNTERFACTUAL instead of failing the ticket. A token bucket
+# keeps the call rate under the provider's limit.
+#
+# Timed calls run on one bounded pool per client. A call that times out
+# keeps its slot until the provider returns; the slots bound how many
+# can hang at once, and a call that finds none free in time times out
+# too. The pool's workers are daemon threads and `close()` drops its
+# queue, so a call hung past its timeout never holds up exit.
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class CircuitOpenError(RuntimeError):
+    pass
+
+
+class CallTimeout(TimeoutError):
+    pass
+
+
+@dataclass(frozen=True)
+class ResiliencePolicy:
+    timeout: Optional[float] = 30.0       # seconds per upstream call; None waits forever
+    retries: int = 3                      # extra attempts after the first
+    backoff: float = 0.5                  # first retry delay; doubles per attempt
+    max_backoff: float = 8.0
+    failure_threshold: int = 5            # consecutive failed calls that open the breaker
+    reset_seconds: float = 60.0           # open -> half-open (one trial call)
+    rate: Optional[float] = None          # calls per second; None = unlimited
+    burst: int = 1
+    max_in_flight: int = 16               # timed upstream calls running at once
+
+
+def fallback_reframe(analysis: Dict[str, Any]) -> Dict[str, Any]:
+    """The deterministic counterfactual, marked so it is never cached."""
+    bias = analysis.get("bias_context", "decision")
+    return {
+        "rationale": None,
+        "counterfactual": FALLBACK_COUNTERFACTUAL.format(bias=bias),
+        "fallback": True,
+    }
+
+
+class CallPool:
+    """
+    Up to `size` daemon worker threads, started as calls arrive. Unlike
+    ThreadPoolExecutor's workers they are not joined at interpreter exit.
+    """
+
+    def __init__(self, size: int, name: str = "llm-call"):
+        self.size = size
+        self.name = name
+        self._queue = queue.SimpleQueue()
+        self._threads = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def submit(self, fn: Callable[[], Any]):
+        from concurrent.futures import Future
+
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("CallPool is closed")
+            self._queue.put((future, fn))
+            if len(self._threads) < self.size:
+                worker = threading.Thread(
+                    target=self._work, name=f"{self.name}_{len(self._threads)}", daemon=True
+                )
+                worker.start()
+                self._threads.append(worker)
+        return future
+
+    def _work(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            future, fn = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = fn()
+            except BaseException as exc:
+                future.set_exception(exc)
+            else:
+                future.set_result(result)
+
+    def shutdown(self) -> None:
+        """Cancels queued calls and stops idle workers; running calls are left behind."""
+        with self._lock:
+            self._closed = True
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not None:
+                    item[0].cancel()
+            for _ in self._threads:
+                self._queue.put(None)
+
+
+class TokenBucket:
+    """`rate` tokens per second, holding at most `burst`."""
+
+    def __init__(self, rate: float, burst: int = 1, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._tokens = float(burst)
+        self._stamp = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Takes a token; returns how long to wait before using it."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self.rate)
+            self._stamp = now
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self.rate)
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int, reset_seconds: float, clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        self.state = CLOSED
+        self.failures = 0
+        self.trips = 0
+        self._opened_at = 0.0
+        self._trial = False
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == OPEN and self._clock() - self._opened_at >= self.reset_seconds:
+                self.state, self._trial = HALF_OPEN, False
+            if self.state == HALF_OPEN:
+                # exactly one trial call at a time
+                if self._trial:
+                    return False
+                self._trial = True
+                return True
+            return self.state == CLOSED
+
+    def release(self) -> None:
+        """Ends a call that says nothing about the provider's health."""
+        with self._lock:
+            self._trial = False
+
+    def success(self) -> None:
+        with self._lock:
+            self.state, self.failures, self._trial = CLOSED, 0, False
+
+    def failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    self.trips += 1
+                self.state, self._opened_at, self._trial = OPEN, self._clock(), False
+
+
+class ResilientClient(LLMClient):
+    """
+    Wraps any LLMClient with the `ResiliencePolicy`. Reframes never
+    raise: they degrade to `fallback_reframe`. Other calls raise the
+    last error, or CircuitOpenError while the breaker is open.
+    """
+
+    def __init__(
+        self,
+        inner: LLMClient,
+        policy: ResiliencePolicy = ResiliencePolicy(),
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.inner = inner
+        self.policy = policy
+        self.max_concurrency = inner.max_concurrency
+        self.model_id = inner.model_id
+
+        self.breaker = CircuitBreaker(policy.failure_threshold, policy.reset_seconds, clock)
+        self.bucket = TokenBucket(policy.rate, policy.burst, clock) if policy.rate else None
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._pool = None
+
+        self.calls = 0
+        self.retries = 0
+        self.timeouts = 0
+        self.failures = 0
+        self.fallbacks = 0
+        self.throttled_s = 0.0
+
+    def analyze_bias(self, text: str, bias_type: str) -> str:
+        return self._call(lambda: self.inner.analyze_bias(text, bias_type))
+
+    def generate_reframe(self, analysis: dict) -> dict:
+        try:
+            return self._call(lambda: self.inner.generate_reframe(analysis))
+        except Exception:
+            self._count(fallbacks=1)
+            return fallback_reframe(analysis)
+
+    def complete(self, prompt: str) -> str:
+        return self._call(lambda: self.inner.complete(prompt))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = {
+                "calls": self.calls,
+                "retries": self.retries,
+                "timeouts": self.timeouts,
+                "failures": self.failures,
+                "fallbacks": self.fallbacks,
+                "throttled_s": round(self.throttled_s, 3),
+            }
+        return {
+            **counts,
+            "breaker": {"state": self.breaker.state, "trips": self.breaker.trips},
+            "policy": asdict(self.policy),
+        }
+
+    def run_stats(self) -> Dict[str, Any]:
+        return {**super().run_stats(), "llm_resilience": self.stats()}
+
+    def close(self) -> None:
+        """Stops the call pool; the next timed call starts a fresh one."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown()
+        super().close()
+
+    # ---------- internals ----------
+
+    def _count(self, **deltas: float) -> None:
+        with self._lock:
+            for name, delta in deltas.items():
+                setattr(self, name, getattr(self, name) + delta)
+
+    def _call(self, fn: Callable[[], Any]) -> Any:
+        policy = self.policy
+        for attempt in range(policy.retries + 1):
+            if not self.breaker.allow():
+                raise CircuitOpenError(f"{self.model_id}: circuit open after repeated failures")
+
+            if self.bucket is not None:
+                wait = self.bucket.reserve()
+                if wait:
+                    self._count(throttled_s=wait)
+                    self._sleep(wait)
+
+            self._count(calls=1)
+            try:
+                result = self._timed(fn, policy.timeout)
+            except NotImplementedError:
+                # a capability the client lacks, not a provider failure
+                self.breaker.release()
+                raise
+            except Exception as e:
+                self._count(failures=1, timeouts=int(isinstance(e, CallTimeout)))
+                self.breaker.failure()
+                if attempt == policy.retries:
+                    raise
+                self._count(retries=1)
+                # full jitter: uniform in [0, capped exponential delay]
+                self._sleep(random.uniform(0, min(policy.max_backoff, policy.backoff * 2 ** attempt)))
+            else:
+                self.breaker.success()
+                return result
+
+    def _timed(self, fn: Callable[[], Any], timeout: Optional[float]) -> Any:
+        if timeout is None:
+            return fn()
+
+        from concurrent.futures import TimeoutError as FutureTimeout
+
+        with self._lock:
+            if self._pool is None:
+                self._pool = CallPool(self.policy.max_in_flight)
+            pool = self._pool
+
+        started = threading.Event()
+
+        def run():
+            started.set()
+            return fn()
+
+        future = pool.submit(run)
+        # the timeout is the provider's time; waiting for a slot gets as long
+        if not started.wait(timeout) and future.cancel():
+            raise CallTimeout(f"No free LLM call slot within {timeout}s")
+        try:
+            return future.result(timeout)
+        except FutureTimeout:
+            raise CallTimeout(f"LLM call exceeded {timeout}s")
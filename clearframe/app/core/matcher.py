@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from functools import cached_property
+from operator import itemgetter
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Mapping, NamedTuple, Tuple
+
+from .features import Text, TicketFeatures, featurize, inflections, lower_tokens, negated_tokens, tokenize
+
+
+# =========================================================
+# Multi-Pattern Keyword Matcher
+# =========================================================
+
+class Hit(NamedTuple):
+    keyword: str
+    start: int
+    end: int
+
+
+_BY_POSITION = itemgetter(1, 2, 0)
+
+
+@dataclass(frozen=True)
+class ScanResult:
+    """
+    Every keyword found in one scan of a text.
+
+    Presence is computed eagerly; occurrence offsets (`hits`) only when
+    first asked for. Offsets index into the original text.
+    """
+    text: str
+    found: FrozenSet[str]
+    groups: Mapping[str, Tuple[str, ...]]
+    owners: Mapping[str, Tuple[str, ...]]
+    features: TicketFeatures
+    words: Mapping[str, Tuple[str, ...]]
+
+    def has(self, group: str) -> bool:
+        return any(k in self.found for k in self.groups.get(group, ()))
+
+    def matched(self, group: str) -> List[str]:
+        """Distinct keywords of a group that fired, in declaration order."""
+        return [k for k in self.groups.get(group, ()) if k in self.found]
+
+    def count(self, group: str) -> int:
+        """Number of distinct keywords of a group that fired."""
+        return len(self.matched(group))
+
+    def contains(self, keyword: str) -> bool:
+        return keyword.lower() in self.found
+
+    @cached_property
+    def hits(self) -> Dict[str, Tuple[Hit, ...]]:
+        """group -> every (possibly overlapping) occurrence, by position."""
+        out: Dict[str, List[Hit]] = {}
+        for keyword in self.found:
+            words = self.words[keyword]
+            for pos in _occurrences(self.features, words):
+                hit = Hit(keyword, *self.features.span(pos, len(words)))
+                for group in self.owners[keyword]:
+                    out.setdefault(group, []).append(hit)
+
+        return {g: tuple(sorted(h, key=_BY_POSITION)) for g, h in out.items()}
+
+
+def _occurrences(features: TicketFeatures, words: Tuple[str, ...]) -> Iterator[int]:
+    # an occurrence inside a negation's scope ("not spent") does not count
+    return (p for p in features.positions(words) if p not in features.negated)
+
+
+class KeywordMatcher:
+    """
+    Compiled matcher over a set of named keyword groups.
+
+    Keywords are tokenized like the text, so they match whole words
+    (or their inflections, see `features.INFLECTIONS`) and phrases
+    match consecutive tokens. `scan` tokenizes a text once (see
+    `features.featurize`) and intersects its distinct tokens with a
+    table keyed by every keyword's first token; only keywords whose
+    first token occurs are verified. The cost follows the text and its
+    matches, not the keyword count (see the matcher.scan case in
+    benchmarks/run.py). A scan of a `TicketFeatures` is cached on it,
+    so every stage reading the same ticket shares one result.
+    """
+
+    def __init__(self, groups: Mapping[str, Iterable[str]]):
+        self.groups: Dict[str, Tuple[str, ...]] = {
+            name: tuple(k.lower() for k in words)
+            for name, words in groups.items()
+        }
+
+        # keyword -> groups that declare it
+        owners: Dict[str, List[str]] = {}
+        for name, words in self.groups.items():
+            for word in words:
+                if word and name not in owners.setdefault(word, []):
+                    owners[word].append(name)
+
+        self._owners = {w: tuple(g) for w, g in owners.items()}
+        self._words = {w: tuple(t for t, _, _ in tokenize(w)) for w in self._owners}
+
+        # first token (and its inflections) -> keywords starting with it;
+        # a scan only verifies keywords whose first token is in the text
+        by_first: Dict[str, List[str]] = {}
+        for word, tokens in self._words.items():
+            for form in inflections(tokens[0]) if tokens else ():
+                by_first.setdefault(form, []).append(word)
+        self._by_first = {t: tuple(w) for t, w in by_first.items()}
+
+        # for `find`: first-token forms, and each phrase as one regex
+        # over the tokens joined (and padded) with spaces
+        self._first_forms = {w: frozenset(inflections(t[0])) for w, t in self._words.items() if t}
+        self._phrases = {
+            word: re.compile(
+                " " + " ".join("(?:" + "|".join(map(re.escape, inflections(t))) + ")" for t in tokens) + " "
+            )
+            for word, tokens in self._words.items()
+            if len(tokens) > 1
+        }
+
+    @property
+    def keywords(self) -> Tuple[str, ...]:
+        """Every distinct keyword, each once however many groups declare it."""
+        return tuple(self._owners)
+
+    def find(self, text: str) -> FrozenSet[str]:
+        """
+        The keywords `scan(text)` reports, for callers that need nothing
+        else (see `batch.score_batch`). No features are built unless a
+        candidate may start inside a negation's scope: single words fire
+        on their first token, phrases are checked by regex over the
+        joined tokens.
+        """
+        tokens = lower_tokens(text)
+        by_first = self._by_first
+        candidates = {k for t in by_first.keys() & set(tokens) for k in by_first[t]}
+        if not candidates:
+            return frozenset()
+
+        # literal spaces around every token: the regexes start with one
+        joined = f" {' '.join(tokens)} "
+        negated = negated_tokens(joined)
+        found = []
+        doubtful = []
+        for k in candidates:
+            if negated and not negated.isdisjoint(self._first_forms[k]):
+                doubtful.append(k)
+                continue
+            phrase = self._phrases.get(k)
+            if phrase is None or phrase.search(joined) is not None:
+                found.append(k)
+
+        if doubtful:
+            features = featurize(text, tokens)
+            found.extend(k for k in doubtful if self._fires(features, self._words[k]))
+        return frozenset(found)
+
+    def scan(self, text: Text) -> ScanResult:
+        features = featurize(text)
+        cached = features._scans.get(self)
+        if cached is not None:
+            return cached
+
+        by_first = self._by_first
+        # C-level intersection, iterating the smaller side: the text's
+        # distinct tokens once the keyword set outgrows them
+        candidates = {k for t in by_first.keys() & features.index.keys() for k in by_first[t]}
+
+        result = ScanResult(
+            text=features.text,
+            found=frozenset(k for k in candidates if self._fires(features, self._words[k])),
+            groups=self.groups,
+            owners=self._owners,
+            features=features,
+            words=self._words,
+        )
+        features._scans[self] = result
+        return result
+
+    @staticmethod
+    def _fires(features: TicketFeatures, words: Tuple[str, ...]) -> bool:
+        # candidates already have their first token in the text, so a
+        # single word only needs checking when something is negated
+        if len(words) == 1 and not features.negated:
+            return True
+        return next(_occurrences(features, words), None) is not None
@@ -52,3 +52,16 @@ Return JSON with keys:
 Input:
 {text}
 """
+
+# Several reframe requests in one call: FEWSHOT_PROMPT's instructions and
+# calibration examples, then this in place of its single-input tail.
+BATCH_PROMPT = """Now analyze each of the following {count} inputs independently.
+
+Return a JSON array with exactly one object per input, in any order, with keys:
+- id: the input's id
+- rationale: string (1–2 sentences)
+- counterfactual: string (a question, never advice)
+
+Inputs:
+{items}
+"""
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from .features import Text
+from .matcher import KeywordMatcher, ScanResult
+
+
+# =========================================================
+# Bias Detector Registry
+# =========================================================
+#
+# Each bias is declared as data: election keywords, weighted factor
+# keyword groups, interaction boosts and neutralizers. The registry
+# compiles every detector (and any shared keyword groups) into ONE
+# KeywordMatcher, so registering another bias adds keywords to the
+# shared scan, never another pass over the text.
+
+@dataclass(frozen=True)
+class Boost:
+    """When every factor in `requires` fires, the signal is at least `floor`."""
+    requires: Tuple[str, ...]
+    floor: float
+
+
+@dataclass(frozen=True)
+class Detector:
+    name: str
+    signature: Tuple[str, ...]
+    factors: Mapping[str, Tuple[str, ...]] = field(default_factory=dict)
+    weights: Mapping[str, float] = field(default_factory=dict)
+    boosts: Tuple[Boost, ...] = ()
+    neutralizers: Tuple[str, ...] = ()
+
+    @property
+    def neutralizer_group(self) -> str:
+        return f"{self.name}:neutralizer"
+
+    def groups(self) -> Dict[str, Tuple[str, ...]]:
+        out = {self.name: tuple(self.signature), **{k: tuple(v) for k, v in self.factors.items()}}
+        if self.neutralizers:
+            out[self.neutralizer_group] = tuple(self.neutralizers)
+        return out
+
+
+class DetectorRegistry:
+    def __init__(self):
+        self._detectors: Dict[str, Detector] = {}
+        self._shared: Dict[str, Tuple[str, ...]] = {}
+        self._matcher: Optional[KeywordMatcher] = None
+
+        # opt-in profiling (see `profiling`)
+        self.profiling = False
+        self._lock = threading.Lock()
+        self._hits: Dict[str, int] = {}
+        self._evaluations: Dict[str, int] = {}
+        self._ns: Dict[str, int] = {}
+
+    # ---------------------------------------------------------
+    # Registration
+    # ---------------------------------------------------------
+    def _claim_groups(self, names: Iterable[str]) -> None:
+        taken = set(self._shared)
+        for d in self._detectors.values():
+            taken.update(d.groups())
+        clash = taken.intersection(names)
+        if clash:
+            raise ValueError(f"Keyword group already registered: {sorted(clash)}")
+
+    def register(self, detector: Detector) -> Detector:
+        if detector.name in self._detectors:
+            raise ValueError(f"Detector already registered: {detector.name}")
+        unknown = set(detector.weights) - set(detector.factors)
+        if unknown:
+            raise ValueError(f"{detector.name}: weights for undeclared factors {sorted(unknown)}")
+
+        self._claim_groups(detector.groups())
+        self._detectors[detector.name] = detector
+        self._matcher = None
+        return detector
+
+    def register_groups(self, groups: Mapping[str, Iterable[str]]) -> None:
+        """Keyword groups scanned alongside the detectors (awareness, extraction)."""
+        self._claim_groups(groups)
+        self._shared.update({k: tuple(v) for k, v in groups.items()})
+        self._matcher = None
+
+    @property
+    def detectors(self) -> List[Detector]:
+        return list(self._detectors.values())
+
+    def get(self, name: str) -> Detector:
+        return self._detectors[name]
+
+    # ---------------------------------------------------------
+    # Compiled Plan
+    # ---------------------------------------------------------
+    @property
+    def matcher(self) -> KeywordMatcher:
+        """The shared scanning plan, recompiled only after a registration."""
+        if self._matcher is None:
+            groups: Dict[str, Tuple[str, ...]] = {}
+            for d in self._detectors.values():
+                groups.update(d.groups())
+            groups.update(self._shared)
+            self._matcher = KeywordMatcher(groups)
+        return self._matcher
+
+    def scan(self, text: Text) -> ScanResult:
+        if not self.profiling:
+            return self.matcher.scan(text)
+
+        start = time.perf_counter_ns()
+        hits = self.matcher.scan(text)
+        self._record("scan", start, True)
+        return hits
+
+    # ---------------------------------------------------------
+    # Evaluation
+    # ---------------------------------------------------------
+    def signal(self, name: str, hits: ScanResult) -> float:
+        """Weighted factor score in [0, 1] with interaction boosts."""
+        d = self._detectors[name]
+        start = time.perf_counter_ns() if self.profiling else 0
+
+        fired = {key: hits.has(key) for key in d.factors}
+        score = sum(d.weights.get(k, 0.0) for k, v in fired.items() if v)
+        for boost in d.boosts:
+            if all(fired[k] for k in boost.requires):
+                score = max(score, boost.floor)
+        score = min(score, 1.0)
+
+        if self.profiling:
+            self._record(name, start, score > 0)
+        return score
+
+    def neutralized(self, name: str, hits: ScanResult) -> bool:
+        d = self._detectors[name]
+        return bool(d.neutralizers) and hits.has(d.neutralizer_group)
+
+    def elect(self, hits: ScanResult) -> Tuple[str, float]:
+        """
+        Strongest signature by keyword density; ties go to the first registered.
+        Returns ("UNKNOWN", 0.0) when nothing matched.
+        """
+        best, best_strength = "UNKNOWN", 0.0
+        for d in self._detectors.values():
+            start = time.perf_counter_ns() if self.profiling else 0
+
+            strength = hits.count(d.name) / len(d.signature)
+            if strength > best_strength:
+                best, best_strength = d.name, strength
+
+            if self.profiling:
+                self._record(d.name, start, strength > 0)
+
+        return best, round(best_strength, 2)
+
+    # ---------------------------------------------------------
+    # Profiling
+    # ---------------------------------------------------------
+    def _record(self, key: str, start_ns: int, hit: bool) -> None:
+        elapsed = time.perf_counter_ns() - start_ns
+        with self._lock:
+            self._evaluations[key] = self._evaluations.get(key, 0) + 1
+            self._ns[key] = self._ns.get(key, 0) + elapsed
+            if hit:
+                self._hits[key] = self._hits.get(key, 0) + 1
+
+    @contextmanager
+    def profile(self) -> Iterator["DetectorRegistry"]:
+        """Collects fresh `stats()` for the duration of the block."""
+        previous = self.profiling
+        self.reset_stats()
+        self.profiling = True
+        try:
+            yield self
+        finally:
+            self.profiling = previous
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._hits.clear()
+            self._evaluations.clear()
+            self._ns.clear()
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Per detector (and the shared "scan"): evaluations, texts it fired
+        on, and total milliseconds, collected while `profiling` is on.
+        """
+        with self._lock:
+            return {
+                key: {
+                    "evaluations": n,
+                    "hits": self._hits.get(key, 0),
+                    "total_ms": round(self._ns[key] / 1e6, 3),
+                }
+                for key, n in self._evaluations.items()
+            }
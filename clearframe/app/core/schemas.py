@@ -1,5 +1,15 @@
 from dataclasses import dataclass, field
-from typing import Optional, Dict, Any
+from enum import Enum
+from typing import Optional, Dict, Any, List
+
+class Classification(str, Enum):
+    YES = "YES"
+    POSSIBLY = "POSSIBLY"
+    NO = "NO"
+
+class Intervention(str, Enum):
+    YES = "YES"
+    SOFT = "SOFT"
 
 @dataclass(frozen=True)
 class Ticket:
@@ -9,6 +19,12 @@ class Ticket:
     bias_type: str = "UNKNOWN"
     signal_strength: float = 0.0
 
+@dataclass(frozen=True)
+class DecisionExtract:
+    core_decision: str
+    past_investments: List[str] = field(default_factory=list)
+    proposed_next_action: Optional[str] = None
+
 @dataclass(frozen=True)
 class EngineOutput:
     intervention_type: str  # YES, SOFT, NO
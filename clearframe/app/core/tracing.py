@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+
+# =========================================================
+# Opt-In Stage Tracing
+# =========================================================
+#
+# Pipeline code calls `current_tracer().span("stage")`. With no tracer
+# installed that is a shared no-op context manager; with one installed
+# (see `use_tracer`) every span is timed on the monotonic clock and
+# tagged with the ticket being processed.
+
+@dataclass(frozen=True)
+class Span:
+    name: str
+    ticket: Optional[str]
+    start_ns: int
+    duration_ns: int
+    thread_id: int
+
+
+_TICKET: ContextVar[Optional[str]] = ContextVar("clearframe_trace_ticket", default=None)
+
+
+class Tracer:
+    enabled = True
+
+    def __init__(self):
+        self._spans: List[Span] = []
+        # ticket -> stage -> summed ns, kept as spans land
+        self._by_ticket: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            span = Span(
+                name=name,
+                ticket=_TICKET.get(),
+                start_ns=start,
+                duration_ns=time.perf_counter_ns() - start,
+                thread_id=threading.get_ident(),
+            )
+            with self._lock:
+                self._spans.append(span)
+                if span.ticket is not None:
+                    stages = self._by_ticket.setdefault(span.ticket, {})
+                    stages[name] = stages.get(name, 0) + span.duration_ns
+
+    @contextmanager
+    def ticket(self, key: str) -> Iterator[None]:
+        """Tags spans opened inside the block with `key`."""
+        token = _TICKET.set(key)
+        try:
+            yield
+        finally:
+            _TICKET.reset(token)
+
+    @property
+    def spans(self) -> List[Span]:
+        with self._lock:
+            return list(self._spans)
+
+    def durations(self, ticket: str) -> Dict[str, float]:
+        """Milliseconds per stage for one ticket, summed over repeats."""
+        with self._lock:
+            stages = dict(self._by_ticket.get(ticket, {}))
+        return {k: round(v / 1e6, 3) for k, v in stages.items()}
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Per-stage count and p50 / p95 / max in milliseconds."""
+        by_stage: Dict[str, List[float]] = {}
+        for s in self.spans:
+            by_stage.setdefault(s.name, []).append(s.duration_ns / 1e6)
+
+        return {
+            name: {
+                "count": len(values),
+                "p50_ms": round(_percentile(values, 0.50), 3),
+                "p95_ms": round(_percentile(values, 0.95), 3),
+                "max_ms": round(max(values), 3),
+            }
+            for name, values in by_stage.items()
+        }
+
+    def export_chrome_trace(self, path: Path) -> str:
+        """
+        Writes spans as Chrome trace-event JSON
+        (chrome://tracing, Perfetto, speedscope).
+        """
+        spans = self.spans
+        origin = min((s.start_ns for s in spans), default=0)
+        pid = os.getpid()
+
+        events = [
+            {
+                "name": s.name,
+                "cat": "clearframe",
+                "ph": "X",
+                "ts": (s.start_ns - origin) / 1e3,
+                "dur": s.duration_ns / 1e3,
+                "pid": pid,
+                "tid": s.thread_id,
+                "args": {"ticket": s.ticket},
+            }
+            for s in spans
+        ]
+
+        path = Path(path)
+        path.write_text(json.dumps({"traceEvents": events}), encoding="utf-8")
+        return str(path)
+
+
+class NullTracer(Tracer):
+    enabled = False
+
+    _NOOP = nullcontext()
+
+    def __init__(self):
+        pass
+
+    def span(self, name: str):
+        return self._NOOP
+
+    def ticket(self, key: str):
+        return self._NOOP
+
+    @property
+    def spans(self) -> List[Span]:
+        return []
+
+    def durations(self, ticket: str) -> Dict[str, float]:
+        return {}
+
+
+NULL_TRACER = NullTracer()
+
+_ACTIVE: ContextVar[Tracer] = ContextVar("clearframe_tracer", default=NULL_TRACER)
+
+
+def current_tracer() -> Tracer:
+    return _ACTIVE.get()
+
+
+@contextmanager
+def use_tracer(tracer: Tracer) -> Iterator[Tracer]:
+    """Installs `tracer` for the current thread / task."""
+    token = _ACTIVE.set(tracer)
+    try:
+        yield tracer
+    finally:
+        _ACTIVE.reset(token)
+
+
+def _percentile(values: List[float], q: float) -> float:
+    # nearest-rank
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q * len(ordered)))
+    return ordered[rank - 1]
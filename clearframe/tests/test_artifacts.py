@@ -0,0 +1,51 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from clearframe.app.builder.artifacts import (
+    RUN_META_NAME,
+    analysis_artifact,
+    read_artifact,
+    write_artifact,
+)
+from clearframe.app.builder.executor import execute_plan
+from clearframe.app.builder.planner import Step
+from clearframe.app.core.schemas import EngineOutput, Ticket
+
+
+TICKET = Ticket(ticket_id="T1", title="t", body="b", bias_type="SUNK_COST", signal_strength=0.6)
+OUTPUT = EngineOutput(intervention_type="SOFT", bias_context="SUNK_COST", counterfactual="Why?")
+
+
+def test_legacy_repr_artifact_is_upgraded(tmp_path: Path):
+    path = tmp_path / "T1.execution.json"
+    path.write_text(json.dumps({"ticket": str(TICKET), "analysis": str(OUTPUT)}), encoding="utf-8")
+
+    data = read_artifact(path)
+
+    assert data["version"] == 0
+    assert data["ticket"]["signal_strength"] == 0.6
+    assert data["analysis"]["counterfactual"] == "Why?"
+
+
+@pytest.mark.parametrize("fmt", ["json", "compact", "msgpack"])
+def test_formats_round_trip(tmp_path: Path, fmt):
+    if fmt == "msgpack":
+        pytest.importorskip("msgpack")
+
+    artifact = analysis_artifact(TICKET, OUTPUT)
+    path = write_artifact(tmp_path, artifact, fmt)
+
+    assert read_artifact(path) == artifact
+
+
+def test_run_constants_written_once_per_run(tmp_path: Path):
+    for t_id in ("T1", "T2"):
+        result = execute_plan(t_id, [Step(id=1, description="step1")], tmp_path)
+        meta = json.loads(Path(result.artifact_path).read_text())["meta"]
+        assert "python_version" not in meta
+
+    run_meta = json.loads((tmp_path / RUN_META_NAME).read_text())
+    assert run_meta["run_id"] == tmp_path.name
+    assert "python_version" in run_meta
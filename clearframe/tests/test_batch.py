@@ -0,0 +1,48 @@
+import random
+
+import pytest
+
+from clearframe.app.core.detector import (
+    MATCHER,
+    elect_bias,
+    heuristic_classification,
+    scan,
+    sunk_cost_signal,
+)
+
+np = pytest.importorskip("numpy")
+
+from clearframe.app.core.batch import score_batch  # noqa: E402
+
+
+def _corpus(n: int):
+    rng = random.Random(11)
+    vocab = [w for words in MATCHER.groups.values() for w in words]
+    vocab += ["we", "the", "network", "sometimes", "decision", ".", ",", "?"]
+    return [
+        " ".join(rng.choice(vocab) for _ in range(rng.randint(0, 25)))
+        for _ in range(n)
+    ]
+
+
+def test_batch_is_bit_identical_to_scalar_path():
+    texts = _corpus(500) + [
+        "I should keep going because I've already spent a year on this, "
+        "and quitting now would mean all that effort was wasted.",
+        "Am I continuing just because I've already invested time?",
+        "If I ignore the time I've already spent, does this still make sense?",
+        "",
+    ]
+
+    scores = score_batch(texts)
+
+    for i, text in enumerate(texts):
+        assert scores.signal[i] == sunk_cost_signal(text)
+        assert scores.classifications()[i] == heuristic_classification(text)
+        assert (scores.bias[i], scores.strength[i]) == elect_bias(scan(text))
+
+
+def test_empty_batch():
+    scores = score_batch([])
+    assert scores.signal.shape == (0,)
+    assert scores.classifications() == []
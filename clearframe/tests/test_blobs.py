@@ -0,0 +1,55 @@
+import json
+from pathlib import Path
+
+from clearframe.app.builder.blobs import BlobStore
+from clearframe.app.builder.executor import execute_plan
+from clearframe.app.builder.planner import Step
+from clearframe.app.builder.run_index import append_run, load_index, prune_runs
+
+
+STEPS = [
+    Step(id=1, description="create a.md"),
+    Step(id=2, description="create b.md"),
+    Step(id=3, description="write c.txt: same everywhere"),
+]
+
+
+def _run(runs: Path, run_id: str, blobs: BlobStore) -> Path:
+    run_dir = runs / run_id
+    execute_plan("T1", STEPS, run_dir, blobs=blobs)
+    append_run(runs, run_dir, processed=1)
+    return run_dir
+
+
+def test_identical_files_share_one_blob_across_runs(tmp_path: Path):
+    blobs = BlobStore(tmp_path / "blobs")
+    first = _run(tmp_path / "runs", "20260101T000000Z", blobs)
+    second = _run(tmp_path / "runs", "20260102T000000Z", blobs)
+
+    assert blobs.stats() == {"written": 2, "reused": 4, "copied": 0}
+    assert len(list(blobs.blobs())) == 2
+    # 2 runs x 2 creates + the blob itself
+    assert (second / "workspace" / "a.md").stat().st_nlink == 5
+
+    artifact = json.loads((first / "T1.execution.json").read_text())
+    digest = artifact["manifest"]["c.txt"]["sha256"]
+    assert blobs.path(digest).read_text() == "same everywhere"
+
+
+def test_gc_follows_run_retention(tmp_path: Path):
+    runs = tmp_path / "runs"
+    blobs = BlobStore(tmp_path / "blobs")
+    _run(runs, "20260101T000000Z", blobs)
+    _run(runs, "20260102T000000Z", blobs)
+
+    # every blob is still linked from a workspace
+    assert blobs.collect_garbage(min_age=0).removed == 0
+
+    assert prune_runs(runs, keep=1) == ["20260101T000000Z"]
+    assert [e["run_id"] for e in load_index(runs)] == ["20260102T000000Z"]
+    assert blobs.collect_garbage(min_age=0).removed == 0
+
+    prune_runs(runs, keep=0)
+    assert blobs.collect_garbage(min_age=3600).removed == 0
+    result = blobs.collect_garbage(min_age=0)
+    assert (result.removed, result.kept) == (2, 0)
@@ -0,0 +1,61 @@
+import gzip
+import json
+from pathlib import Path
+
+from clearframe.app.builder.bulk import BatchProgress
+from clearframe.app.builder.loop import run_local_loop
+from clearframe.app.builder.ticket_io import iter_jsonl
+
+
+def _incoming(tmp_path: Path) -> Path:
+    incoming = tmp_path / "clearframe" / "tickets" / "incoming"
+    incoming.mkdir(parents=True)
+    return incoming
+
+
+def _lines(n, start=0):
+    return [json.dumps({"id": f"T{i}", "body": f"The CEO and VP sent directive {i}."}) for i in range(start, start + n)]
+
+
+def test_jsonl_and_gzip_batches_stream_through_the_loop(tmp_path: Path):
+    incoming = _incoming(tmp_path)
+    (incoming / "export.jsonl").write_text("\n".join(_lines(3)) + "\n\nplain text ticket\n", encoding="utf-8")
+    with gzip.open(incoming / "more.jsonl.gz", "wt", encoding="utf-8") as f:
+        f.write("\n".join(_lines(2, start=3)))
+
+    result = run_local_loop(tmp_path, use_cache=False, workers=2)
+
+    # the plain-text line becomes a body with no bias in it: silent
+    assert result.processed == 5
+    assert sorted(p.name for p in incoming.iterdir()) == ["export.done.jsonl", "more.done.jsonl.gz"]
+
+
+def test_resume_starts_after_the_last_finished_record(tmp_path: Path):
+    incoming = _incoming(tmp_path)
+    batch = incoming / "export.jsonl"
+    batch.write_text("\n".join(_lines(5)) + "\n", encoding="utf-8")
+
+    # an earlier run finished the first two records before dying
+    _, end, _ = list(iter_jsonl(batch))[1]
+    (incoming / "export.jsonl.offset").write_text(json.dumps({"offset": end, "records": 2}))
+
+    assert [r.data["id"] for r in BatchProgress(batch).stream()] == ["T2", "T3", "T4"]
+
+    result = run_local_loop(tmp_path, use_cache=False)
+    assert result.processed == 3
+    assert sorted(p.name for p in incoming.iterdir()) == ["export.done.jsonl"]
+
+
+def test_watermark_only_covers_contiguous_finished_records(tmp_path: Path):
+    batch = tmp_path / "export.jsonl"
+    batch.write_text("\n".join(_lines(3)) + "\n", encoding="utf-8")
+
+    progress = BatchProgress(batch)
+    first, second, third = progress.stream()
+
+    second.done()
+    assert progress.offset == 0
+    first.done()
+    assert (progress.offset, progress.records) == (second.end, 2)
+    third.done()
+    assert json.loads(progress.sidecar.read_text()) == {"offset": third.end, "records": 3}
@@ -0,0 +1,98 @@
+import json
+from pathlib import Path
+
+from clearframe.app.builder.bundle import BUNDLE_NAME, BundleReader, BundleWriter
+from clearframe.app.builder.executor import execute_plan
+from clearframe.app.builder.loop import run_local_loop
+from clearframe.app.builder.planner import Step
+from clearframe.app.builder.replay import load_run_artifact
+
+
+def _artifact(t_id):
+    return {"ticket_id": t_id, "status": "DRY_RUN", "steps": [], "meta": {}}
+
+
+def test_random_access_after_close(tmp_path: Path):
+    path = tmp_path / BUNDLE_NAME
+    with BundleWriter(path) as bundle:
+        for i in range(50):
+            bundle.add({**_artifact(f"T{i}"), "n": i}, "compact")
+
+    with BundleReader(path) as reader:
+        assert reader.complete
+        assert len(reader) == 50
+        assert reader.keys()[:3] == ["T0", "T1", "T2"]
+        assert reader.get("T37")["n"] == 37
+
+
+def test_unclosed_bundle_is_recovered_and_appendable(tmp_path: Path):
+    path = tmp_path / BUNDLE_NAME
+    writer = BundleWriter(path)
+    writer.add(_artifact("A"))
+    writer.add(_artifact("B"))
+    writer._f.flush()
+
+    # torn tail from a crash mid-record
+    with open(path, "ab") as f:
+        f.write(b"\x05\x00\x00")
+
+    reader = BundleReader(path)
+    assert not reader.complete
+    assert reader.keys() == ["A", "B"]
+    reader.close()
+
+    with BundleWriter(path) as again:
+        again.add(_artifact("C"))
+
+    with BundleReader(path) as reader:
+        assert reader.complete
+        assert reader.keys() == ["A", "B", "C"]
+
+
+def test_execute_plan_streams_into_bundle(tmp_path: Path):
+    with BundleWriter(tmp_path / BUNDLE_NAME) as bundle:
+        for t_id in ("T1", "T2"):
+            result = execute_plan(t_id, [Step(id=1, description="step1")], tmp_path, bundle=bundle)
+            assert result.artifact_path.endswith(f"{BUNDLE_NAME}#{t_id}")
+
+    assert not list(tmp_path.glob("*.execution.json"))
+    assert load_run_artifact(tmp_path, "T2")["status"] == "DRY_RUN"
+
+
+def test_bundled_loop_run(tmp_path: Path):
+    incoming = tmp_path / "clearframe" / "tickets" / "incoming"
+    incoming.mkdir(parents=True)
+    for t_id in ("A1", "B2"):
+        (incoming / f"{t_id}.json").write_text(
+            json.dumps({"id": t_id, "title": t_id, "body": "We already spent months and invested so much."}),
+            encoding="utf-8",
+        )
+
+    result = run_local_loop(tmp_path, workers=2, use_cache=False, bundle=True)
+
+    run_dir = Path(result.run_dir)
+    assert result.processed == 2
+    assert not list(run_dir.glob("*.execution.json"))
+    assert load_run_artifact(run_dir, "B2")["analysis"]["bias_context"] == "SUNK_COST"
+
+
+def test_chunked_batch_files_share_one_writer(tmp_path: Path, monkeypatch):
+    incoming = tmp_path / "clearframe" / "tickets" / "incoming"
+    incoming.mkdir(parents=True)
+    lines = [json.dumps({"id": f"R{i}", "body": "We already spent months and invested so much."}) for i in range(40)]
+    (incoming / "export.jsonl").write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    opened = []
+    real_init = BundleWriter.__init__
+
+    def counting_init(self, path):
+        opened.append(path)
+        real_init(self, path)
+
+    monkeypatch.setattr(BundleWriter, "__init__", counting_init)
+    result = run_local_loop(tmp_path, use_cache=False, dedupe=False, bundle=True)
+
+    # 40 records in chunks of 16, one bundle (and one index write) for the run
+    assert len(opened) == 1
+    with BundleReader(Path(result.run_dir) / BUNDLE_NAME) as reader:
+        assert reader.complete and len(reader) == 40
@@ -0,0 +1,58 @@
+import json
+from pathlib import Path
+
+from clearframe.app.builder.artifacts import read_artifact
+from clearframe.app.builder.loop import run_local_loop
+from clearframe.app.core.llm import MockClient
+
+
+BODY = "We already spent months and invested so much."
+
+
+def _drop(incoming: Path, t_id: str, body: str):
+    incoming.mkdir(parents=True, exist_ok=True)
+    (incoming / f"{t_id}.json").write_text(
+        json.dumps({"id": t_id, "title": "retry", "body": body}), encoding="utf-8"
+    )
+
+
+def test_duplicates_skip_the_engine(tmp_path: Path, capsys):
+    incoming = tmp_path / "clearframe" / "tickets" / "incoming"
+    _drop(incoming, "A1", BODY)
+    _drop(incoming, "A2", "  We already spent months\n and invested so much. ")
+    _drop(incoming, "B1", "I saw a post on Reddit today, it proves everyone says so.")
+
+    llm = MockClient()
+    first = run_local_loop(tmp_path, workers=4, use_cache=False, llm=llm)
+
+    assert first.processed == 2
+    assert llm.upstream_calls == 2
+    assert "🔁 [DUP] A2 duplicates A1" in capsys.readouterr().out
+
+    dup = read_artifact(Path(first.run_dir) / "A2.execution.json")
+    assert dup["status"] == "DUPLICATE"
+    assert dup["duplicate_of"]["ticket_id"] == "A1"
+
+    log = json.loads((Path(first.run_dir) / "run_log.json").read_text())
+    assert log["stats"]["dedupe"] == {"lookups": 3, "hits": 1, "hit_rate": 0.3333}
+
+    # a retry in a later run points back at the first run's artifact
+    _drop(incoming, "A3", BODY)
+    second = run_local_loop(tmp_path, use_cache=False, llm=llm)
+
+    assert second.processed == 0
+    assert llm.upstream_calls == 2
+    dup = read_artifact(Path(second.run_dir) / "A3.execution.json")
+    assert dup["duplicate_of"]["run_id"] == Path(first.run_dir).name
+
+
+def test_dedupe_can_be_disabled(tmp_path: Path):
+    incoming = tmp_path / "clearframe" / "tickets" / "incoming"
+    _drop(incoming, "A1", BODY)
+    _drop(incoming, "A2", BODY)
+
+    llm = MockClient()
+    result = run_local_loop(tmp_path, use_cache=False, llm=llm, dedupe=False)
+
+    assert result.processed == 2
+    assert llm.upstream_calls == 2
@@ -1,5 +1,9 @@
+import json
 from pathlib import Path
-from clearframe.app.builder.executor import execute_plan
+
+import pytest
+
+from clearframe.app.builder.executor import execute_plan, plan_dependencies
 from clearframe.app.builder.planner import Step
 
 
@@ -22,3 +26,37 @@ def test_execute_plan_creates_artifact(tmp_path: Path):
     assert Path(result.artifact_path).exists()
     assert result.failed is False
 
+
+
+def test_steps_on_the_same_path_keep_their_order(tmp_path: Path):
+    steps = [Step(id=i, description=f"write notes/{i % 3}.md: v{i}") for i in range(1, 13)]
+
+    result = execute_plan("T2", steps, tmp_path / "runs", workers=4)
+
+    notes = tmp_path / "runs" / "workspace" / "notes"
+    assert [(notes / f"{k}.md").read_text() for k in range(3)] == ["v12", "v10", "v11"]
+
+    artifact = json.loads(Path(result.artifact_path).read_text())
+    assert set(artifact["meta"]["timings_ms"]) == {str(i) for i in range(1, 13)}
+
+
+def test_dependencies_are_validated(tmp_path: Path):
+    with pytest.raises(ValueError):
+        execute_plan("T3", [Step(id=1, description="a", depends_on=(2,))], tmp_path)
+
+    steps = [Step(id=1, description="a", depends_on=(2,)), Step(id=2, description="b", depends_on=(1,))]
+    assert plan_dependencies([{"id": 1}, {"id": 2, "depends_on": [1]}]) == [set(), {0}]
+    with pytest.raises(ValueError, match="cycle"):
+        execute_plan("T3", steps, tmp_path)
+
+
+def test_forward_dependencies_are_rejected(tmp_path: Path):
+    steps = [
+        Step(id=1, description="write a.txt: 1", depends_on=(2,)),
+        Step(id=2, description="write b.txt: 2"),
+    ]
+
+    for workers in (1, 4):
+        with pytest.raises(ValueError, match="later step"):
+            execute_plan("T4", steps, tmp_path, workers=workers)
+    assert not (tmp_path / "workspace").exists()
@@ -1,3 +1,4 @@
+import json
 from pathlib import Path
 from clearframe.app.builder.executor import execute_plan
 from clearframe.app.builder.planner import Step
@@ -34,3 +35,33 @@ def test_execute_plan_simulated_failure(tmp_path: Path):
     assert "DRY_RUN_FAILED" in text
     assert '"status": "failed"' in text
 
+
+
+def test_first_failure_wins_with_parallel_steps(tmp_path: Path):
+    steps = [
+        Step(id=1, description="write a.txt: 1"),
+        Step(id=2, description="write b.txt"),  # missing content
+        Step(id=3, description="write c.txt: 3"),
+        Step(id=4, description="write d.txt"),
+    ]
+
+    for _ in range(5):
+        result = execute_plan("T_PAR", steps, tmp_path / "runs", workers=4)
+        assert (result.step_count, result.failed) == (2, True)
+
+
+def test_steps_after_the_first_failure_leave_no_files(tmp_path: Path):
+    steps = [
+        Step(id=1, description="write a.txt: 1"),
+        Step(id=2, description="write b.txt"),  # missing content
+        Step(id=3, description="write c.txt: 3"),
+        Step(id=4, description="write d.txt: 4"),
+    ]
+
+    for n in range(5):
+        run_dir = tmp_path / f"run{n}"
+        result = execute_plan("T_PAR", steps, run_dir, workers=4)
+        artifact = json.loads(Path(result.artifact_path).read_text())
+
+        assert list(artifact["manifest"]) == ["a.txt"]
+        assert sorted(p.name for p in (run_dir / "workspace").iterdir()) == ["a.txt"]
@@ -0,0 +1,97 @@
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from clearframe.app.builder.lease import LeaseManager, in_shard, parse_shard, reap_expired
+from clearframe.app.builder.loop import run_local_loop
+from clearframe.app.builder.run_index import load_index
+
+
+def _seed(root: Path, n: int) -> Path:
+    incoming = root / "clearframe" / "tickets" / "incoming"
+    incoming.mkdir(parents=True)
+    for i in range(n):
+        (incoming / f"T{i:03d}.json").write_text(
+            json.dumps({"id": f"T{i:03d}", "title": "t", "body": f"We already spent {i} months and invested so much."})
+        )
+    return incoming
+
+
+def test_parse_shard():
+    assert parse_shard("2/4") == (2, 4)
+    for bad in ("0/4", "5/4", "x", "1/2/3"):
+        with pytest.raises(ValueError):
+            parse_shard(bad)
+
+
+def test_shards_partition_the_inbox(tmp_path: Path):
+    incoming = _seed(tmp_path, 40)
+    files = sorted(incoming.iterdir())
+
+    owners = [[i for i in range(1, 4) if in_shard(p, (i, 3))] for p in files]
+    assert all(len(o) == 1 for o in owners)
+
+    processed = sum(run_local_loop(tmp_path, use_cache=False, shard=(i, 3)).processed for i in range(1, 4))
+    assert processed == 40
+    assert sorted(e["shard"] for e in load_index(tmp_path / "clearframe" / "tickets" / "runs")) == ["1/3", "2/3", "3/3"]
+
+
+def test_concurrent_claimers_never_share_a_ticket(tmp_path: Path):
+    incoming = _seed(tmp_path, 60)
+    results = {}
+
+    def drain(worker):
+        results[worker] = run_local_loop(tmp_path, use_cache=False, dedupe=False, claim=True, worker_id=worker)
+
+    threads = [threading.Thread(target=drain, args=(w,)) for w in ("a", "b", "c")]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sum(r.processed for r in results.values()) == 60
+    assert len(list(incoming.glob("*.done.json"))) == 60
+    assert not list((tmp_path / "clearframe" / "tickets" / "claimed").rglob("*.json"))
+
+
+def test_expired_leases_are_reclaimed(tmp_path: Path):
+    incoming = _seed(tmp_path, 3)
+    tickets = tmp_path / "clearframe" / "tickets"
+
+    dead = LeaseManager(tickets, "dead", lease_seconds=60)
+    assert len(dead.claim(sorted(incoming.iterdir()), limit=2)) == 2
+    assert reap_expired(tickets, incoming, 60) == 0
+    assert reap_expired(tickets, incoming, 60, now=time.time() + 61) == 2
+    assert len(list(incoming.iterdir())) == 3
+
+
+def test_tickets_handed_back_since_listing_are_skipped(tmp_path: Path):
+    incoming = _seed(tmp_path, 2)
+    tickets = tmp_path / "clearframe" / "tickets"
+    listed = sorted(incoming.iterdir())
+    listed_at = time.time()
+
+    # "a" handles T000 after "b" listed the inbox, and hands it back
+    a = LeaseManager(tickets, "a")
+    assert len(a.claim(listed[:1], limit=1)) == 1
+    a.release(incoming)
+
+    b = LeaseManager(tickets, "b")
+    assert [p.name for p in b.claim(listed, limit=2, listed_at=listed_at)] == ["T001.json"]
+
+
+def test_renew_restarts_the_lease(tmp_path: Path):
+    incoming = _seed(tmp_path, 1)
+    tickets = tmp_path / "clearframe" / "tickets"
+
+    worker = LeaseManager(tickets, "w", lease_seconds=60)
+    (claimed,) = worker.claim(sorted(incoming.iterdir()), limit=1)
+    stale = time.time() - 120
+    os.utime(claimed, (stale, stale))
+    worker.renew()
+
+    assert reap_expired(tickets, incoming, 60) == 0
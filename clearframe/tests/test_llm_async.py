@@ -0,0 +1,46 @@
+import asyncio
+import time
+
+from clearframe.app.core.engine import ClearframeEngine
+from clearframe.app.core.llm import MockClient
+
+
+def test_identical_requests_share_one_upstream_call():
+    llm = MockClient(latency=0.05)
+
+    async def burst():
+        return await asyncio.gather(*[
+            llm.agenerate_reframe({"bias_context": "SUNK_COST"}) for _ in range(20)
+        ])
+
+    results = asyncio.run(burst())
+
+    assert llm.upstream_calls == 1
+    assert all(r == results[0] for r in results)
+    assert results[0] is not results[1]
+
+
+def test_concurrency_is_bounded():
+    llm = MockClient(latency=0.05, max_concurrency=2)
+
+    async def burst():
+        await asyncio.gather(*[
+            llm.agenerate_reframe({"bias_context": f"B{i}"}) for i in range(4)
+        ])
+
+    start = time.perf_counter()
+    asyncio.run(burst())
+    elapsed = time.perf_counter() - start
+
+    assert llm.upstream_calls == 4
+    assert elapsed >= 0.1
+
+
+def test_aanalyze_matches_analyze():
+    engine = ClearframeEngine(llm_client=MockClient())
+
+    sync = engine.analyze("text", "RECENCY_BIAS", 0.6)
+    async_ = asyncio.run(engine.aanalyze("text", "RECENCY_BIAS", 0.6))
+
+    assert sync == async_
+    assert asyncio.run(engine.aanalyze("text", "UNKNOWN", 0.9)).intervention_type == "NO"
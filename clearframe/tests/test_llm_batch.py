@@ -0,0 +1,134 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from clearframe.app.core.engine import ClearframeEngine
+from clearframe.app.builder.loop import build_llm
+from clearframe.app.core.llm import GeminiClient, LLMClient, MockClient
+from clearframe.app.core.llm_batch import BatchingClient, batch_prompt, can_batch, parse_batch_response
+from clearframe.app.core.llm_resilience import ResiliencePolicy
+
+
+def _burst(client, payloads):
+    with ThreadPoolExecutor(max_workers=len(payloads)) as pool:
+        return list(pool.map(client.generate_reframe, payloads))
+
+
+def test_concurrent_requests_share_one_call():
+    mock = MockClient()
+    client = BatchingClient(mock, max_batch=8, max_delay=5.0)
+
+    payloads = [{"bias_context": f"B{i}"} for i in range(6)] + [{"bias_context": "B0"}] * 2
+    results = _burst(client, payloads)
+
+    assert mock.upstream_calls == 1
+    assert all(r == mock._reframe() for r in results)
+    assert client.stats() == {"batches": 1, "batched": 6, "fallbacks": 0}
+
+
+def test_unparseable_batch_falls_back_to_single_calls():
+    class Garbled(MockClient):
+        def complete(self, prompt):
+            self._count()
+            return "Sure! Here are your reframes:"
+
+    mock = Garbled()
+    client = BatchingClient(mock, max_batch=3, max_delay=5.0)
+    results = _burst(client, [{"bias_context": f"B{i}"} for i in range(3)])
+
+    assert mock.upstream_calls == 1 + 3
+    assert all(r == mock._reframe() for r in results)
+    assert client.stats()["fallbacks"] == 1
+
+
+def test_discipline_is_enforced_per_item():
+    class Pushy(MockClient):
+        def complete(self, prompt):
+            items = json.loads(prompt.rsplit("Inputs:\n", 1)[1])
+            return "```json\n" + json.dumps([
+                {"id": item["id"], "rationale": "r",
+                 "counterfactual": "You should stop." if item["bias_context"] == "SUNK_COST" else "What changed?"}
+                for item in items
+            ]) + "\n```"
+
+    engine = ClearframeEngine(BatchingClient(Pushy(), max_batch=2, max_delay=5.0))
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        sunk, recency = pool.map(lambda b: engine.analyze("", b, 0.9), ["SUNK_COST", "RECENCY_BIAS"])
+
+    assert sunk.counterfactual == "How would you view this SUNK_COST if you started from scratch?"
+    assert recency.counterfactual == "What changed?"
+
+
+def test_response_must_answer_every_input():
+    prompt = batch_prompt([{"bias_context": "A"}, {"bias_context": "B"}])
+    assert "Example 1" in prompt and '"id": 1' in prompt
+
+    answer = [{"id": 1, "counterfactual": "b?"}, {"id": 0, "counterfactual": "a?"}]
+    assert [r["counterfactual"] for r in parse_batch_response(json.dumps(answer), 2)] == ["a?", "b?"]
+
+    for bad in ([answer[0]], answer + [answer[0]], [{"id": 0}, answer[1]]):
+        with pytest.raises(ValueError):
+            parse_batch_response(json.dumps(bad), 2)
+
+
+def test_failed_batch_retries_run_side_by_side():
+    class Flaky(MockClient):
+        def __init__(self):
+            super().__init__(latency=0.2)
+            self.active = self.peak = 0
+            self.lock = threading.Lock()
+
+        def complete(self, prompt):
+            raise ConnectionError("batch endpoint down")
+
+        def generate_reframe(self, analysis):
+            with self.lock:
+                self.active += 1
+                self.peak = max(self.peak, self.active)
+            try:
+                return super().generate_reframe(analysis)
+            finally:
+                with self.lock:
+                    self.active -= 1
+
+    mock = Flaky()
+    client = BatchingClient(mock, max_batch=4, max_delay=5.0)
+    results = _burst(client, [{"bias_context": f"B{i}"} for i in range(4)])
+
+    assert all(r == mock._reframe() for r in results)
+    assert mock.peak == 4
+
+
+def test_clients_without_complete_are_not_wrapped(tmp_path):
+    class SingleOnly(LLMClient):
+        model_id = "single"
+
+        def generate_reframe(self, analysis):
+            return {"counterfactual": "?"}
+
+    _, plain, _ = build_llm(tmp_path, use_cache=False, llm=SingleOnly(), llm_batch=8)
+    _, guarded, _ = build_llm(tmp_path, use_cache=False, llm=SingleOnly(), llm_batch=8, resilience=ResiliencePolicy())
+    _, batched, _ = build_llm(tmp_path, use_cache=False, llm=MockClient(), llm_batch=8, resilience=ResiliencePolicy())
+
+    assert not isinstance(plain, BatchingClient)
+    assert not isinstance(guarded, BatchingClient)
+    assert isinstance(batched, BatchingClient)
+
+
+def test_gemini_batches_through_generate_content():
+    sent = []
+
+    class Models:
+        def generate_content(self, model, contents):
+            sent.append((model, contents))
+            return type("Response", (), {"text": "[]"})()
+
+    gemini = GeminiClient.__new__(GeminiClient)
+    gemini.model = "gemini-test"
+    gemini.client = type("Client", (), {"models": Models()})()
+
+    assert can_batch(gemini)
+    assert gemini.complete("PROMPT") == "[]"
+    assert sent == [("gemini-test", "PROMPT")]
@@ -0,0 +1,65 @@
+import asyncio
+from pathlib import Path
+
+from clearframe.app.core.llm import MockClient
+from clearframe.app.core.llm_cache import CachedClient, ReframeCache, cache_key
+
+
+def test_repeat_requests_hit_cache_across_instances(tmp_path: Path):
+    db = tmp_path / "reframe.sqlite"
+
+    first = MockClient()
+    client = CachedClient(first, ReframeCache(db))
+    a = client.generate_reframe({"bias_context": "SUNK_COST"})
+    b = client.generate_reframe({"bias_context": "SUNK_COST"})
+    client.cache.close()
+
+    # a fresh process reads the persisted entry
+    second = MockClient()
+    reopened = CachedClient(second, ReframeCache(db))
+    c = asyncio.run(reopened.agenerate_reframe({"bias_context": "SUNK_COST"}))
+
+    assert a == b == c
+    assert first.upstream_calls == 1
+    assert second.upstream_calls == 0
+    assert reopened.cache.stats()["hits"] == 1
+
+
+def test_key_depends_on_model_and_prompt():
+    payload = {"bias_context": "SUNK_COST"}
+
+    assert cache_key(payload, "mock") != cache_key(payload, "gemini")
+    assert cache_key(payload, "mock") != cache_key(payload, "mock", prompt="v2")
+
+
+def test_ttl_and_size_eviction(tmp_path: Path):
+    cache = ReframeCache(tmp_path / "c.sqlite", ttl_seconds=-1)
+    cache.put("k", {"counterfactual": "?"})
+    assert cache.get("k") is None
+
+    cache = ReframeCache(tmp_path / "d.sqlite", max_entries=2)
+    for k in ("a", "b", "c"):
+        cache.put(k, {"counterfactual": k})
+
+    assert cache.get("a") is None
+    assert cache.get("c") == {"counterfactual": "c"}
+    assert cache.stats()["evictions"] == 1
+
+
+def test_eviction_drops_least_recently_read(tmp_path: Path):
+    cache = ReframeCache(tmp_path / "c.sqlite", max_entries=2, memory_entries=0)
+    cache.put("a", {"counterfactual": "a"})
+    cache.put("b", {"counterfactual": "b"})
+    # a read keeps "a" alive; "b" is now the least recently used
+    assert cache.get("a") == {"counterfactual": "a"}
+    cache.put("c", {"counterfactual": "c"})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"counterfactual": "a"}
+    cache.close()
+
+    # read times outlive the process
+    reopened = ReframeCache(tmp_path / "c.sqlite", max_entries=2)
+    reopened.put("d", {"counterfactual": "d"})
+    assert reopened.get("c") is None
+    assert reopened.get("a") is not None
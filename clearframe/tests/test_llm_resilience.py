@@ -0,0 +1,156 @@
+import json
+import subprocess
+import sys
+import textwrap
+import threading
+import time
+from pathlib import Path
+
+from clearframe.app.builder.loop import run_local_loop
+from clearframe.app.core.llm import MockClient
+from clearframe.app.core.llm_resilience import (
+    CLOSED,
+    OPEN,
+    ResiliencePolicy,
+    ResilientClient,
+    TokenBucket,
+)
+
+
+class Flaky(MockClient):
+    """Fails the first `failures` reframe calls."""
+
+    def __init__(self, failures, **kwargs):
+        super().__init__(**kwargs)
+        self.failures = failures
+
+    def generate_reframe(self, analysis):
+        if self._count() <= self.failures:
+            raise ConnectionError("provider unavailable")
+        return self._reframe()
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_retries_with_capped_jittered_backoff():
+    delays = []
+    policy = ResiliencePolicy(retries=3, backoff=0.5, max_backoff=0.75, timeout=None)
+    client = ResilientClient(Flaky(failures=3), policy, sleep=delays.append)
+
+    assert client.generate_reframe({"bias_context": "SUNK_COST"}) == MockClient()._reframe()
+    assert client.stats()["retries"] == 3
+    assert [0 <= d <= cap for d, cap in zip(delays, [0.5, 0.75, 0.75])] == [True] * 3
+
+
+def test_timeout_degrades_to_the_fallback_counterfactual():
+    client = ResilientClient(MockClient(latency=0.5), ResiliencePolicy(timeout=0.05, retries=0))
+
+    start = time.perf_counter()
+    result = client.generate_reframe({"bias_context": "SUNK_COST"})
+
+    assert time.perf_counter() - start < 0.4
+    assert result["fallback"] is True
+    assert result["counterfactual"] == "How would you view this SUNK_COST if you started from scratch?"
+    assert client.stats()["timeouts"] == 1
+
+
+def test_timed_out_calls_hold_a_bounded_pool():
+    hung = threading.Event()
+
+    class Hanging(MockClient):
+        def generate_reframe(self, analysis):
+            hung.wait(5)
+            return self._reframe()
+
+    policy = ResiliencePolicy(timeout=0.05, retries=0, failure_threshold=100, max_in_flight=2)
+    client = ResilientClient(Hanging(), policy)
+    before = threading.active_count()
+    try:
+        results = [client.generate_reframe({"bias_context": f"B{i}"}) for i in range(5)]
+        assert all(r["fallback"] for r in results)
+        assert client.stats()["timeouts"] == 5
+        assert threading.active_count() - before <= 2
+    finally:
+        hung.set()
+
+
+def test_hung_call_does_not_block_exit():
+    script = textwrap.dedent(
+        """
+        import time
+        from clearframe.app.core.llm import MockClient
+        from clearframe.app.core.llm_resilience import ResiliencePolicy, ResilientClient
+
+        class Hanging(MockClient):
+            def generate_reframe(self, analysis):
+                time.sleep(60)
+
+        policy = ResiliencePolicy(timeout=0.1, retries=0)
+        client = ResilientClient(Hanging(), policy)
+        assert client.generate_reframe({"bias_context": "B"})["fallback"]
+        client.close()
+        """
+    )
+    start = time.monotonic()
+    proc = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, timeout=30)
+    assert proc.returncode == 0, proc.stderr
+    assert time.monotonic() - start < 15
+
+
+def test_closed_client_starts_a_fresh_pool():
+    client = ResilientClient(MockClient(), ResiliencePolicy(timeout=1.0, retries=0))
+    client.generate_reframe({"bias_context": "B"})
+    client.close()
+    assert not client.generate_reframe({"bias_context": "B"}).get("fallback")
+    client.close()
+
+
+def test_breaker_opens_then_recovers_through_one_trial():
+    clock = Clock()
+    inner = Flaky(failures=2)
+    policy = ResiliencePolicy(retries=0, failure_threshold=2, reset_seconds=30, timeout=None)
+    client = ResilientClient(inner, policy, sleep=lambda s: None, clock=clock)
+
+    for _ in range(4):
+        client.generate_reframe({"bias_context": "X"})
+
+    # the last two never reached the provider
+    assert inner.upstream_calls == 2
+    assert client.breaker.state == OPEN
+    assert client.stats()["fallbacks"] == 4
+
+    clock.now = 31
+    assert "fallback" not in client.generate_reframe({"bias_context": "X"})
+    assert client.breaker.state == CLOSED
+    assert client.stats()["breaker"] == {"state": CLOSED, "trips": 1}
+
+
+def test_token_bucket_spaces_calls():
+    clock = Clock()
+    bucket = TokenBucket(rate=2, burst=1, clock=clock)
+
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.5, 1.0]
+    clock.now = 10
+    assert bucket.reserve() == 0.0
+
+
+def test_outage_keeps_tickets_and_lands_in_the_run_log(tmp_path: Path):
+    incoming = tmp_path / "clearframe" / "tickets" / "incoming"
+    incoming.mkdir(parents=True)
+    (incoming / "A1.json").write_text(
+        json.dumps({"id": "A1", "body": "The CEO and VP sent a directive."}), encoding="utf-8"
+    )
+
+    policy = ResiliencePolicy(retries=1, backoff=0.0, timeout=None)
+    result = run_local_loop(tmp_path, use_cache=False, llm=Flaky(failures=99), resilience=policy)
+
+    assert result.processed == 1
+    log = json.loads((result.run_dir / "run_log.json").read_text())
+    assert log["stats"]["llm_resilience"]["retries"] == 1
+    assert log["stats"]["llm_resilience"]["fallbacks"] == 1
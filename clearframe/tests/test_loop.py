@@ -0,0 +1,43 @@
+import json
+from pathlib import Path
+
+from clearframe.app.builder.loop import run_local_loop
+
+
+TICKETS = {
+    "A1": "The CEO and VP sent a directive. My manager says so.",
+    "B2": "We already spent months and invested so much.",
+    "C3": "Nothing to see here.",
+    "D4": "I saw a post on Reddit today, it proves everyone says so.",
+}
+
+
+def _seed(root: Path) -> Path:
+    incoming = root / "clearframe" / "tickets" / "incoming"
+    incoming.mkdir(parents=True)
+    for t_id, body in TICKETS.items():
+        (incoming / f"{t_id}.json").write_text(
+            json.dumps({"id": t_id, "title": t_id, "body": body}),
+            encoding="utf-8",
+        )
+    return incoming
+
+
+def test_pooled_run_matches_sequential(tmp_path: Path, capsys):
+    seq_root, par_root = tmp_path / "seq", tmp_path / "par"
+    _seed(seq_root)
+    incoming = _seed(par_root)
+
+    seq = run_local_loop(seq_root)
+    seq_out = capsys.readouterr().out
+    par = run_local_loop(par_root, workers=4)
+    par_out = capsys.readouterr().out
+
+    assert seq.processed == par.processed == 3
+    assert seq_out == par_out
+
+    artifacts = sorted(p.name for p in Path(par.run_dir).glob("*.execution.json"))
+    assert artifacts == ["A1.execution.json", "B2.execution.json", "D4.execution.json"]
+    assert sorted(p.name for p in incoming.glob("*.done.json")) == [
+        "A1.done.json", "B2.done.json", "D4.done.json",
+    ]
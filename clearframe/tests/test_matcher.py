@@ -0,0 +1,82 @@
+import random
+
+from clearframe.app.core.detector import MATCHER, scan
+from clearframe.app.core.features import featurize, tokenize
+from clearframe.app.core.matcher import KeywordMatcher
+
+
+def test_keywords_match_whole_words_only():
+    hits = scan("Sometimes the network team ships an MVP.")
+
+    assert hits.matched("time_effort") == []
+    assert hits.matched("AUTHORITY_BIAS") == []
+
+    hits = scan("Six months of work, all wasted; the VP's call.")
+    assert hits.matched("time_effort") == ["month", "work"]
+    assert hits.matched("waste") == ["waste", "wasted"]
+    assert hits.matched("AUTHORITY_BIAS") == ["vp"]
+
+
+def test_phrases_need_consecutive_tokens():
+    assert scan("I already know it.").matched("CONFIRMATION_BIAS") == ["already know"]
+    assert scan("Already, I know it.").matched("CONFIRMATION_BIAS") == []
+    assert scan("I can’t quit now").has("obligation")
+
+
+def test_negated_keywords_do_not_fire():
+    assert not scan("We haven't spent anything yet.").has("past")
+    assert scan("We can't stop, it was wasted.").matched("waste") == ["waste", "wasted"]
+    assert scan("Not today. Today we decide.").matched("RECENCY_BIAS") == ["today"]
+
+
+def test_features_are_scanned_once():
+    features = featurize("We invested a year. Should we stop?")
+
+    assert scan(features) is scan(features)
+    assert features.sentence_text(0) == "We invested a year"
+    assert features.sentence_text(1) == "Should we stop"
+
+
+def test_random_text_agrees_with_token_reference():
+    rng = random.Random(7)
+    vocab = [w for words in MATCHER.groups.values() for w in words]
+    vocab += ["the", "sometimes", "network", "mvp", ".", ","]
+
+    for _ in range(200):
+        text = " ".join(rng.choice(vocab) for _ in range(rng.randint(0, 30)))
+        padded = f" {' '.join(t for t, _, _ in tokenize(text))} "
+        hits = scan(text)
+
+        for group, words in MATCHER.groups.items():
+            # without negations, an exact phrase is always found
+            exact = [w for w in words if f" {w} " in padded]
+            if not any(n in padded for n in (" no ", " without ", "n't ")):
+                assert set(exact) <= set(hits.matched(group))
+
+
+def test_overlapping_hits_and_offsets():
+    matcher = KeywordMatcher({"a": ["waste", "wasted"], "b": ["sted"]})
+    hits = matcher.scan("All WASTED.")
+
+    assert [(h.keyword, h.start, h.end) for h in hits.hits["a"]] == [
+        ("waste", 4, 10),
+        ("wasted", 4, 10),
+    ]
+    assert hits.matched("b") == []
+
+
+def test_shared_keyword_reports_every_group():
+    hits = scan("I already know this.")
+
+    assert "already" in hits.matched("past")
+    assert hits.matched("CONFIRMATION_BIAS") == ["already know"]
+
+
+def test_find_agrees_with_scan():
+    rng = random.Random(13)
+    vocab = [w for words in MATCHER.groups.values() for w in words]
+    vocab += ["not", "no", "never", "isn't", "nothing", "Putting", "IN", ".", ","]
+
+    for _ in range(500):
+        text = " ".join(rng.choice(vocab) for _ in range(rng.randint(0, 30)))
+        assert MATCHER.find(text) == scan(text).found, text
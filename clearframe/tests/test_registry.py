@@ -0,0 +1,60 @@
+import pytest
+
+from clearframe.app.core.detector import AWARENESS, REGISTRY, sunk_cost_signal
+from clearframe.app.core.extractor import extract_decision
+from clearframe.app.core.registry import Boost, Detector, DetectorRegistry
+
+
+def _registry():
+    registry = DetectorRegistry()
+    for d in REGISTRY.detectors:
+        registry.register(d)
+    registry.register_groups(AWARENESS)
+    return registry
+
+
+def test_new_detector_joins_the_shared_plan():
+    registry = _registry()
+    before = registry.matcher
+
+    registry.register(Detector(
+        name="BANDWAGON",
+        signature=("everyone is", "all my friends", "trending"),
+        factors={"crowd": ("everyone", "all my friends")},
+        weights={"crowd": 0.6},
+        boosts=(Boost(requires=("crowd",), floor=0.7),),
+    ))
+
+    assert registry.matcher is not before
+    hits = registry.scan("Everyone is doing it and it is trending.")
+    assert registry.elect(hits) == ("BANDWAGON", 0.67)
+    assert registry.signal("BANDWAGON", hits) == 0.7
+    assert hits.has("SUNK_COST") is False
+
+
+def test_group_names_must_be_unique():
+    registry = _registry()
+    with pytest.raises(ValueError):
+        registry.register(Detector(name="X", signature=("x",), factors={"past": ("x",)}))
+    with pytest.raises(ValueError):
+        registry.register(Detector(name="SUNK_COST", signature=("x",)))
+
+
+def test_profiling_counts_hits_per_detector():
+    registry = _registry()
+    with registry.profile():
+        for text in ["We already spent months on it.", "The CEO says so.", "Nothing here."]:
+            registry.elect(registry.scan(text))
+    registry.scan("not recorded")
+
+    stats = registry.stats()
+    assert stats["scan"]["evaluations"] == 3
+    assert stats["SUNK_COST"]["hits"] == 1
+    assert stats["AUTHORITY_BIAS"]["hits"] == 1
+    assert stats["RECENCY_BIAS"]["hits"] == 0
+
+
+def test_builtins_keep_their_answers():
+    assert sunk_cost_signal("so i should keep going, otherwise it was all wasted") == 0.85
+    assert extract_decision("We invested a lot. Should we stop?").past_investments
+    assert not extract_decision("Should we stop?").past_investments
@@ -0,0 +1,72 @@
+from pathlib import Path
+
+import pytest
+
+from clearframe.app.builder.artifacts import analysis_artifact, plan_artifact, write_artifact
+from clearframe.app.builder.bundle import BUNDLE_NAME, BundleWriter
+from clearframe.app.builder.replay import iter_run, show_last_run
+from clearframe.app.builder.run_index import append_run
+from clearframe.app.core.schemas import EngineOutput, Ticket
+
+
+def _artifacts():
+    out = []
+    for i, bias in enumerate(["SUNK_COST", "RECENCY_BIAS", "SUNK_COST", "RECENCY_BIAS"]):
+        ticket = Ticket(ticket_id=f"T{i}", title="t", body="b", bias_type=bias, signal_strength=0.6)
+        out.append(analysis_artifact(ticket, EngineOutput(intervention_type="SOFT", bias_context=bias)))
+    out.append(plan_artifact("Z9", "DRY_RUN_FAILED", "ws", [{"id": 1, "status": "failed"}]))
+    return out
+
+
+@pytest.fixture(params=["files", "bundle"])
+def run_dir(request, tmp_path: Path) -> Path:
+    run = tmp_path / "runs" / "20260101T000000Z"
+    run.mkdir(parents=True)
+    if request.param == "bundle":
+        with BundleWriter(run / BUNDLE_NAME) as bundle:
+            for a in _artifacts():
+                bundle.add(a, "compact")
+    else:
+        for a in _artifacts():
+            write_artifact(run, a)
+    append_run(run.parent, run, processed=5)
+    return run
+
+
+def test_filters(run_dir: Path):
+    assert [a["ticket_id"] for a in iter_run(run_dir, bias="recency_bias")] == ["T1", "T3"]
+    assert [a["ticket_id"] for a in iter_run(run_dir, status="failed")] == ["Z9"]
+    assert [a["ticket_id"] for a in iter_run(run_dir, ticket_id="T2")] == ["T2"]
+    assert list(iter_run(run_dir, ticket_id="T2", bias="RECENCY_BIAS")) == []
+
+
+def test_paging(run_dir: Path, capsys):
+    show_last_run(run_dir.parent, bias="SUNK_COST", page=2, page_size=1)
+    out = capsys.readouterr().out
+    assert "REPLAYING RUN: T2" in out
+    assert "--page" not in out
+
+    show_last_run(run_dir.parent, page=1, page_size=2)
+    out = capsys.readouterr().out
+    assert "T0" in out and "T1" in out and "T2" not in out
+    assert "--page 2" in out
+
+
+def test_ticket_filter_ignores_case(run_dir: Path):
+    assert [a["ticket_id"] for a in iter_run(run_dir, ticket_id="t2")] == ["T2"]
+
+
+def test_cli_replay_honors_repo_root(tmp_path: Path, capsys):
+    from clearframe.app.builder.cli import main
+
+    runs = tmp_path / "clearframe" / "tickets" / "runs"
+    run = runs / "20260101T000000Z"
+    run.mkdir(parents=True)
+    for a in _artifacts():
+        write_artifact(run, a)
+    append_run(runs, run, processed=5)
+
+    assert main(["replay", "--repo-root", str(tmp_path), "--ticket", "z9"]) == 0
+    assert "REPLAYING RUN: Z9" in capsys.readouterr().out
+    assert main(["compact-index", "--repo-root", str(tmp_path)]) == 0
+    assert "index_entries=1" in capsys.readouterr().out
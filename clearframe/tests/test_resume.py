@@ -0,0 +1,164 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from clearframe.app.builder.bundle import BUNDLE_NAME, BundleReader
+from clearframe.app.builder.cli import main
+from clearframe.app.builder.journal import ANALYZED, CLAIMED, JOURNAL_NAME, RENAMED, WRITTEN, read_journal
+from clearframe.app.builder.loop import resume_run, run_local_loop
+from clearframe.app.builder.replay import load_run_artifact
+from clearframe.app.builder.run_index import latest_run
+from clearframe.app.core.llm import MockClient
+
+
+BODIES = {
+    "A1": "We already spent months and invested so much.",
+    "B2": "The CEO and VP sent a directive. My manager says so.",
+    "C3": "I saw a post on Reddit today, it proves everyone says so.",
+}
+
+
+class Crash(BaseException):
+    pass
+
+
+class CrashingClient(MockClient):
+    def __init__(self, crash_on_call):
+        super().__init__()
+        self.crash_on_call = crash_on_call
+
+    def generate_reframe(self, analysis):
+        if self.upstream_calls + 1 == self.crash_on_call:
+            raise Crash()
+        return super().generate_reframe(analysis)
+
+
+def _seed(root: Path) -> Path:
+    incoming = root / "clearframe" / "tickets" / "incoming"
+    incoming.mkdir(parents=True)
+    for t_id, body in BODIES.items():
+        (incoming / f"{t_id}.json").write_text(json.dumps({"id": t_id, "title": t_id, "body": body}))
+    return incoming
+
+
+def _only_run(root: Path) -> Path:
+    (run,) = (root / "clearframe" / "tickets" / "runs").iterdir()
+    return run
+
+
+def test_resume_after_crash_reanalyzes_only_unfinished(tmp_path: Path):
+    incoming = _seed(tmp_path)
+
+    with pytest.raises(Crash):
+        run_local_loop(tmp_path, use_cache=False, llm=CrashingClient(crash_on_call=2))
+
+    run = _only_run(tmp_path)
+    _, states = read_journal(run / JOURNAL_NAME)
+    assert states["A1.json"].state == RENAMED
+    assert states["B2.json"].state == CLAIMED
+    assert states["C3.json"].state is None
+
+    llm = MockClient()
+    result = resume_run(tmp_path, run.name, use_cache=False, llm=llm)
+
+    assert llm.upstream_calls == 2
+    assert result.processed == 3
+    assert sorted(p.name for p in incoming.iterdir()) == ["A1.done.json", "B2.done.json", "C3.done.json"]
+    assert json.loads((run / "run_log.json").read_text())["processed"] == 3
+    assert latest_run(run.parent)["run_id"] == run.name
+
+
+def test_resume_uses_journaled_output(tmp_path: Path, capsys):
+    incoming = _seed(tmp_path)
+    run = tmp_path / "clearframe" / "tickets" / "runs" / "20260101T000000Z"
+    run.mkdir(parents=True)
+
+    (incoming / "C3.json").unlink()
+    done_artifact = run / "A1.execution.json"
+    done_artifact.write_text("{}")
+    output = {"intervention_type": "SOFT", "bias_context": "AUTHORITY_BIAS", "counterfactual": "Who decided?", "rationale": None}
+    lines = [
+        {"event": "batch", "tickets": ["A1.json", "B2.json"]},
+        {"ticket": "A1.json", "state": WRITTEN, "artifact": str(done_artifact), "kind": "analysis"},
+        {"ticket": "B2.json", "state": ANALYZED, "output": output},
+    ]
+    (run / JOURNAL_NAME).write_text("".join(json.dumps(l) + "\n" for l in lines) + '{"ticket": "B2')
+
+    assert main(["resume", run.name, "--repo-root", str(tmp_path), "--no-cache"]) == 0
+    assert "reanalyzed=0" in capsys.readouterr().out
+
+    assert sorted(p.name for p in incoming.iterdir()) == ["A1.done.json", "B2.done.json"]
+    artifact = json.loads((run / "B2.execution.json").read_text())
+    assert artifact["analysis"]["counterfactual"] == "Who decided?"
+    _, states = read_journal(run / JOURNAL_NAME)
+    assert states["A1.json"].state == states["B2.json"].state == RENAMED
+
+
+def test_resume_reclaims_a_dead_workers_claims(tmp_path: Path, monkeypatch):
+    from clearframe.app.builder.lease import LeaseManager
+
+    incoming = _seed(tmp_path)
+    # killed outright: nothing hands the claims back
+    monkeypatch.setattr(LeaseManager, "release", lambda self, incoming: 0)
+    with pytest.raises(Crash):
+        run_local_loop(tmp_path, use_cache=False, llm=CrashingClient(crash_on_call=2), claim=True, worker_id="w1")
+    monkeypatch.undo()
+
+    claimed = tmp_path / "clearframe" / "tickets" / "claimed" / "w1"
+    assert sorted(p.name for p in claimed.iterdir()) == ["A1.done.json", "B2.json", "C3.json"]
+
+    result = resume_run(tmp_path, _only_run(tmp_path).name, use_cache=False, llm=MockClient())
+
+    assert result.processed == 3
+    assert not any(claimed.iterdir())
+    assert sorted(p.name for p in incoming.iterdir()) == ["A1.done.json", "B2.done.json", "C3.done.json"]
+
+
+def test_resume_rewrites_bundle_records_lost_in_a_crash(tmp_path: Path):
+    incoming = _seed(tmp_path)
+
+    with pytest.raises(Crash):
+        run_local_loop(tmp_path, use_cache=False, bundle=True, llm=CrashingClient(crash_on_call=2))
+
+    run = _only_run(tmp_path)
+    with BundleReader(run / BUNDLE_NAME) as reader:
+        assert reader.keys() == ["A1"]
+    # the machine died before the bundle reached the disk
+    (run / BUNDLE_NAME).write_bytes(b"")
+
+    result = resume_run(tmp_path, run.name, use_cache=False, llm=MockClient())
+
+    assert result.processed == 3
+    with BundleReader(run / BUNDLE_NAME) as reader:
+        assert sorted(reader.keys()) == ["A1", "B2", "C3"]
+    assert load_run_artifact(run, "A1")["analysis"]["bias_context"] == "SUNK_COST"
+    assert sorted(p.name for p in incoming.iterdir()) == ["A1.done.json", "B2.done.json", "C3.done.json"]
+
+
+def test_journal_fsyncs_only_what_resume_relies_on(tmp_path: Path, monkeypatch):
+    import os
+    from concurrent.futures import ThreadPoolExecutor
+
+    from clearframe.app.builder import journal as journal_mod
+
+    syncs = []
+    real_fsync = os.fsync
+    monkeypatch.setattr(journal_mod.os, "fsync", lambda fd: (syncs.append(fd), real_fsync(fd)))
+
+    journal = journal_mod.Journal(tmp_path / JOURNAL_NAME)
+    journal.record("A1", CLAIMED)
+    journal.record("A1", ANALYZED, output={"x": 1})
+    assert syncs == []
+    journal.record("A1", WRITTEN, artifact="A1.json", kind="analysis")
+    journal.record("A1", RENAMED)
+    assert len(syncs) == 2
+
+    names = [f"T{i}" for i in range(32)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda name: journal.record(name, RENAMED), names))
+    assert len(syncs) <= 2 + len(names)
+
+    _, states = read_journal(tmp_path / JOURNAL_NAME)
+    assert states["A1"].state == RENAMED and states["A1"].output == {"x": 1}
+    assert all(states[name].done for name in names)
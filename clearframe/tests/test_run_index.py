@@ -0,0 +1,58 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from clearframe.app.builder.run_index import (
+    append_run,
+    compact_index,
+    latest_run,
+    load_index,
+    runs_between,
+    runs_with_failures,
+)
+
+
+def test_concurrent_appends_are_not_lost(tmp_path: Path):
+    runs_dir = tmp_path / "runs"
+
+    def add(i):
+        append_run(runs_dir, runs_dir / f"20260301T0000{i:02d}Z", processed=i)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(add, range(40)))
+
+    assert len(load_index(runs_dir)) == 40
+
+
+def test_queries_and_compaction(tmp_path: Path):
+    runs_dir = tmp_path / "runs"
+    runs_dir.mkdir()
+    (runs_dir / "index.json").write_text(
+        json.dumps([{"run_id": "20260217T200504Z", "path": "x", "processed": 1}]),
+        encoding="utf-8",
+    )
+
+    append_run(runs_dir, runs_dir / "20260218T030005Z", processed=2, failed=1)
+    append_run(runs_dir, runs_dir / "20260219T010000Z", processed=3)
+    append_run(runs_dir, runs_dir / "20260218T030005Z", processed=4)
+
+    # the re-recorded (resumed) run is not the newest one
+    assert latest_run(runs_dir)["run_id"] == "20260219T010000Z"
+    assert [e["run_id"] for e in runs_between(runs_dir, "20260218", "20260218")] == [
+        "20260218T030005Z", "20260218T030005Z",
+    ]
+    assert len(runs_with_failures(runs_dir)) == 1
+
+    assert compact_index(runs_dir) == 3
+    assert not (runs_dir / "index.json").exists()
+    assert [e["run_id"] for e in load_index(runs_dir)] == [
+        "20260217T200504Z", "20260218T030005Z", "20260219T010000Z",
+    ]
+    assert latest_run(runs_dir)["run_id"] == "20260219T010000Z"
+
+    append_run(runs_dir, runs_dir / "20260219T010000Z", processed=5)
+    append_run(runs_dir, runs_dir / "20260219T010000Z-2", processed=6)
+    append_run(runs_dir, runs_dir / "20260219T010000Z", processed=7)
+    assert latest_run(runs_dir)["processed"] == 6
+    append_run(runs_dir, runs_dir / "20260219T010000Z-2", processed=8)
+    assert latest_run(runs_dir)["processed"] == 8
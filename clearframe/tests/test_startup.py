@@ -0,0 +1,50 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+
+ROOT = Path(__file__).resolve().parents[2]
+
+# Cumulative import time allowed per command; override on slow machines.
+BUDGET_MS = float(os.getenv("CLEARFRAME_STARTUP_BUDGET_MS", "120"))
+
+# Only `run` / `watch` / `resume` need these; the slim paths never should.
+HEAVY = {
+    "asyncio",
+    "sqlite3",
+    "concurrent.futures",
+    "pydantic",
+    "clearframe.app.core.engine",
+    "clearframe.app.core.llm",
+    "clearframe.app.builder.loop",
+}
+
+
+def _importtime(*args):
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "clearframe.app.builder.cli", *args],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    assert proc.returncode == 0, proc.stderr
+
+    modules, total_us = set(), 0
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        total_us += int(self_us)
+        modules.add(name.strip())
+    return modules, total_us / 1000
+
+
+@pytest.mark.parametrize("args", [("replay",), ("run", "--help")])
+def test_slim_startup(args):
+    modules, total_ms = _importtime(*args)
+
+    assert not HEAVY & modules
+    assert total_ms < BUDGET_MS, f"{' '.join(args)} imported in {total_ms:.1f} ms"
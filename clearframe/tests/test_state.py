@@ -0,0 +1,74 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from clearframe.app.builder.loop import run_local_loop
+from clearframe.app.builder.state import STATE_DB_NAME, TicketStore
+
+
+def _tickets(tmp_path: Path) -> Path:
+    incoming = tmp_path / "clearframe" / "tickets" / "incoming"
+    incoming.mkdir(parents=True)
+    return incoming
+
+
+def _write(incoming: Path, name: str, body: str, **fields) -> None:
+    (incoming / name).write_text(json.dumps({"body": body, **fields}), encoding="utf-8")
+
+
+def test_new_store_imports_done_tickets_and_processed_json(tmp_path: Path):
+    incoming = _tickets(tmp_path)
+    _write(incoming, "T6-Test.done.json", "Everyone is doing this.", id="T6-TEST")
+    _write(incoming, "t9.done.json", "No id field.")
+    (incoming.parent / "processed.json").write_text('["T1", {"id": "t2"}]')
+    run = incoming.parent / "runs" / "20260218T030005Z"
+    run.mkdir(parents=True)
+    (run / "T6-TEST.execution.json").write_text("{}")
+
+    store = TicketStore(incoming.parent / STATE_DB_NAME)
+
+    assert store.migrated == 4
+    assert store.ids("processed") == ["T1", "T2", "T6-TEST", "T9"]
+    assert store.get("T6-TEST")["run_id"] == "20260218T030005Z"
+    # an existing store is not migrated again
+    store.close()
+    assert TicketStore(incoming.parent / STATE_DB_NAME).migrated == 0
+
+
+def test_loop_records_every_outcome(tmp_path: Path):
+    incoming = _tickets(tmp_path)
+    _write(incoming, "A1.json", "The CEO and VP sent a directive.", id="A1")
+    _write(incoming, "A2.json", "The CEO and VP sent a directive.", id="A2")
+    _write(incoming, "Q1.json", "Lunch is at noon.", id="Q1")
+
+    result = run_local_loop(tmp_path, use_cache=False, record_state=True)
+    store = TicketStore(incoming.parent / STATE_DB_NAME)
+
+    assert store.is_processed("A1") and store.is_processed("A2")
+    assert store.get("A2")["hash"] == store.get("A1")["hash"]
+    assert store.get("A1")["run_id"] == result.run_dir.name
+    # silent tickets stay in the inbox, with an outcome of their own
+    assert store.ids("silent") == ["Q1"]
+    assert store.ids("pending") == []
+
+
+def test_status_updates_are_validated(tmp_path: Path):
+    store = TicketStore(tmp_path / STATE_DB_NAME)
+
+    store.mark("T1", "failed", run_id="r1")
+    store.mark("T1", "processed")
+
+    assert store.get("T1")["status"] == "processed"
+    assert store.get("T1")["run_id"] == "r1"
+    with pytest.raises(ValueError):
+        store.mark("T1", "done")
+
+
+def test_runs_leave_the_store_alone_unless_asked(tmp_path: Path):
+    incoming = _tickets(tmp_path)
+    _write(incoming, "A1.json", "The CEO and VP sent a directive.", id="A1")
+
+    run_local_loop(tmp_path, use_cache=False, dedupe=False)
+
+    assert not (incoming.parent / STATE_DB_NAME).exists()
@@ -0,0 +1,47 @@
+import json
+from pathlib import Path
+
+from clearframe.app.builder.loop import run_local_loop
+from clearframe.app.core.tracing import NULL_TRACER, Tracer, current_tracer, use_tracer
+
+
+def test_null_tracer_is_default_and_records_nothing():
+    assert current_tracer() is NULL_TRACER
+    with current_tracer().span("x"):
+        pass
+    assert NULL_TRACER.summary() == {}
+    assert NULL_TRACER.durations("a") == {}
+
+
+def test_spans_are_tagged_and_summarized(tmp_path: Path):
+    tracer = Tracer()
+    with use_tracer(tracer):
+        for key in ("a", "b"):
+            with tracer.ticket(key), current_tracer().span("stage"):
+                pass
+
+    assert set(tracer.durations("a")) == {"stage"}
+    assert tracer.durations("missing") == {}
+    assert tracer.summary()["stage"]["count"] == 2
+
+    trace = json.loads(Path(tracer.export_chrome_trace(tmp_path / "t.json")).read_text())
+    assert [e["args"]["ticket"] for e in trace["traceEvents"]] == ["a", "b"]
+    assert all(e["ph"] == "X" for e in trace["traceEvents"])
+
+
+def test_traced_run_writes_stage_timings(tmp_path: Path):
+    incoming = tmp_path / "clearframe" / "tickets" / "incoming"
+    incoming.mkdir(parents=True)
+    (incoming / "A1.json").write_text(
+        json.dumps({"id": "A1", "body": "The CEO and VP sent a directive."}), encoding="utf-8"
+    )
+
+    result = run_local_loop(tmp_path, trace=True, use_cache=False)
+
+    artifact = json.loads((result.run_dir / "A1.execution.json").read_text())
+    assert {"parse", "tokenize", "election", "analyze", "llm"} <= set(artifact["meta"]["timings_ms"])
+
+    log = json.loads((result.run_dir / "run_log.json").read_text())
+    assert {"write_artifact", "rename"} <= set(log["stats"]["timings"])
+    assert (result.run_dir / "trace.json").exists()
+    assert log["stats"]["detectors"]["AUTHORITY_BIAS"]["hits"] == 1
@@ -0,0 +1,44 @@
+import json
+import threading
+import time
+from pathlib import Path
+
+from clearframe.app.builder.run_index import load_index
+from clearframe.app.builder.watch import watch_incoming
+
+
+def _drop(incoming: Path, t_id: str, body: str) -> None:
+    tmp = incoming / f"{t_id}.tmp"
+    tmp.write_text(json.dumps({"id": t_id, "title": t_id, "body": body}), encoding="utf-8")
+    tmp.rename(incoming / f"{t_id}.json")
+
+
+def test_watch_micro_batches_late_arrivals(tmp_path: Path, capsys):
+    incoming = tmp_path / "clearframe" / "tickets" / "incoming"
+    incoming.mkdir(parents=True)
+    _drop(incoming, "A1", "My boss and the CEO sent a directive.")
+    _drop(incoming, "N0", "Nothing to see here.")
+
+    def late():
+        time.sleep(0.3)
+        _drop(incoming, "B2", "We already spent months and invested a lot.")
+
+    threading.Thread(target=late).start()
+
+    result = watch_incoming(
+        tmp_path,
+        window_seconds=0.05,
+        poll_interval=0.02,
+        use_inotify=False,
+        idle_exit=1.0,
+    )
+
+    assert result.processed == 2
+    assert len(result.runs) == 2
+    assert [e["processed"] for e in load_index(tmp_path / "clearframe" / "tickets" / "runs")] == [1, 1]
+    # the silent ticket is analyzed once, not on every wake-up
+    assert capsys.readouterr().out.count("Silence maintained for N0") == 1
+
+    # each run log counts that run's cache lookups, not the session's
+    runs = [json.loads((run / "run_log.json").read_text())["stats"]["llm_cache"] for run in result.runs]
+    assert [(s["hits"], s["misses"]) for s in runs] == [(0, 1), (0, 1)]
@@ -0,0 +1,47 @@
+import hashlib
+import json
+from pathlib import Path
+
+import pytest
+
+from clearframe.app.builder.executor import execute_plan
+from clearframe.app.builder.planner import Step
+from clearframe.app.builder.workspace import VirtualWorkspace, WorkspaceError
+
+
+def test_paths_fail_where_the_filesystem_would(tmp_path: Path):
+    ws = VirtualWorkspace(tmp_path)
+    ws.write_text("a/b.txt", "x")
+
+    for bad in ("", "/etc/passwd", "../out.txt", "a/../../out.txt", "a/b.txt/c", "a"):
+        with pytest.raises(WorkspaceError):
+            ws.write_text(bad, "y")
+
+    assert ws.exists("a") and ws.read_text("a/b.txt") == "x"
+    assert not any(tmp_path.iterdir())
+
+
+def test_dry_run_without_materialize_touches_no_workspace(tmp_path: Path):
+    steps = [
+        Step(id=1, description="write src/app.py: print('hi')"),
+        Step(id=2, description="create notes/todo.md"),
+    ]
+
+    result = execute_plan("T1", steps, tmp_path, materialize=False)
+
+    assert not (tmp_path / "workspace").exists()
+    artifact = json.loads(Path(result.artifact_path).read_text())
+    assert artifact["meta"]["materialized"] is False
+    assert artifact["manifest"]["src/app.py"] == {
+        "size": len("print('hi')"),
+        "sha256": hashlib.sha256(b"print('hi')").hexdigest(),
+    }
+    assert sorted(artifact["manifest"]) == ["notes/todo.md", "src/app.py"]
+
+
+def test_flush_writes_the_tree_once_at_the_end(tmp_path: Path):
+    steps = [Step(id=1, description="write a/b/c.txt: 1"), Step(id=2, description="write a/b/c.txt: 2")]
+
+    execute_plan("T2", steps, tmp_path)
+
+    assert (tmp_path / "workspace" / "a" / "b" / "c.txt").read_text() == "2"